@@ -3,9 +3,8 @@
 Debug script to check for identical definitions
 """
 
-import pandas as pd
-import re
 import os
+import sys
 
 # Define base directories
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -13,40 +12,8 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 
 ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
 
-def parse_asciidoc_table(filename):
-    """Parses the main data table from an AsciiDoc file."""
-    print(f"Reading data from {filename}...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    table_match = re.search(r'\.EPD Data Structure\n.*?\|===(.*?)(\|===)', content, re.DOTALL)
-    if not table_match:
-        raise ValueError("Could not find the '.EPD Data Structure' table in the AsciiDoc file.")
-
-    table_content = table_match.group(1).strip()
-    
-    header_match = re.search(r'(\| \[role="title"\]##.*?##\n)+', table_content)
-    if not header_match:
-        raise ValueError("Could not parse the table header.")
-        
-    header_str = header_match.group(0)
-    headers = [h.strip() for h in re.findall(r'##(.*?)##', header_str)]
-    
-    body_str = table_content[len(header_str):].strip()
-    cells = [c.strip() for c in re.findall(r'##(.*?)##', body_str, re.DOTALL)]
-    
-    num_columns = len(headers)
-    
-    if len(cells) % num_columns != 0:
-        padding = num_columns - (len(cells) % num_columns)
-        cells.extend([''] * padding)
-        
-    rows = [cells[i:i + num_columns] for i in range(0, len(cells), num_columns)]
-    
-    df = pd.DataFrame(rows, columns=headers)
-    df.replace('{nbsp}', '', regex=True, inplace=True)
-    
-    return df
+sys.path.insert(0, os.path.join(BASE_DIR, 'scripts'))
+from adoc_table import parse_asciidoc_table
 
 def main():
     """Main function to debug definitions."""
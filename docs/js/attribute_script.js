@@ -40,20 +40,27 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    // Set initial state for detail pages
+    // Set initial state for detail pages; single-language reports link here with ?lang=en or ?lang=de
+    const requestedLang = new URLSearchParams(window.location.search).get('lang');
     if (document.body.contains(showBothBtn)) {
-        updateActiveButton('show-both-btn');
+        if (requestedLang === 'en' || requestedLang === 'de') {
+            setLangClass(`show-${requestedLang}`);
+            updateActiveButton(`show-${requestedLang}-btn`);
+        } else {
+            updateActiveButton('show-both-btn');
+        }
     }
 
     // --- Download Functionality (for both index and detail pages) ---
     const downloadCsvBtn = document.getElementById('download-csv-btn');
     const downloadAdocBtn = document.getElementById('download-adoc-btn');
+    // The data folder relative to the page; attribute.html sets it, the pages in docs/attribute_pages/ use the default
+    const dataDir = document.body.dataset.dataDir || '../../data';
 
     if (downloadCsvBtn) {
         downloadCsvBtn.addEventListener('click', function() {
             const link = document.createElement('a');
-            // The path is relative to the docs/attribute_pages/ folder
-            link.href = '../../data/epd_documentation.csv';
+            link.href = `${dataDir}/epd_documentation.csv`;
             link.download = 'epd_documentation.csv';
             document.body.appendChild(link);
             link.click();
@@ -64,8 +71,7 @@ document.addEventListener('DOMContentLoaded', function() {
     if (downloadAdocBtn) {
         downloadAdocBtn.addEventListener('click', function() {
             const link = document.createElement('a');
-            // The path is relative to the docs/attribute_pages/ folder
-            link.href = '../../data/epd_documentation_from_xlsx_combined.adoc';
+            link.href = `${dataDir}/epd_documentation_from_xlsx_combined.adoc`;
             link.download = 'epd_documentation_from_xlsx_combined.adoc';
             document.body.appendChild(link);
             link.click();
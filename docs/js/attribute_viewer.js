@@ -0,0 +1,142 @@
+// Single-page attribute viewer (attribute.html).
+// The page is routed by its hash: '#path=<encoded path>' shows one attribute,
+// no path shows the index of all attributes. attribute_data/index.json lists
+// every row with the shard holding its fields; shards are fetched once and kept.
+// The markup matches the pages written by scripts/generate_attribute_pages.py,
+// so css/style.css and js/attribute_script.js apply unchanged.
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('attribute-viewer');
+    if (!container) return;
+    const storeUrl = container.dataset.store;
+    const backLink = document.getElementById('viewer-back-link');
+    const controls = document.querySelector('.controls .lang-buttons');
+    const LANGUAGE_NAMES = { en: 'English', de: 'German' };
+    const shards = new Map();
+    let indexPromise = null;
+
+    function fetchJson(url) {
+        return fetch(url).then(response => {
+            if (!response.ok) throw new Error(`${url}: ${response.status}`);
+            return response.json();
+        });
+    }
+
+    function loadIndex() {
+        if (!indexPromise) indexPromise = fetchJson(`${storeUrl}/index.json`);
+        return indexPromise;
+    }
+
+    function loadShard(shardFile) {
+        if (!shards.has(shardFile)) shards.set(shardFile, fetchJson(`${storeUrl}/${shardFile}`));
+        return shards.get(shardFile);
+    }
+
+    function element(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function pathLink(path) {
+        return '#path=' + encodeURIComponent(path);
+    }
+
+    function currentPath() {
+        const match = window.location.hash.match(/^#path=(.*)$/);
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function renderIndex(index) {
+        document.title = 'EPD Attribute Pages Index';
+        const header = element('div', 'header');
+        header.appendChild(element('h1', '', 'EPD Attribute Pages'));
+        const list = element('div', 'pages-list');
+        list.appendChild(element('p', '', 'Click on any attribute below to view its detailed information:'));
+        index.entries.forEach(([path, name, treePrefix]) => {
+            const entry = element('div', 'tree-entry');
+            if (treePrefix) entry.appendChild(element('span', 'tree-prefix', treePrefix));
+            const link = element('a', 'page-link', name);
+            link.href = pathLink(path);
+            link.title = path;
+            entry.appendChild(link);
+            list.appendChild(entry);
+        });
+        return [header, list];
+    }
+
+    function renderValue(value) {
+        const valueNode = element('div', 'field-value');
+        const [text, items] = Array.isArray(value) ? value : [value, null];
+        if (items) {
+            valueNode.appendChild(document.createTextNode(text));
+            const list = element('ul');
+            items.forEach(item => list.appendChild(element('li', '', item)));
+            valueNode.appendChild(list);
+        } else {
+            valueNode.textContent = text || '—';
+        }
+        return [valueNode, !items && !text];
+    }
+
+    function renderAttribute(path, definitions, fields) {
+        const nodes = [];
+        definitions.forEach((definition, number) => {
+            const header = element('div', 'header');
+            header.appendChild(element('h1', '', definition.name));
+            header.appendChild(element('div', 'path', `Path: ${path}`));
+            if (definitions.length > 1) {
+                header.appendChild(element('div', 'path', `Definition ${number + 1} of ${definitions.length}`));
+            }
+            const content = element('div', 'content');
+            definition.values.forEach((value, column) => {
+                const [label, lang] = fields[column];
+                const [valueNode, empty] = renderValue(value);
+                const field = element('div', 'field' + (lang ? ` lang-${lang}` : '') + (empty ? ' empty' : ''));
+                const labelNode = element('div', 'field-label', label);
+                if (lang) {
+                    labelNode.appendChild(document.createTextNode(' '));
+                    labelNode.appendChild(element('span', 'lang-indicator', `(${LANGUAGE_NAMES[lang]})`));
+                }
+                field.appendChild(labelNode);
+                field.appendChild(valueNode);
+                content.appendChild(field);
+            });
+            nodes.push(header, content);
+        });
+        document.title = `${definitions[0].name} - EPD Attribute`;
+        return nodes;
+    }
+
+    function show(nodes, isIndex) {
+        container.replaceChildren(...nodes);
+        if (backLink) backLink.hidden = isIndex;
+        if (controls) controls.hidden = isIndex;
+        window.scrollTo(0, 0);
+    }
+
+    function route() {
+        const path = currentPath();
+        loadIndex().then(index => {
+            if (path === null) {
+                show(renderIndex(index), true);
+                return null;
+            }
+            const entry = index.entries.find(candidate => candidate[0] === path);
+            if (!entry) {
+                show([element('div', 'header', `No attribute with the path ${path}`)], false);
+                return null;
+            }
+            return loadShard(entry[3]).then(shard => {
+                if (currentPath() !== path) return;
+                show(renderAttribute(path, shard.entries[path], shard.fields), false);
+            });
+        }).catch(error => {
+            show([element('div', 'header', `The attribute data could not be loaded (${error.message}). ` +
+                'Serve the docs/ directory over HTTP, e.g. python -m http.server -d docs.')], false);
+        });
+    }
+
+    window.addEventListener('hashchange', route);
+    route();
+});
@@ -7,6 +7,8 @@ document.addEventListener('DOMContentLoaded', function() {
     const tableRows = document.querySelectorAll('tbody tr');
     const toggleStripesBtn = document.getElementById('toggle-stripes-btn');
     const table = document.getElementById('report-table');
+    // Set by js/virtual_report.js when the rows are rendered from the data payload
+    const virtualReport = window.virtualReport || null;
 
     // --- Zebra Stripe Toggling ---
     // Start with stripes on by default
@@ -42,36 +44,151 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    showEnBtn.addEventListener('click', () => {
-        body.className = 'show-en';
-        updateColumnToggles('show-en');
-    });
-
-    showDeBtn.addEventListener('click', () => {
-        body.className = 'show-de';
-        updateColumnToggles('show-de');
-    });
+    function setLanguage(langClass) {
+        body.className = langClass;
+        updateColumnToggles(langClass);
+        // Row heights change with the visible columns
+        if (virtualReport) virtualReport.invalidateHeights();
+    }
 
-    showAllBtn.addEventListener('click', () => {
-        body.className = ''; // Remove all classes to show both
-        updateColumnToggles('');
+    // Single-language reports (see REPORT_LANGUAGES) have no toggles, only links to the other variants
+    if (showEnBtn) showEnBtn.addEventListener('click', () => setLanguage('show-en'));
+    if (showDeBtn) showDeBtn.addEventListener('click', () => setLanguage('show-de'));
+    if (showAllBtn) showAllBtn.addEventListener('click', () => setLanguage('')); // No class shows both
+    document.querySelectorAll('.lang-buttons [data-href]').forEach(button => {
+        button.addEventListener('click', () => { window.location.href = button.dataset.href; });
     });
     
-    // Initialize column toggles based on initial state
-    updateColumnToggles('show-en'); // Default state is show-en
+    // Initialize column toggles based on initial state (show-en unless the report is German only)
+    updateColumnToggles(body.classList.contains('show-de') ? 'show-de' : 'show-en');
 
     // Function to open attribute detail page
+    // Reports built with the single-page viewer name it on the table; its routes use the real path
+    const attributeViewer = table.dataset.attributeViewer;
+    // Single-language reports open the attribute pages in their language
+    const reportLanguage = table.dataset.language;
     window.openAttributePage = function(attributePath) {
+        if (attributeViewer) {
+            window.location.href = `${attributeViewer}#path=${encodeURIComponent(attributePath)}`;
+            return;
+        }
         // Sanitize the path to create a valid filename, matching the Python script's logic.
         const sanitizedFilename = attributePath.replace(/[^a-zA-Z0-9._-]/g, '_') + '.html';
         // Construct a relative path that works both locally and on GitHub Pages.
-        const relativePath = `attribute_pages/${sanitizedFilename}`;
+        const relativePath = `attribute_pages/${sanitizedFilename}` + (reportLanguage ? `?lang=${reportLanguage}` : '');
         window.location.href = relativePath;
     };
 
-    searchBar.addEventListener('keyup', () => {
-        const searchTerm = searchBar.value;
+    // One delegated listener for all View Attribute buttons; the path is read from data-path,
+    // so quotes and other characters in it are never interpreted as script
+    if (table) {
+        table.addEventListener('click', event => {
+            const button = event.target.closest('.view-attr-btn');
+            if (button) window.openAttributePage(button.dataset.path);
+        });
+    }
+
+    // --- Search ---
+    // The generator writes a prebuilt index (see scripts/search_index.py) next to
+    // the report. Literal terms only verify the rows whose trigram postings
+    // contain every trigram of the term; regex terms are tested against the
+    // index arrays instead of the DOM. When the index cannot be loaded (e.g. the
+    // page was opened via file://) the table rows are scanned as before.
+    const SEARCH_DELAY_MS = 150;
+    const REGEX_CHARS = /[.*+?^${}()|[\]\\]/;
+    const rowsById = new Map();
+    tableRows.forEach(row => rowsById.set(Number(row.dataset.row), row));
+    let searchIndex = null;
+    let searchTimer = null;
+
+    if (table && table.dataset.searchIndex) {
+        fetch(table.dataset.searchIndex)
+            .then(response => response.ok ? response.json() : null)
+            .then(index => { searchIndex = index; })
+            .catch(() => { searchIndex = null; });
+    }
+
+    function trigramsOf(text) {
+        const trigrams = new Set();
+        for (let i = 0; i + 3 <= text.length; i++) {
+            trigrams.add(text.slice(i, i + 3));
+        }
+        return trigrams;
+    }
+
+    function intersectSorted(a, b) {
+        const result = [];
+        let i = 0, j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] === b[j]) { result.push(a[i]); i++; j++; }
+            else if (a[i] < b[j]) i++;
+            else j++;
+        }
+        return result;
+    }
+
+    // Index entries that contain every trigram of every term, or null when no
+    // term is long enough to narrow the search down.
+    function candidateEntries(terms, postings) {
+        let result = null;
+        for (const term of terms) {
+            for (const trigram of trigramsOf(term)) {
+                const posting = postings[trigram] || [];
+                result = result === null ? posting : intersectSorted(result, posting);
+                if (result.length === 0) return result;
+            }
+        }
+        return result;
+    }
+
+    // 'proc/name' matches 'processDataSet/.../name': every query segment is a
+    // prefix of a path segment, in order.
+    function matchesPathSegments(querySegments, pathSegments) {
+        let next = 0;
+        for (const segment of pathSegments) {
+            if (next < querySegments.length && segment.startsWith(querySegments[next])) next++;
+        }
+        return next === querySegments.length;
+    }
+
+    function searchWithIndex(searchTerm) {
+        const term = searchTerm.trim().toLowerCase();
+        const isPathSearch = term.includes('/');
+        const { rows, names, paths } = searchIndex;
+        const matches = new Set();
+
+        if (REGEX_CHARS.test(term)) {
+            let searchRegex;
+            try {
+                searchRegex = new RegExp(searchTerm, 'i');
+            } catch (e) {
+                searchRegex = null;
+            }
+            for (let i = 0; i < rows.length; i++) {
+                const targetText = isPathSearch ? paths[i].join('/') : names[i];
+                if (searchRegex ? searchRegex.test(targetText) : targetText.includes(term)) matches.add(rows[i]);
+            }
+            return matches;
+        }
+
+        const querySegments = isPathSearch ? term.split('/') : null;
+        const candidates = isPathSearch
+            ? candidateEntries(querySegments, searchIndex.path_trigrams)
+            : candidateEntries([term], searchIndex.name_trigrams);
+        const count = candidates === null ? rows.length : candidates.length;
+        for (let k = 0; k < count; k++) {
+            const i = candidates === null ? k : candidates[k];
+            const isMatch = isPathSearch
+                ? paths[i].join('/').includes(term) || matchesPathSegments(querySegments, paths[i])
+                : names[i].includes(term);
+            if (isMatch) matches.add(rows[i]);
+        }
+        return matches;
+    }
+
+    function searchTableRows(searchTerm) {
         const isPathSearch = searchTerm.includes('/');
+        const matches = new Set();
         let searchRegex;
 
         try {
@@ -82,31 +199,142 @@ document.addEventListener('DOMContentLoaded', function() {
             searchRegex = null;
         }
 
-        tableRows.forEach(row => {
+        rowsById.forEach((row, rowId) => {
             const elementNameCell = row.querySelector('[data-col="Element/Attribute Name"] .tooltip-wrapper');
             const elementName = elementNameCell ? elementNameCell.childNodes[elementNameCell.childNodes.length - 1].textContent : '';
             const path = row.dataset.tooltip || '';
-
             const targetText = isPathSearch ? path : elementName;
-            let isMatch = false;
 
-            if (searchRegex) {
-                // Use regex test for matching
-                isMatch = searchRegex.test(targetText);
-            } else {
-                // Fallback to simple text search if regex is invalid
-                isMatch = targetText.toLowerCase().includes(searchTerm.toLowerCase());
+            const isMatch = searchRegex
+                ? searchRegex.test(targetText)
+                : targetText.toLowerCase().includes(searchTerm.toLowerCase());
+            if (isMatch) matches.add(rowId);
+        });
+        return matches;
+    }
+
+    function runSearch() {
+        const searchTerm = searchBar.value;
+        let matches = null; // null shows every row
+        if (searchTerm.trim() !== '') {
+            if (searchIndex) matches = searchWithIndex(searchTerm);
+            else matches = virtualReport ? virtualReport.searchRows(searchTerm) : searchTableRows(searchTerm);
+        }
+        searchActive = matches !== null;
+        if (virtualReport) {
+            virtualReport.filter(matches);
+            return;
+        }
+        if (matches === null) {
+            // Back to the tree view, with collapsed subtrees hidden again
+            showTreeRange(0, treeRows.length - 1);
+            return;
+        }
+        rowsById.forEach((row, rowId) => {
+            setRowDisplay(row, matches.has(rowId) ? '' : 'none');
+        });
+    }
+
+    searchBar.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(runSearch, SEARCH_DELAY_MS);
+    });
+
+    // --- Collapsible hierarchy ---
+    // Every row carries data-end, the index of the last row of its subtree in
+    // table order (precomputed by generate_html_report.build_tree_ranges), so
+    // a subtree is the contiguous range index + 1 .. data-end. Search results
+    // are shown flat; the collapse state applies again once the search is cleared.
+    const treeRows = Array.from(tableRows);
+    const collapsedRows = new Set();
+    let searchActive = false;
+
+    function setRowDisplay(row, display) {
+        if (row.style.display !== display) row.style.display = display;
+    }
+
+    function subtreeEnd(index) {
+        return Number(treeRows[index].dataset.end);
+    }
+
+    // Shows rows start..end, skipping over the subtrees of collapsed rows.
+    function showTreeRange(start, end) {
+        for (let k = start; k <= end; k++) {
+            setRowDisplay(treeRows[k], '');
+            if (collapsedRows.has(k)) {
+                const last = subtreeEnd(k);
+                for (let j = k + 1; j <= last; j++) setRowDisplay(treeRows[j], 'none');
+                k = last;
             }
+        }
+    }
 
-            row.style.display = isMatch ? '' : 'none';
+    function setToggleState(button, expanded) {
+        button.setAttribute('aria-expanded', String(expanded));
+        button.innerHTML = expanded ? '&#9662;' : '&#9656;';
+    }
+
+    function setCollapsed(index, collapse) {
+        if (collapse === collapsedRows.has(index)) return;
+        if (collapse) collapsedRows.add(index);
+        else collapsedRows.delete(index);
+        const button = treeRows[index].querySelector('.tree-toggle');
+        if (button) setToggleState(button, !collapse);
+        if (searchActive) return;
+        const last = subtreeEnd(index);
+        if (collapse) {
+            for (let j = index + 1; j <= last; j++) setRowDisplay(treeRows[j], 'none');
+        } else {
+            showTreeRange(index + 1, last);
+        }
+    }
+
+    if (table) {
+        table.addEventListener('click', event => {
+            const button = event.target.closest('.tree-toggle');
+            if (!button) return;
+            const index = Number(button.dataset.node);
+            if (virtualReport) virtualReport.toggle(index);
+            else setCollapsed(index, !collapsedRows.has(index));
         });
+    }
+
+    document.getElementById('expand-all-btn').addEventListener('click', () => {
+        if (virtualReport) {
+            virtualReport.setAllCollapsed(false);
+            return;
+        }
+        collapsedRows.clear();
+        treeRows.forEach(row => {
+            const button = row.querySelector('.tree-toggle');
+            if (button) setToggleState(button, true);
+        });
+        if (!searchActive) showTreeRange(0, treeRows.length - 1);
+    });
+
+    document.getElementById('collapse-all-btn').addEventListener('click', () => {
+        if (virtualReport) {
+            virtualReport.setAllCollapsed(true);
+            return;
+        }
+        treeRows.forEach((row, k) => {
+            if (subtreeEnd(k) > k) {
+                collapsedRows.add(k);
+                setToggleState(row.querySelector('.tree-toggle'), false);
+            }
+        });
+        if (!searchActive) showTreeRange(0, treeRows.length - 1);
     });
 
     const colToggles = document.querySelectorAll('.col-toggle');
     colToggles.forEach(function(checkbox) {
         checkbox.addEventListener('change', function() {
-            const colName = this.value;
-            const cells = document.querySelectorAll(`[data-col="${colName}"]`);
+            const colName = this.dataset.col;
+            if (virtualReport) {
+                virtualReport.setColumnVisible(colName, this.checked);
+                return;
+            }
+            const cells = document.querySelectorAll(`#report-table [data-col="${CSS.escape(colName)}"]`);
             cells.forEach(cell => {
                 cell.style.display = this.checked ? '' : 'none';
             });
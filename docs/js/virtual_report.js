@@ -0,0 +1,282 @@
+// Windowed rendering for the virtual report mode (generate_html_report.py --mode virtual).
+//
+// The rows are loaded from the JSON Lines payload named in the table's
+// data-rows attribute and only the rows inside the scrolled viewport (plus a
+// small overscan) are turned into DOM nodes. Spacer rows above and below keep
+// the scrollbar true to the full table. Row heights are measured once they
+// have been rendered; rows that were never rendered use an estimate.
+//
+// Each row carries its subtree end (the last row of its subtree, see
+// generate_html_report.build_tree_ranges), so collapsing or expanding a node
+// splices one contiguous range out of or into the visible list; rows inside a
+// collapsed subtree are only turned into DOM nodes once they are expanded and
+// scrolled into view.
+//
+// script.js drives the shared controls through window.virtualReport.
+(function() {
+    const ESTIMATED_ROW_HEIGHT = 60;
+    const OVERSCAN_ROWS = 8;
+
+    let table = null;
+    let tbody = null;
+    let columns = [];
+    let rows = [];            // [row id, path, tree prefix, identical, cells, enum values, parent, subtree end]
+    let visible = [];         // Indices into rows that pass the current filter
+    let heights = null;       // Measured height per entry of rows, 0 = not measured
+    let offsets = null;       // offsets[k] = top of visible[k]; offsets[visible.length] = total height
+    let renderedRange = null; // [first, last) of visible currently in the DOM
+    let pendingFrame = false;
+    let currentMatches = null; // Set of row ids while a search is active
+    const hiddenColumns = new Set();
+    const collapsedRows = new Set(); // Indices into rows
+
+    function escapeHtml(text) {
+        return String(text)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;')
+            .replace(/'/g, '&#x27;');
+    }
+
+    function recomputeOffsets() {
+        offsets = new Float64Array(visible.length + 1);
+        for (let k = 0; k < visible.length; k++) {
+            offsets[k + 1] = offsets[k] + (heights[visible[k]] || ESTIMATED_ROW_HEIGHT);
+        }
+    }
+
+    // Index of the visible row that covers pixel offset y.
+    function rowAt(y) {
+        let low = 0, high = visible.length - 1;
+        while (low < high) {
+            const mid = (low + high + 1) >> 1;
+            if (offsets[mid] <= y) low = mid;
+            else high = mid - 1;
+        }
+        return Math.max(low, 0);
+    }
+
+    // First position in the sorted array `values` whose value is greater than `target`.
+    function upperBound(values, target) {
+        let low = 0, high = values.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (values[mid] <= target) low = mid + 1;
+            else high = mid;
+        }
+        return low;
+    }
+
+    // Indices of the rows start..end that are not inside a collapsed subtree.
+    function treeRange(start, end) {
+        const result = [];
+        for (let k = start; k <= end; k++) {
+            result.push(k);
+            if (collapsedRows.has(k)) k = rows[k][7];
+        }
+        return result;
+    }
+
+    function toggleHtml(index) {
+        if (rows[index][7] <= index) return '<span class="tree-toggle-spacer"></span>';
+        const expanded = !collapsedRows.has(index);
+        return `<button class="tree-toggle" data-node="${index}" aria-expanded="${expanded}" ` +
+               `title="Collapse/expand the child elements">${expanded ? '&#9662;' : '&#9656;'}</button>`;
+    }
+
+    function cellStyle(name) {
+        return hiddenColumns.has(name) ? ' style="display: none"' : '';
+    }
+
+    // Mirrors the table rows written by render_html_report.
+    function rowHtml(index) {
+        const [rowId, path, treePrefix, identical, cells, enumValues, parent, subtreeEnd] = rows[index];
+        const pathAttr = escapeHtml(path);
+        const parts = [
+            `<tr data-row="${rowId}" data-parent="${parent}" data-end="${subtreeEnd}" data-tooltip="${pathAttr}">`,
+            `<td data-col="View Attribute"${cellStyle('View Attribute')}>` +
+            `<button class="view-attr-btn" data-path="${pathAttr}" title="View detailed information for this attribute">View Attribute</button></td>`,
+        ];
+        columns.forEach((column, c) => {
+            const value = cells[c];
+            const colAttr = escapeHtml(column.name);
+            const style = cellStyle(column.name);
+            let cellClass = column.class;
+            let content;
+            if (column.name === 'Datatype' && enumValues) {
+                const header = value.trim() ? escapeHtml(value) : 'Enumeration:';
+                content = `${header}<ul>${enumValues.map(v => `<li>${escapeHtml(v)}</li>`).join('')}</ul>`;
+            } else if (column.name === 'Element/Attribute Name') {
+                const prefixHtml = treePrefix ? `<span class="tree-prefix">${treePrefix}</span>` : '';
+                content = `${prefixHtml}${toggleHtml(index)}<div class="tooltip-wrapper">${escapeHtml(value)}` +
+                          `<span class="tooltip-text">${pathAttr}</span></div>`;
+            } else {
+                content = escapeHtml(value);
+                if (identical) {
+                    cellClass = column.grayClass;
+                    if (column.name === 'Original ILCD Format Definition (en)') {
+                        content = `<span class="gray-definition">${content}</span>`;
+                    }
+                }
+            }
+            parts.push(`<td class="${cellClass}" data-col="${colAttr}"${style}>${content}</td>`);
+        });
+        parts.push('</tr>');
+        return parts.join('');
+    }
+
+    function spacerHtml(height) {
+        return `<tr class="virtual-spacer" aria-hidden="true"><td colspan="${columns.length + 1}" style="height: ${height}px"></td></tr>`;
+    }
+
+    function render(force) {
+        pendingFrame = false;
+        if (!tbody) return;
+        const viewTop = Math.max(0, window.scrollY - (tbody.getBoundingClientRect().top + window.scrollY));
+        const first = Math.max(0, rowAt(viewTop) - OVERSCAN_ROWS);
+        const last = Math.min(visible.length, rowAt(viewTop + window.innerHeight) + 1 + OVERSCAN_ROWS);
+        if (!force && renderedRange && renderedRange[0] === first && renderedRange[1] === last) return;
+        renderedRange = [first, last];
+
+        const parts = [spacerHtml(offsets[first])];
+        // Keep :nth-of-type zebra stripes aligned with the static table
+        if (first % 2 === 0) parts.push(spacerHtml(0));
+        for (let k = first; k < last; k++) parts.push(rowHtml(visible[k]));
+        parts.push(spacerHtml(offsets[visible.length] - offsets[last]));
+        tbody.innerHTML = parts.join('');
+
+        // Measure what was rendered; re-layout once if the estimates were off
+        let changed = false;
+        tbody.querySelectorAll('tr[data-row]').forEach((tr, j) => {
+            const index = visible[first + j];
+            const height = tr.getBoundingClientRect().height;
+            if (height && Math.abs(height - heights[index]) > 0.5) {
+                heights[index] = height;
+                changed = true;
+            }
+        });
+        if (changed) {
+            recomputeOffsets();
+            tbody.firstChild.firstChild.style.height = `${offsets[first]}px`;
+            tbody.lastChild.firstChild.style.height = `${offsets[visible.length] - offsets[last]}px`;
+        }
+    }
+
+    function scheduleRender() {
+        if (pendingFrame) return;
+        pendingFrame = true;
+        window.requestAnimationFrame(() => render(false));
+    }
+
+    function showMessage(text) {
+        tbody.innerHTML = `<tr><td colspan="${columns.length + 1}">${escapeHtml(text)}</td></tr>`;
+    }
+
+    function load(url) {
+        return fetch(url)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.text();
+            })
+            .then(text => {
+                const lines = text.split('\n').filter(line => line.length);
+                const header = JSON.parse(lines[0]);
+                columns = header.columns;
+                rows = lines.slice(1).map(line => JSON.parse(line));
+                heights = new Float64Array(rows.length);
+                visible = treeRange(0, rows.length - 1);
+                recomputeOffsets();
+                render(true);
+            });
+    }
+
+    window.virtualReport = {
+        // Shows only the rows whose id is in `matches` (a Set), or all rows for null.
+        // Search results are shown flat; null goes back to the (collapsible) tree.
+        filter(matches) {
+            currentMatches = matches;
+            if (matches === null) {
+                visible = treeRange(0, rows.length - 1);
+            } else {
+                visible = [];
+                rows.forEach((row, i) => {
+                    if (matches.has(row[0])) visible.push(i);
+                });
+            }
+            recomputeOffsets();
+            render(true);
+        },
+        toggle(index) {
+            const subtreeEnd = rows[index][7];
+            const collapse = !collapsedRows.has(index);
+            if (collapse) collapsedRows.add(index);
+            else collapsedRows.delete(index);
+            if (currentMatches === null) {
+                // The node is visible, so its subtree follows it directly in the visible list
+                const at = upperBound(visible, index);
+                if (collapse) {
+                    visible.splice(at, upperBound(visible, subtreeEnd) - at);
+                } else {
+                    visible.splice(at, 0, ...treeRange(index + 1, subtreeEnd));
+                }
+                recomputeOffsets();
+            }
+            render(true);
+        },
+        setAllCollapsed(collapse) {
+            collapsedRows.clear();
+            if (collapse) {
+                rows.forEach((row, i) => {
+                    if (row[7] > i) collapsedRows.add(i);
+                });
+            }
+            this.filter(currentMatches);
+        },
+        setColumnVisible(name, isVisible) {
+            if (isVisible) hiddenColumns.delete(name);
+            else hiddenColumns.add(name);
+            document.querySelectorAll(`#report-table thead [data-col="${CSS.escape(name)}"]`)
+                .forEach(cell => { cell.style.display = isVisible ? '' : 'none'; });
+            this.invalidateHeights();
+        },
+        invalidateHeights() {
+            if (!heights) return;
+            heights.fill(0);
+            recomputeOffsets();
+            render(true);
+        },
+        // Used by the search box when the prebuilt search index is not available.
+        searchRows(searchTerm) {
+            const isPathSearch = searchTerm.includes('/');
+            const nameColumn = columns.findIndex(column => column.name === 'Element/Attribute Name');
+            let searchRegex;
+            try {
+                searchRegex = new RegExp(searchTerm, 'i');
+            } catch (e) {
+                searchRegex = null;
+            }
+            const matches = new Set();
+            rows.forEach(row => {
+                const targetText = isPathSearch ? row[1] : row[4][nameColumn];
+                const isMatch = searchRegex
+                    ? searchRegex.test(targetText)
+                    : targetText.toLowerCase().includes(searchTerm.toLowerCase());
+                if (isMatch) matches.add(row[0]);
+            });
+            return matches;
+        },
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        table = document.getElementById('report-table');
+        if (!table || !table.dataset.rows) return;
+        tbody = table.querySelector('tbody');
+        load(table.dataset.rows).catch(error => {
+            showMessage(`Could not load the report data (${error.message}). ` +
+                        'Serve the docs directory over HTTP, e.g. python -m http.server.');
+        });
+        window.addEventListener('scroll', scheduleRender, { passive: true });
+        window.addEventListener('resize', scheduleRender);
+    });
+})();
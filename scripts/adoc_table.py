@@ -0,0 +1,156 @@
+"""
+Streaming reader for the '.EPD Data Structure' table of the combined AsciiDoc file.
+
+The table is written one cell per line as `| ##value##`, header cells carry a
+`[role="title"]` prefix and literal `##` inside a cell is written as `\\##`.
+Backslashes at the end of a cell would turn its closing `##` into that escape,
+so they are written as Asciidoctor's `{backslash}` attribute instead.
+The tokenizer below walks the file line by line with a small state machine, so
+it never holds more than the current row in memory and honours the escapes.
+"""
+
+import re
+
+import pandas as pd
+
+TABLE_TITLE = '.EPD Data Structure'
+TABLE_DELIMITER = '|==='
+HEADER_ROLE = '[role="title"]'
+CELL_MARKER = '##'
+ESCAPED_CELL_MARKER = '\\##'
+ESCAPED_BACKSLASH = '{backslash}'
+# Part of the spec cache key (spec_cache.py); bump when parse_asciidoc_table's result changes
+PARSER_VERSION = 2
+
+_TRAILING_BACKSLASHES = re.compile('(?:' + re.escape(ESCAPED_BACKSLASH) + ')+$')
+
+# Tokenizer states
+_SEEK_TITLE, _SEEK_TABLE, _BETWEEN_CELLS, _IN_CELL, _DONE = range(5)
+
+
+def iter_table_cells(lines, title=TABLE_TITLE):
+    """Tokenizes the titled table from an iterable of lines.
+
+    Yields (is_header, cell_text) tuples in file order. Escaped `\\##` sequences
+    are returned as a literal `##`; no other processing is applied to the cell.
+    """
+    state = _SEEK_TITLE
+    prefix = []   # Text seen between the previous cell and the next '##'
+    cell = []     # Fragments of the cell that is currently open
+    is_header = False
+
+    for line_number, line in enumerate(lines, start=1):
+        if state == _SEEK_TITLE:
+            if line.rstrip('\r\n') == title:
+                state = _SEEK_TABLE
+            continue
+        if state == _SEEK_TABLE:
+            if line.startswith(TABLE_DELIMITER):
+                state = _BETWEEN_CELLS
+            continue
+        if line.startswith(TABLE_DELIMITER):
+            if state == _IN_CELL:
+                raise ValueError(f"Unterminated table cell before line {line_number}.")
+            state = _DONE
+            break
+
+        pos = 0
+        while True:
+            marker = line.find(CELL_MARKER, pos)
+            if state == _BETWEEN_CELLS:
+                if marker == -1:
+                    prefix.append(line[pos:])
+                    break
+                prefix.append(line[pos:marker])
+                is_header = HEADER_ROLE in ''.join(prefix)
+                prefix = []
+                state = _IN_CELL
+            else:
+                if marker == -1:
+                    cell.append(line[pos:])
+                    break
+                if marker > 0 and line[marker - 1] == '\\':
+                    cell.append(line[pos:marker - 1])
+                    cell.append(CELL_MARKER)
+                else:
+                    cell.append(line[pos:marker])
+                    yield is_header, ''.join(cell)
+                    cell = []
+                    state = _BETWEEN_CELLS
+            pos = marker + len(CELL_MARKER)
+
+    if state in (_SEEK_TITLE, _SEEK_TABLE):
+        raise ValueError(f"Could not find the '{title}' table in the AsciiDoc file.")
+    if state == _IN_CELL:
+        raise ValueError("Unterminated table cell at end of file.")
+
+
+def escape_trailing_backslashes(text):
+    """Writes the backslashes at the end of a cell as `{backslash}`, so they cannot escape its closing `##`."""
+    stripped = text.rstrip('\\')
+    return stripped + ESCAPED_BACKSLASH * (len(text) - len(stripped))
+
+
+def unescape_trailing_backslashes(cell):
+    """Reverses escape_trailing_backslashes."""
+    return _TRAILING_BACKSLASHES.sub(lambda match: '\\' * (len(match.group()) // len(ESCAPED_BACKSLASH)), cell)
+
+
+def iter_table_rows(lines, title=TABLE_TITLE, strip=True, pad=True):
+    """Groups the tokenized cells into rows.
+
+    The first list yielded is the header row; every following list is one data
+    row with exactly as many cells as there are headers. A trailing partial row
+    is padded with empty strings, or raises ValueError when `pad` is False.
+    """
+    headers = []
+    row = []
+    num_columns = 0
+
+    for is_header, cell in iter_table_cells(lines, title):
+        if strip:
+            cell = cell.strip()
+        if is_header and not num_columns:
+            headers.append(cell.strip())
+            continue
+        if not num_columns:
+            if not headers:
+                raise ValueError("Could not parse the table header.")
+            num_columns = len(headers)
+            yield headers
+        row.append(cell)
+        if len(row) == num_columns:
+            yield row
+            row = []
+
+    if not num_columns:
+        if not headers:
+            raise ValueError("Could not parse the table header.")
+        yield headers
+    elif row:
+        if not pad:
+            raise ValueError(f"Cell count is not a multiple of column count ({num_columns}). File may be corrupt.")
+        yield row + [''] * (num_columns - len(row))
+
+
+def iter_asciidoc_table(filename, title=TABLE_TITLE, strip=True, pad=True):
+    """Streams the header row and then each data row of the table in `filename`."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        yield from iter_table_rows(f, title, strip, pad)
+
+
+def parse_asciidoc_table(filename):
+    """Parses the main data table from an AsciiDoc file."""
+    print(f"Reading data from {filename}...")
+    rows = iter_asciidoc_table(filename)
+    headers = next(rows)
+    # Clean up '{nbsp}' artifacts cell by cell while streaming
+    df = pd.DataFrame(([unescape_trailing_backslashes(cell.replace('{nbsp}', '')) for cell in row] for row in rows),
+                      columns=headers)
+
+    if 'Indent' in df.columns:
+        df['Indent'] = pd.to_numeric(df['Indent'], errors='coerce').fillna(0).astype(int)
+    else:
+        df['Indent'] = 0
+
+    return df
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the documentation build.
+
+Parses the AsciiDoc source once, finds its enumerations once (EnumRegistry) and
+hands both to every emitter (HTML report, attribute pages, CSV export), then
+prints how long each stage took.
+With --optimize, a minified, content-hashed and precompressed copy of docs/ is
+written to output/site/ afterwards (see optimize_site.py).
+New outputs are added in default_emitters().
+"""
+
+import os
+import sys
+import time
+import argparse
+from functools import partial
+
+from enum_registry import EnumRegistry
+from spec_cache import load_spec_table
+from cli_options import DEFAULT_REPORT_MODE, REPORT_MODES, parse_jobs
+from generate_html_report import write_html_report, REPORT_LANGUAGES
+from generate_attribute_pages import PAGES_MODES, VIEWER_FILE, write_attribute_pages, write_attribute_viewers
+from generate_csv_from_adoc import write_csv
+from optimize_site import optimize_site
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+
+# Short names for --only, mapped to the emitter stage names
+EMITTER_KEYS = {
+    'report': 'HTML report',
+    'pages': 'Attribute pages',
+    'csv': 'CSV export',
+}
+
+def default_emitters(jobs=1, report_mode=DEFAULT_REPORT_MODE, only=None, pages_mode='pages', optimize=False, languages=('both',)):
+    """Returns (stage name, callable taking the parsed DataFrame and its EnumRegistry) pairs in build order.
+
+    `only` restricts the list to the given EMITTER_KEYS. With `pages_mode`
+    'viewer' the attributes are written as the single-page viewer and the
+    report links to it. Emitters must not modify the DataFrame or the
+    registry, since they are shared between them. `languages` selects the report variants (see
+    REPORT_LANGUAGES); in viewer mode each gets a matching viewer.
+    `optimize` appends the optimized copy of docs/, which reads the files
+    the other emitters wrote.
+    """
+    if pages_mode == 'viewer':
+        report = partial(write_html_report, mode=report_mode, attribute_viewer_file=VIEWER_FILE, languages=languages)
+        pages = partial(write_attribute_viewers, languages=languages)
+    else:
+        report = partial(write_html_report, mode=report_mode, languages=languages)
+        pages = partial(write_attribute_pages, jobs=jobs)
+    emitters = [
+        ('HTML report', lambda df, enums: report(df, enums=enums)),
+        ('Attribute pages', lambda df, enums: pages(df, enums=enums)),
+        ('CSV export', lambda df, enums: write_csv(df)),
+    ]
+    if only is not None:
+        names = {EMITTER_KEYS[key] for key in only}
+        emitters = [(name, emit) for name, emit in emitters if name in names]
+    if optimize:
+        emitters.append(('Optimized site', lambda df, enums: optimize_site()))
+    return emitters
+
+def run_stage(timings, name, func, *args):
+    """Runs one build stage and records its wall time."""
+    start = time.perf_counter()
+    result = func(*args)
+    timings.append((name, time.perf_counter() - start))
+    return result
+
+def print_timings(timings):
+    """Prints the per-stage timing summary."""
+    total = sum(seconds for _, seconds in timings)
+    width = max(len(name) for name, _ in timings + [('Total', 0)])
+    print("\nBuild timings:")
+    for name, seconds in timings:
+        print(f"  {name:<{width}}  {seconds * 1000:8.1f} ms")
+    print(f"  {'Total':<{width}}  {total * 1000:8.1f} ms")
+
+def build(source_file=ADOC_SOURCE_FILE, emitters=None, jobs=1, report_mode=DEFAULT_REPORT_MODE, only=None, pages_mode='pages',
+          optimize=False, languages=('both',)):
+    """Parses `source_file` once and runs every emitter on the result and its EnumRegistry."""
+    if emitters is None:
+        emitters = default_emitters(jobs, report_mode, only, pages_mode, optimize, languages)
+    timings = []
+    df = run_stage(timings, 'Load AsciiDoc', load_spec_table, source_file)
+    enums = run_stage(timings, 'Enum registry', EnumRegistry.from_dataframe, df)
+    for name, emit in emitters:
+        run_stage(timings, name, emit, df, enums)
+    print_timings(timings)
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build all documentation outputs from the AsciiDoc source.")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1,
+                        help="number of worker processes for rendering attribute pages (0 = one per CPU)")
+    parser.add_argument('--report-mode', choices=REPORT_MODES, default=DEFAULT_REPORT_MODE,
+                        help="virtual: render only the visible rows from a JSON Lines payload, collapsed subtrees "
+                             "once they are expanded (default); table: inline every row in the report")
+    parser.add_argument('--only', action='append', choices=sorted(EMITTER_KEYS),
+                        help="build only this output (repeatable; default: all)")
+    parser.add_argument('--pages-mode', choices=PAGES_MODES, default='pages',
+                        help="pages: one HTML file per attribute (default); viewer: a single attribute.html "
+                             "with a sharded JSON store, linked from the report")
+    parser.add_argument('--optimize', action='store_true',
+                        help="also write a minified, content-hashed and precompressed copy of docs/ to output/site/")
+    parser.add_argument('--report-language', action='append', choices=REPORT_LANGUAGES, dest='languages',
+                        help="report variant to write (repeatable; default: both); 'en' and 'de' write "
+                             "single-language reports (and viewers) next to the bilingual one")
+    args = parser.parse_args()
+
+    try:
+        build(jobs=args.jobs, report_mode=args.report_mode, only=args.only, pages_mode=args.pages_mode,
+              optimize=args.optimize, languages=args.languages or ('both',))
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
+        # Non-zero, so CI does not deploy a partial build (e.g. --optimize without brotli)
+        sys.exit(1)
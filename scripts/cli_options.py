@@ -0,0 +1,22 @@
+"""
+Argument types and choices shared by the command-line scripts.
+
+Kept free of the generator modules, so a CLI that only needs an option type
+does not import generate_html_report (which creates docs/ on import) with it.
+"""
+
+import argparse
+import os
+
+# 'table' inlines every row; 'virtual' writes the rows as JSON Lines and renders the visible window.
+# The builds default to 'virtual', the only mode that defers the rows of collapsed subtrees.
+REPORT_MODES = ('table', 'virtual')
+DEFAULT_REPORT_MODE = 'virtual'
+
+
+def parse_jobs(value):
+    """argparse type for --jobs: a positive worker count, or 0 for one per CPU."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError("--jobs must be 0 or a positive number")
+    return jobs or os.cpu_count() or 1
@@ -1,8 +1,24 @@
 import pandas as pd
 import os
+import io
 import codecs
 import re
+import argparse
+from array import array
+from functools import partial
+import numpy as np
 import openpyxl
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+
+from adoc_table import escape_trailing_backslashes, iter_asciidoc_table, unescape_trailing_backslashes
+from spec_cache import cached_load
+
+# Part of the spec cache key; bump when read_sheet_with_colors' result changes
+XLSX_READER_VERSION = 1
+
+# Columns convert_xlsx_to_adoc computes and appends to the sheet's own columns
+COMPUTED_COLUMNS = ['Indent', 'Path']
 
 # --- AsciiDoc Header for Combined XLSX conversion ---
 
@@ -54,70 +70,105 @@ def clean_text(data):
     text = str(data)
     # Escape pipe characters to prevent them from being interpreted as table column separators
     text = text.replace('|', '\\|')
+    # Escape cell delimiters, the table reader turns '\\##' back into '##'
+    text = text.replace('##', '\\##')
     # Handle multi-line text for AsciiDoc tables
     if '\n' in text:
         text = text.replace('\n', ' +\n')
-    return text
-
-def get_indentation_from_excel_colors(xlsx_path, sheet_name, element_col_name='Element/Attribute Name'):
+    # A backslash right before the closing '##' would escape it
+    return escape_trailing_backslashes(text)
+
+def convert_excel_cell(cell):
+    """Converts an openpyxl cell to the value pandas.read_excel would produce for it."""
+    if cell.value is None:
+        return ''
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        if value == cell.value:
+            return value
+        return float(cell.value)
+    return cell.value
+
+def get_fill_color(cell):
+    """Returns the ARGB fill color of a cell, or '00000000' for no fill."""
+    color_rgb = None
+    if cell.fill and cell.fill.start_color:
+        if isinstance(cell.fill.start_color.rgb, str):
+            color_rgb = cell.fill.start_color.rgb
+    return color_rgb or "00000000"  # Default to black/no fill
+
+def read_sheet_with_colors(xlsx_path, sheet_name, element_col_name='Element/Attribute Name'):
     """
-    Extract indentation levels from Excel cell background colors.
-    Returns a dict mapping element names to indent levels.
+    Reads the sheet in a single streaming (read-only) pass.
+    Returns the sheet as a DataFrame (as pd.read_excel with header=0 would) and a
+    list of (DataFrame row position, element name, fill color) for every named
+    row of the element column.
     """
-    print(f"Extracting indentation from Excel colors in {xlsx_path}...")
-    
-    wb = openpyxl.load_workbook(xlsx_path)
-    ws = wb[sheet_name]
+    print(f"Reading values and fill colors from {xlsx_path}...")
     
-    # Find the header row
-    header_row = None
-    for i in range(1, min(15, ws.max_row + 1)):
-        for col in range(1, min(20, ws.max_column + 1)):
-            cell_value = ws.cell(i, col).value
-            if cell_value and element_col_name in str(cell_value):
-                header_row = i
-                element_col = col
-                break
-        if header_row:
-            break
+    wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name]
+        ws.reset_dimensions()
+        
+        data = []
+        last_row_with_data = -1
+        header_row = None
+        element_col = None
+        element_colors = []
+        
+        for row_number, row in enumerate(ws.rows):
+            if header_row is None:
+                # Find the header row within the first rows and columns
+                if row_number < 14:
+                    for col, cell in enumerate(row[:19]):
+                        if cell.value and element_col_name in str(cell.value):
+                            header_row = row_number
+                            element_col = col
+                            break
+            elif element_col < len(row):
+                cell = row[element_col]
+                element_name = cell.value
+                if element_name and not pd.isna(element_name):
+                    # The first sheet row is the DataFrame header
+                    element_colors.append((row_number - 1, str(element_name).strip(), get_fill_color(cell)))
+            
+            converted_row = [convert_excel_cell(cell) for cell in row]
+            # Trim trailing empty cells, as pandas does
+            while converted_row and converted_row[-1] == '':
+                converted_row.pop()
+            if converted_row:
+                last_row_with_data = row_number
+            data.append(converted_row)
+    finally:
+        wb.close()
     
-    if not header_row:
+    if header_row is None:
         print(f"Warning: Could not find header row with '{element_col_name}' column")
-        wb.close()
-        return {}
+    else:
+        print(f"Found header at row {header_row + 1}, element column {element_col + 1}")
     
-    print(f"Found header at row {header_row}, element column {element_col}")
+    # Trim trailing empty rows and pad the rest to the same width
+    data = data[:last_row_with_data + 1]
+    if data:
+        max_width = max(len(data_row) for data_row in data)
+        data = [data_row + [''] * (max_width - len(data_row)) for data_row in data]
     
+    # Same parser pd.read_excel uses, so the dtypes and NaN handling match
+    df = TextParser(data, header=0, skip_blank_lines=False).read()
+    return df, element_colors
+
+def get_indentation_from_colors(element_colors, num_rows):
+    """
+    Derive indentation levels from the Element/Attribute Name fill colors.
+    Returns one indent level per DataFrame row as a compact array('b'), so
+    repeated names such as '@lang' or 'other' each keep their own level.
+    Rows without an element name get level 0.
+    """
     # Collect all unique colors in order of appearance
-    color_order = []
-    color_to_elements = {}
-    
-    for i in range(header_row + 1, ws.max_row + 1):
-        cell = ws.cell(i, element_col)
-        element_name = cell.value
-        
-        if not element_name or pd.isna(element_name):
-            continue
-        
-        element_name = str(element_name).strip()
-        
-        color_rgb = None
-        if cell.fill and cell.fill.start_color:
-            if isinstance(cell.fill.start_color.rgb, str):
-                color_rgb = cell.fill.start_color.rgb
-        
-        if not color_rgb:
-            color_rgb = "00000000"  # Default to black/no fill
-        
-        # Track this color
-        if color_rgb not in color_to_elements:
-            color_order.append(color_rgb)
-            color_to_elements[color_rgb] = []
-        
-        color_to_elements[color_rgb].append(element_name)
-    
-    wb.close()
-    
+    color_order = list(dict.fromkeys(color_rgb for _, _, color_rgb in element_colors))
     print(f"\nFound {len(color_order)} unique colors")
     
     # Build a smart color-to-indent mapping
@@ -136,30 +187,10 @@ def get_indentation_from_excel_colors(xlsx_path, sheet_name, element_col_name='E
         '00000000': 3,  # White/no fill - attributes (deepest)
     }
     
-    # Re-open the workbook to build the actual indent map by analyzing structure
-    wb = openpyxl.load_workbook(xlsx_path)
-    ws = wb[sheet_name]
-    
-    indent_map = {}
-    parent_stack = {}  # Maps indent level to parent element name
-    
-    for i in range(header_row + 1, ws.max_row + 1):
-        cell = ws.cell(i, element_col)
-        element_name = cell.value
-        
-        if not element_name or pd.isna(element_name):
+    indents = array('b', bytes(num_rows))
+    for position, element_name, color_rgb in element_colors:
+        if position >= num_rows:
             continue
-        
-        element_name = str(element_name).strip()
-        
-        color_rgb = None
-        if cell.fill and cell.fill.start_color:
-            if isinstance(cell.fill.start_color.rgb, str):
-                color_rgb = cell.fill.start_color.rgb
-        
-        if not color_rgb:
-            color_rgb = "00000000"
-        
         # Determine indent level
         if color_rgb in color_to_indent_map:
             indent_level = color_to_indent_map[color_rgb]
@@ -178,63 +209,76 @@ def get_indentation_from_excel_colors(xlsx_path, sheet_name, element_col_name='E
             else:
                 indent_level = 2  # Default to middle level
         
-        indent_map[element_name] = indent_level
-        parent_stack[indent_level] = element_name
-    
-    wb.close()
+        indents[position] = indent_level
     
-    print(f"Built indent map for {len(indent_map)} elements")
+    print(f"Built indent levels for {len(element_colors)} of {num_rows} rows")
     
     # Print a sample
-    print("\nSample indent mappings:")
-    for i, (elem, indent) in enumerate(list(indent_map.items())[:15]):
-        print(f"  {elem:<40} indent={indent}")
+    print("\nSample indent levels:")
+    for position, elem, _ in element_colors[:15]:
+        print(f"  {elem:<40} indent={indents[position]}")
     
-    return indent_map
+    return indents
+
+def build_paths(names, indents):
+    """
+    Builds the hierarchical path of every row from its name and indent level.
+    A stack of (level, path) pairs holds the current ancestors; each row pops
+    the entries at its own level or deeper and extends its parent's path, so
+    the work per row is bounded by the depth it climbs back up.
+    """
+    stack = []
+    paths = []
+    for name, indent in zip(names, indents):
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        path = f"{stack[-1][1]}/{name}" if stack else name
+        stack.append((indent, path))
+        paths.append(path)
+    return paths
 
 # --- Core Conversion Functions ---
 
+def adoc_columns(sheet_columns):
+    """Columns of the AsciiDoc table: the sheet's columns followed by COMPUTED_COLUMNS."""
+    return [col for col in sheet_columns if col not in COMPUTED_COLUMNS] + COMPUTED_COLUMNS
+
 def convert_xlsx_to_adoc(xlsx_path, output_path, sheet_name='ILCD EPD Format v1.3 Doc'):
-    """Converts the XLSX file to a single combined AsciiDoc file with indentation from colors."""
+    """Converts the XLSX file to a single combined AsciiDoc file with indentation from colors.
+
+    Returns (success, the sheet as read from the workbook). The round trip is
+    checked against that frame, not against the Indent and Path columns
+    computed from it.
+    """
+    # Read the cell values and the element fill colors in one pass (cached per workbook content)
     try:
-        df = pd.read_excel(xlsx_path, sheet_name=sheet_name, header=0)
+        df, element_colors = cached_load(xlsx_path, partial(read_sheet_with_colors, sheet_name=sheet_name),
+                                         f'xlsx {sheet_name}', XLSX_READER_VERSION)
     except FileNotFoundError:
         print(f"Error: XLSX file not found at {xlsx_path}")
         return False, None
-    except ValueError as e:
+    except KeyError as e:
         print(f"Error: Sheet '{sheet_name}' not found in workbook. Error: {e}")
         print(f"Available sheets: {pd.ExcelFile(xlsx_path).sheet_names}")
         return False, None
 
-    # Get indentation map from Excel colors
-    indent_map = get_indentation_from_excel_colors(xlsx_path, sheet_name)
+    df_source = df
+    df = df.copy()
+
+    # Get per-row indentation levels from Excel colors
+    indents = get_indentation_from_colors(element_colors, len(df))
 
     # Add 'Indent' column and populate it
-    df['Indent'] = df['Element/Attribute Name'].map(indent_map).fillna(0).astype(int)
+    df['Indent'] = np.frombuffer(indents, dtype=np.int8).astype(int)
 
     # --- Build hierarchical path ---
-    path_stack = {}
-    paths = []
-    for _, row in df.iterrows():
-        indent = row['Indent']
-        # Use a cleaned-up version for the path component
-        name = str(row['Element/Attribute Name']).strip().replace(' ', '_')
-        path_stack[indent] = name
-        
-        # Clear deeper levels from the stack
-        keys_to_remove = [k for k in path_stack.keys() if k > indent]
-        for k in keys_to_remove:
-            del path_stack[k]
-        
-        current_path = []
-        for i in sorted(path_stack.keys()):
-            current_path.append(path_stack[i])
-        paths.append('/'.join(current_path))
+    # Use a cleaned-up version of the name for the path component
+    names = [str(name).strip().replace(' ', '_') for name in df['Element/Attribute Name']]
+    paths = build_paths(names, indents)
     df['Path'] = paths
 
     # Ensure 'Indent' and 'Path' are the last columns for clarity
-    cols = [col for col in df.columns if col not in ['Indent', 'Path']] + ['Indent', 'Path']
-    df = df[cols]
+    df = df[adoc_columns(df.columns)]
 
     original_columns = df.columns.tolist()
 
@@ -281,100 +325,153 @@ def convert_xlsx_to_adoc(xlsx_path, output_path, sheet_name='ILCD EPD Format v1.
     for i, path in enumerate(paths[:10]):
         print(f"  {path}")
     
-    return True, original_columns
+    return True, df_source
+
+def read_adoc_table(adoc_path, original_columns):
+    """Reads the combined AsciiDoc table back into a DataFrame of the original cell values."""
+    try:
+        rows = iter_asciidoc_table(adoc_path, strip=False, pad=False)
+        headers = [header.strip() for header in next(rows)]
+        if headers != list(original_columns):
+            print(f"Error: Table columns {headers} do not match the expected columns {list(original_columns)}.")
+            return None
+
+        data = []
+        element_attr_name_index = original_columns.index('Element/Attribute Name')
+
+        for row_cells in rows:
+            processed_cells = []
+            for j, cell in enumerate(row_cells):
+                # Restore newlines, un-escape pipes, and handle placeholders
+                # The rstrip is crucial to remove the trailing ' +' from the last line of multi-line cells
+                processed_cell = cell.rstrip(' ').rstrip('+').replace(' +\n', '\n').replace('\\|', '|')
+                processed_cell = unescape_trailing_backslashes(processed_cell)
+                if processed_cell == '{nbsp}':
+                    processed_cell = None
+                
+                # Strip visual indentation from the specific column before comparison
+                if j == element_attr_name_index and isinstance(processed_cell, str):
+                    processed_cell = re.sub(r'^(?:{nbsp})*', '', processed_cell)
+                
+                processed_cells.append(processed_cell)
+            data.append(processed_cells)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+    return pd.DataFrame(data, columns=original_columns)
 
 def convert_adoc_to_xlsx(adoc_path, xlsx_path, original_columns):
     """Converts a combined AsciiDoc file back to an XLSX file."""
-    with open(adoc_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find the main table content
-    table_match = re.search(r'options="header"\].*?\|===(.*)\|===', content, re.DOTALL)
-    if not table_match:
-        print("Error: Could not find main table in AsciiDoc file.")
+    df = read_adoc_table(adoc_path, original_columns)
+    if df is None:
         return False
-
-    table_str = table_match.group(1).strip()
-    
-    # Use re.DOTALL to correctly handle multi-line content within cells
-    raw_cells = re.findall(r'##(.*?)##', table_str, re.DOTALL)
-
-    # The first N cells are the header, skip them.
-    data_cells = raw_cells[len(original_columns):]
-
-    if len(data_cells) % len(original_columns) != 0:
-        print(f"Error: Cell count ({len(data_cells)}) is not a multiple of column count ({len(original_columns)}). File may be corrupt.")
-        return False
-
-    data = []
-    element_attr_name_index = original_columns.index('Element/Attribute Name')
-    num_cols = len(original_columns)
-
-    # Reconstruct rows from the flat list of cells
-    for i in range(0, len(data_cells), num_cols):
-        row_cells = data_cells[i:i+num_cols]
-        processed_cells = []
-        for j, cell in enumerate(row_cells):
-            # Restore newlines, un-escape pipes, and handle placeholders
-            # The rstrip is crucial to remove the trailing ' +' from the last line of multi-line cells
-            processed_cell = cell.rstrip(' ').rstrip('+').replace(' +\n', '\n').replace('\\|', '|')
-            if processed_cell == '{nbsp}':
-                processed_cell = None
-            
-            # Strip visual indentation from the specific column before comparison
-            if j == element_attr_name_index and isinstance(processed_cell, str):
-                processed_cell = re.sub(r'^(?:{nbsp})*', '', processed_cell)
-            
-            processed_cells.append(processed_cell)
-        data.append(processed_cells)
-    df = pd.DataFrame(data, columns=original_columns)
     df.to_excel(xlsx_path, index=False, sheet_name='ILCD EPD Format v1.3 Doc')
     print(f"Successfully generated round-trip file {xlsx_path}")
     return True
 
-def compare_xlsx_files(file1, file2, log_file):
-    """Compares two XLSX files and logs differences."""
-    df1 = pd.read_excel(file1, sheet_name='ILCD EPD Format v1.3 Doc').fillna('').astype(str)
-    df2 = pd.read_excel(file2, sheet_name='ILCD EPD Format v1.3 Doc').fillna('').astype(str)
+def normalize_for_comparison(df):
+    """Normalizes whole string columns at once: stripped, without a trailing '.0'."""
+    # '1' vs '1.0' is a common data type difference between the two files
+    return df.apply(lambda column: column.str.strip().str.replace(r'\.0$', '', regex=True))
 
+def compare_dataframes(df1, df2, log_file):
+    """Compares two sheets (as string DataFrames) and logs differences.
+
+    Per-row fingerprints locate the changed rows in a single vectorized pass;
+    only those rows are compared cell by cell. Returns the number of differing
+    cells, or None if the shapes do not match.
+    """
     # Ensure columns are in the same order
     df2 = df2[df1.columns]
 
-    # Manual, robust comparison to avoid metadata sensitivity
-    num_diffs = 0
     with open(log_file, 'w', encoding='utf-8') as log:
         if df1.shape != df2.shape:
             log.write(f"Shape mismatch: Original {df1.shape}, New {df2.shape}\n")
             print(f"Comparison failed due to shape mismatch. See {log_file}.")
             return
 
-        for r_idx in range(df1.shape[0]):
-            for c_idx in range(df1.shape[1]):
-                val1 = str(df1.iat[r_idx, c_idx]).strip()
-                val2 = str(df2.iat[r_idx, c_idx]).strip()
-
-                # Normalize for common data type differences (e.g., '1' vs '1.0')
-                if val1.endswith('.0'): val1 = val1[:-2]
-                if val2.endswith('.0'): val2 = val2[:-2]
-
-                if val1 != val2:
-                    num_diffs += 1
-                    col_name = df1.columns[c_idx]
-                    log.write(f"Difference at Row {r_idx + 2}, Column '{col_name}':\n")
-                    log.write(f"  Original: '{df1.iat[r_idx, c_idx]}'\n")
-                    log.write(f"  New     : '{df2.iat[r_idx, c_idx]}'\n\n")
+        norm1 = normalize_for_comparison(df1)
+        norm2 = normalize_for_comparison(df2)
+
+        # Row fingerprints: equal rows hash equal, so only differing rows remain
+        hashes1 = pd.util.hash_pandas_object(norm1, index=False).to_numpy()
+        hashes2 = pd.util.hash_pandas_object(norm2, index=False).to_numpy()
+        changed_rows = np.flatnonzero(hashes1 != hashes2)
+
+        cell_diffs = norm1.to_numpy()[changed_rows] != norm2.to_numpy()[changed_rows]
+        raw1 = df1.to_numpy()[changed_rows]
+        raw2 = df2.to_numpy()[changed_rows]
+        for row, col in zip(*np.nonzero(cell_diffs)):
+            log.write(f"Difference at Row {changed_rows[row] + 2}, Column '{df1.columns[col]}':\n")
+            log.write(f"  Original: '{raw1[row, col]}'\n")
+            log.write(f"  New     : '{raw2[row, col]}'\n\n")
+
+        diffs_per_column = pd.Series(cell_diffs.sum(axis=0), index=df1.columns)
+        diffs_per_column = diffs_per_column[diffs_per_column > 0].sort_values(ascending=False)
+        num_diffs = int(diffs_per_column.sum())
+        if num_diffs:
+            log.write(f"Differences per column ({len(changed_rows)} rows changed):\n")
+            for col_name, count in diffs_per_column.items():
+                log.write(f"  {col_name}: {count}\n")
 
     if num_diffs == 0:
         print("Comparison complete: No differences found.")
         with open(log_file, 'w') as f:
             f.write("Comparison complete: No differences found.")
     else:
-        print(f"Comparison complete: Found {num_diffs} differences. See {log_file} for details.")
+        print(f"Comparison complete: Found {num_diffs} differences in {len(changed_rows)} rows. See {log_file} for details.")
+        for col_name, count in diffs_per_column.items():
+            print(f"  {col_name}: {count}")
     return num_diffs
 
+def compare_xlsx_files(file1, file2, log_file):
+    """Compares two XLSX files and logs differences."""
+    df1 = pd.read_excel(file1, sheet_name='ILCD EPD Format v1.3 Doc').fillna('').astype(str)
+    df2 = pd.read_excel(file2, sheet_name='ILCD EPD Format v1.3 Doc').fillna('').astype(str)
+    return compare_dataframes(df1, df2, log_file)
+
+def validate_roundtrip(df_source, adoc_path, log_file, mode='memory', roundtrip_xlsx_path=None):
+    """Checks that the AsciiDoc file reproduces `df_source`, the sheet as read from the workbook.
+
+    Every mode compares the same two frames and only differs in how the table
+    gets back into a DataFrame: 'memory' hands what read_adoc_table returns
+    straight to the comparator, 'bytes' first serializes it to an in-memory
+    XLSX workbook and reads that back, and 'file' writes `roundtrip_xlsx_path`
+    and re-reads it. The computed Indent and Path columns are not compared,
+    since the workbook does not have them.
+    """
+    columns = adoc_columns(df_source.columns)
+    if mode == 'file':
+        if not convert_adoc_to_xlsx(adoc_path, roundtrip_xlsx_path, columns):
+            return None
+        df_roundtrip = pd.read_excel(roundtrip_xlsx_path, sheet_name='ILCD EPD Format v1.3 Doc', keep_default_na=False)
+    else:
+        df_roundtrip = read_adoc_table(adoc_path, columns)
+        if df_roundtrip is None:
+            return None
+        if mode == 'bytes':
+            buffer = io.BytesIO()
+            df_roundtrip.to_excel(buffer, index=False, sheet_name='ILCD EPD Format v1.3 Doc')
+            buffer.seek(0)
+            # Every cell was written as text, so text such as 'nan' must not turn into NaN
+            df_roundtrip = pd.read_excel(buffer, sheet_name='ILCD EPD Format v1.3 Doc', keep_default_na=False)
+    print(f"Validating round trip ({mode})...")
+
+    # Through object, so empty date cells become '' (not NaT) and dates read as clean_text wrote them
+    df_source = df_source.astype(object).fillna('').astype(str)
+    return compare_dataframes(df_source, df_roundtrip.fillna('').astype(str), log_file)
+
 # --- Main Execution ---
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the XLSX documentation to AsciiDoc and validate the round trip.")
+    parser.add_argument('--roundtrip', choices=['memory', 'bytes', 'file'], default='memory',
+                        help="how the AsciiDoc is read back before it is compared with the sheet: "
+                             "memory: compare the DataFrame read back from the AsciiDoc directly (default); "
+                             "bytes: go through an in-memory XLSX workbook; "
+                             "file: write and re-read output/roundtrip.xlsx")
+    args = parser.parse_args()
+
     # Define base directories
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     DATA_DIR = os.path.join(BASE_DIR, 'data')
@@ -390,9 +487,7 @@ if __name__ == "__main__":
     comparison_log_file = os.path.join(OUTPUT_DIR, 'comparison_log.txt')
 
     # Step 1: Convert XLSX to combined AsciiDoc
-    success, columns = convert_xlsx_to_adoc(xlsx_file, combined_adoc_file)
+    success, df_source = convert_xlsx_to_adoc(xlsx_file, combined_adoc_file)
     if success:
-        # Step 2: Convert back to XLSX for verification
-        if convert_adoc_to_xlsx(combined_adoc_file, roundtrip_xlsx_file, columns):
-            # Step 3: Compare the original and round-tripped files
-            compare_xlsx_files(xlsx_file, roundtrip_xlsx_file, comparison_log_file)
+        # Steps 2 and 3: Read the AsciiDoc back and compare it with the sheet as read in step 1
+        validate_roundtrip(df_source, combined_adoc_file, comparison_log_file, args.roundtrip, roundtrip_xlsx_file)
@@ -0,0 +1,137 @@
+"""
+Compiled checkers for the Datatype column of the EPD spec.
+
+The Datatype cells mix ILCD types (GlobalReferenceType, FTMultiLang, Real,
+Percentage, SchemaVersion, anyURI, ...) with inline restrictions such as
+`Restricted xs:int: +\\n0 +\\n1 +\\n2`. compile_datatype turns each distinct
+cell into a DatatypeChecker once - a precompiled regex, a frozenset of allowed
+codes and/or a numeric range - and memoizes it by the raw string, so checking
+millions of values reuses a few dozen checkers.
+"""
+
+import re
+from functools import lru_cache
+
+# xs:double lexical space, including the special values
+FLOAT_PATTERN = r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|[+-]?INF|NaN'
+
+# Lexical checks of the base types; types not listed here (strings,
+# multi-language text, references) accept any value.
+BASE_TYPES = {
+    'Real': {'pattern': FLOAT_PATTERN},
+    'xs:double': {'pattern': FLOAT_PATTERN},
+    'Percentage': {'pattern': FLOAT_PATTERN, 'minimum': 0, 'maximum': 100},
+    'common:Perc': {'pattern': FLOAT_PATTERN, 'minimum': 0, 'maximum': 100},
+    'Int6': {'pattern': r'[+-]?\d{1,6}'},
+    'xs:int': {'pattern': r'[+-]?\d+'},
+    'Year': {'pattern': r'\d{4}'},
+    'boolean': {'allowed': ('true', 'false', '1', '0')},
+    'xs:date': {'pattern': r'\d{4}-\d{2}-\d{2}(?:Z|[+-]\d{2}:\d{2})?'},
+    'dateTime': {'pattern': r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?'},
+    'UUID': {'pattern': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'},
+    'Version': {'pattern': r'\d{1,2}\.\d{1,2}(?:\.\d{1,3})?'},
+    'SchemaVersion': {'pattern': r'\d+(?:\.\d+){0,2}'},
+    'CAS Number': {'pattern': r'\d{2,7}-\d{2}-\d'},
+    'String with pattern 000-000-0': {'pattern': r'\d{3}-\d{3}-\d'},
+    'anyURI': {'pattern': r'\S+'},
+}
+
+RESTRICTED_PREFIX = 'Restricted '
+# 'Restricted xs:int:' with the allowed codes either on the following lines or inline after the colon
+RESTRICTED_PATTERN = re.compile(r'Restricted (\S+):(?:\s+(.*))?')
+# Head lines that name the type of the values listed below them rather than being a value
+TYPE_NAME_PATTERN = re.compile(r'xs:\S+|\w+Values')
+# What may follow a documented value: ' - description', ' / Übersetzung' or '/ Übersetzung'
+DESCRIPTION_SEPARATOR = re.compile(r' - |\s*/')
+
+def matches_documented_value(value, documented):
+    """Whether `value` is the value of a documented line.
+
+    The line is the value itself, or the value followed by a description
+    separator, or by a description run together with it
+    ('Not reviewedThe data set ...', a lower- to uppercase boundary).
+    """
+    if value == documented:
+        return True
+    if not value or not documented.startswith(value):
+        return False
+    rest = documented[len(value):]
+    if DESCRIPTION_SEPARATOR.match(rest):
+        return True
+    return value[-1].islower() and rest[0].isupper()
+
+class DatatypeChecker:
+    """Checks single values against one compiled Datatype.
+
+    Calling the checker returns an error message, or None if the value is valid.
+    """
+    __slots__ = ('name', 'pattern', 'allowed', 'documented_values', 'minimum', 'maximum')
+
+    def __init__(self, name, pattern=None, allowed=None, documented_values=None, minimum=None, maximum=None):
+        self.name = name
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.allowed = frozenset(allowed) if allowed is not None else None
+        # Values possibly followed by their description, see matches_documented_value
+        self.documented_values = tuple(documented_values) if documented_values is not None else None
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __call__(self, value):
+        if self.allowed is not None:
+            if value not in self.allowed:
+                return f"'{value}' is not one of {', '.join(sorted(self.allowed))}"
+            return None
+        if self.documented_values is not None:
+            if any(matches_documented_value(value, documented) for documented in self.documented_values):
+                return None
+            return f"'{value}' is not a documented value"
+        if self.pattern is not None and self.pattern.fullmatch(value) is None:
+            return f"'{value}' is not a valid {self.name}"
+        if self.minimum is not None or self.maximum is not None:
+            number = float(value)
+            if (self.minimum is not None and number < self.minimum) or (self.maximum is not None and number > self.maximum):
+                return f"'{value}' is outside the range {self.minimum}..{self.maximum} of {self.name}"
+        return None
+
+    def __repr__(self):
+        return f'DatatypeChecker({self.name!r})'
+
+def _cell_lines(datatype):
+    """Non-empty lines of a Datatype cell without the AsciiDoc ' +' line breaks."""
+    lines = (line.strip() for line in datatype.split('\n'))
+    lines = (line[:-1].rstrip() if line.endswith('+') else line for line in lines)
+    return [line for line in lines if line]
+
+@lru_cache(maxsize=None)
+def compile_datatype(datatype):
+    """Returns the DatatypeChecker for a raw Datatype cell, or None if it accepts any value.
+
+    Memoized by the raw string, so equal cells share one checker.
+    """
+    lines = _cell_lines(str(datatype))
+    if not lines:
+        return None
+    head = lines[0]
+    restricted = RESTRICTED_PATTERN.fullmatch(head)
+    if restricted is not None:
+        # Codes like 'A - inherent quality' on the following lines, or 'Restricted xs:int: 0 1 2' inline
+        base, inline_codes = restricted.groups()
+        codes = (inline_codes or '').split() + [line.split(' - ', 1)[0] for line in lines[1:]]
+        if codes:
+            return DatatypeChecker(base, allowed=codes)
+        spec = BASE_TYPES.get(base)
+        return DatatypeChecker(base, **spec) if spec is not None else None
+    if len(lines) > 1:
+        # A 'TypeOfReviewValues' or 'xs:string' head names the type; any other head is a value itself
+        if TYPE_NAME_PATTERN.fullmatch(head):
+            return DatatypeChecker(head, documented_values=lines[1:])
+        return DatatypeChecker('documented value', documented_values=lines)
+    spec = BASE_TYPES.get(head)
+    if spec is None:
+        return None
+    return DatatypeChecker(head, **spec)
+
+def check_value(datatype, value):
+    """Checks `value` against a raw Datatype cell; returns an error message or None."""
+    checker = compile_datatype(datatype)
+    return checker(value) if checker is not None else None
@@ -0,0 +1,122 @@
+"""
+Enumeration registry for the EPD spec.
+
+Enumerations appear in two forms in the Datatype column:
+  * as separate rows following the field they belong to, each holding one
+    value such as `A - inherent quality`, and
+  * embedded in a single cell as `Restricted xs:string: +\\nA - inherent quality +\\n...`.
+
+extract_enum_groups finds both in one vectorized pass over the DataFrame and
+build_enum_registry turns them into {path: [(code, label), ...]}. EnumRegistry
+bundles both; build.py creates it once next to the parsed DataFrame, so the
+report, the attribute pages and the viewer look values up without rescanning rows.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Enum value rows start with single letters like "A - ", "B - "
+ENUM_VALUE_PATTERN = r'^[A-Z] - '
+ENUM_VALUE_PARTS_PATTERN = r'(?s)^([A-Z]) - (.*)$'
+RESTRICTED_TYPE_PATTERN = r'(?s)^Restricted\s+([^\s:]+(?::[^\s:]+)?):\s*\+?\n(.*)$'
+
+# start/end are row positions: for separate enum rows `start` is the field row
+# and `end` the last value row, for embedded enums both are the field row.
+EnumGroup = namedtuple('EnumGroup', ['path', 'base_type', 'start', 'end', 'values'])
+
+def split_enum_value(text):
+    """Splits 'A - label' into ('A', 'label'); other values are returned as (value, '')."""
+    code, separator, label = text.partition(' - ')
+    if separator and len(code) == 1 and code.isupper():
+        return code, label
+    return text, ''
+
+def format_enum_value(code, label):
+    """Inverse of split_enum_value."""
+    return f'{code} - {label}' if label else code
+
+def _string_column(df, col_name):
+    if col_name not in df.columns:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    column = df[col_name]
+    return column.where(column.notna(), '').astype(str).str.strip()
+
+def _row_enum_groups(datatypes, paths):
+    """Finds runs of separate enum value rows and the field row that owns each run."""
+    is_value = datatypes.str.match(ENUM_VALUE_PATTERN).to_numpy(dtype=bool)
+    if not is_value.any():
+        return []
+    previous = np.concatenate(([False], is_value[:-1]))
+    following = np.concatenate((is_value[1:], [False]))
+    run_starts = np.flatnonzero(is_value & ~previous)
+    run_ends = np.flatnonzero(is_value & ~following)
+
+    parts = datatypes.str.extract(ENUM_VALUE_PARTS_PATTERN, expand=True)
+    codes = parts[0].tolist()
+    labels = parts[1].tolist()
+
+    groups = []
+    for run_start, run_end in zip(run_starts.tolist(), run_ends.tolist()):
+        # The field row precedes the run; a run at the very top owns itself
+        start = run_start - 1 if run_start > 0 else 0
+        first_value = start + 1
+        if first_value > run_end:
+            continue
+        values = list(zip(codes[first_value:run_end + 1], labels[first_value:run_end + 1]))
+        groups.append(EnumGroup(paths[start], datatypes.iat[start], start, run_end, values))
+    return groups
+
+def _embedded_enum_groups(datatypes, paths):
+    """Finds 'Restricted <type>:' cells and splits their value lines."""
+    parts = datatypes.str.extract(RESTRICTED_TYPE_PATTERN, expand=True)
+    matched = parts[0].notna().to_numpy()
+    groups = []
+    for position in np.flatnonzero(matched).tolist():
+        base_type, body = parts.iat[position, 0], parts.iat[position, 1]
+        values = []
+        for line in body.split('\n'):
+            line = line.strip()
+            if line.endswith('+'):
+                line = line[:-1].rstrip()
+            if line:
+                values.append(split_enum_value(line))
+        if values:
+            groups.append(EnumGroup(paths[position], base_type, position, position, values))
+    return groups
+
+def extract_enum_groups(df):
+    """Returns every enumeration in the DataFrame as EnumGroups, ordered by row."""
+    datatypes = _string_column(df, 'Datatype')
+    if 'Path' in df.columns:
+        paths = df['Path'].astype(str).tolist()
+    else:
+        paths = [f'row_{index}' for index in df.index]
+    groups = _row_enum_groups(datatypes, paths) + _embedded_enum_groups(datatypes, paths)
+    return sorted(groups, key=lambda group: group.start)
+
+def build_enum_registry(groups):
+    """Maps each path to its ordered list of (code, label) values.
+
+    When a path occurs more than once the last definition wins, as it does for
+    the attribute pages.
+    """
+    return {group.path: group.values for group in groups}
+
+class EnumRegistry:
+    """Every enumeration of one DataFrame, found in a single scan and shared by the emitters.
+
+    `groups` are in row order, `by_start` maps the row position of each
+    owning field row to its group and `values` is build_enum_registry's lookup.
+    """
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.by_start = {group.start: group for group in groups}
+        self.values = build_enum_registry(groups)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Scans the DataFrame (see extract_enum_groups)."""
+        return cls(extract_enum_groups(df))
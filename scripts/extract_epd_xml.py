@@ -0,0 +1,283 @@
+"""
+Spec-driven columnar extraction from ILCD+EPD process dataset XML files.
+
+The requested spec paths (elements or @attributes, including epd2:/epd24:
+names) are compiled into one matcher, a trie over the path segments. Each XML
+file is then streamed once with lxml iterparse, whatever the number of
+columns: an element is only looked up while its parent is on a requested path,
+and finished elements are cleared as in validate_epd_xml.
+
+Every file becomes one row (`file` plus one column per path). A path that
+occurs several times in a file, e.g. the language variants of a multi-language
+text, yields its values joined by MULTI_VALUE_SEPARATOR. Rows are written in
+batches to CSV or, when pyarrow is installed, to Parquet.
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+
+from spec_index import load_spec_index, normalize_path
+from validate_epd_xml import NAMESPACE_PREFIXES, find_xml_files, spec_name
+from cli_options import parse_jobs
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+DEFAULT_OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'epd_extract.csv')
+DEFAULT_BATCH_SIZE = 1000
+MULTI_VALUE_SEPARATOR = ' | '
+FILE_COLUMN = 'file'
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+# --- Matcher compilation ---
+
+class _MatchNode:
+    __slots__ = ('children', 'column', 'attributes')
+
+    def __init__(self):
+        self.children = {}
+        self.column = None    # Column of the element's text, if requested
+        self.attributes = {}  # {attribute name: column}
+
+def spec_path(path):
+    """Normalizes a requested path to the spec's naming.
+
+    Only the EPD prefixes are part of the spec names; other prefixes, as in
+    'common:UUID', are dropped like they are when matching elements.
+    """
+    segments = []
+    for segment in normalize_path(path).split('/'):
+        is_attribute = segment.startswith('@')
+        prefix, _, local_name = segment.lstrip('@').rpartition(':')
+        name = f'{prefix}:{local_name}' if prefix in NAMESPACE_PREFIXES.values() else local_name
+        segments.append('@' + name if is_attribute else name)
+    return '/'.join(segments)
+
+class PathMatcher:
+    """Compiled set of requested paths; `columns` lists them in output order."""
+
+    def __init__(self, paths):
+        self.columns = []
+        self.root = _MatchNode()
+        for path in paths:
+            path = spec_path(path)
+            if not path or path in self.columns:
+                continue
+            *parents, name = path.split('/')
+            if not parents and name.startswith('@'):
+                raise ValueError(f"Attribute path '{path}' has no element")
+            node = self.root
+            for segment in parents:
+                if segment.startswith('@'):
+                    raise ValueError(f"Path '{path}' continues below an attribute")
+                node = node.children.setdefault(segment, _MatchNode())
+            column = len(self.columns)
+            if name.startswith('@'):
+                node.attributes[name[1:]] = column
+            else:
+                node.children.setdefault(name, _MatchNode()).column = column
+            self.columns.append(path)
+
+def select_paths(index, paths=(), subtrees=()):
+    """Resolves the requested paths against the spec.
+
+    Unknown paths raise a KeyError. `subtrees` adds every path below each
+    given path that has a Datatype, i.e. carries a value. Without any
+    selection, all such paths of the spec are returned.
+    """
+    selected = []
+    for path in paths:
+        if spec_path(path) not in index:
+            raise KeyError(f"No spec row for path '{path}'")
+        selected.append(spec_path(path))
+    if not paths and not subtrees:
+        subtrees = ['']
+    for subtree in subtrees:
+        entries = index.subtree(spec_path(subtree)) if subtree else list(index)
+        if subtree and not entries:
+            raise KeyError(f"No spec row for path '{subtree}'")
+        selected.extend(entry.path for entry in entries if str(entry.row.get('Datatype', '') or '').strip())
+    return list(dict.fromkeys(selected))
+
+def compile_matcher(paths):
+    """Compiles the paths into a PathMatcher."""
+    return PathMatcher(paths)
+
+# --- Streaming extraction ---
+
+def extract_file(xml_file, matcher):
+    """Streams one XML file and returns its values, one string per matcher column.
+
+    Raises etree.XMLSyntaxError or OSError for unreadable files.
+    """
+    values = [[] for _ in matcher.columns]
+    names = {}  # {qualified tag: spec name}; the prefixes are fixed per document
+    stack = []  # Match node per open element, None outside the requested paths
+    for event, element in etree.iterparse(str(xml_file), events=('start', 'end'), remove_comments=True):
+        if event == 'start':
+            parent = stack[-1] if stack else matcher.root
+            node = None
+            if parent is not None and parent.children:
+                name = names.get(element.tag)
+                if name is None:
+                    name = names[element.tag] = spec_name(element.tag, element.nsmap, element.prefix)
+                node = parent.children.get(name)
+            stack.append(node)
+            if node is not None and node.attributes:
+                for qualified_name, value in element.attrib.items():
+                    column = node.attributes.get(spec_name(qualified_name, element.nsmap))
+                    if column is not None:
+                        values[column].append(value.strip())
+            continue
+
+        node = stack.pop()
+        if node is not None and node.column is not None:
+            text = (element.text or '').strip()
+            if text:
+                values[node.column].append(text)
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return [MULTI_VALUE_SEPARATOR.join(value) for value in values]
+
+_worker_matcher = None
+
+def _init_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def _extract_row(xml_file, matcher):
+    """(row, error message) for one file; row is None if the file could not be read."""
+    try:
+        return [str(xml_file)] + extract_file(xml_file, matcher), None
+    except (etree.XMLSyntaxError, OSError) as e:
+        return None, f"{xml_file}: {e}"
+
+def _extract_in_worker(xml_file):
+    return _extract_row(xml_file, _worker_matcher)
+
+def extract_batches(xml_files, matcher, jobs=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Extracts the files batch by batch, yielding (rows, errors) in input order.
+
+    With `jobs` > 1 each batch is spread over a process pool that receives the
+    matcher once per worker. Only one batch is held in memory at a time.
+    """
+    batches = (xml_files[i:i + batch_size] for i in range(0, len(xml_files), batch_size))
+    if jobs > 1 and len(xml_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(matcher,)) as pool:
+            for batch in batches:
+                chunksize = max(1, len(batch) // (jobs * 4))
+                yield _split_results(pool.map(_extract_in_worker, batch, chunksize=chunksize))
+    else:
+        for batch in batches:
+            yield _split_results(_extract_row(xml_file, matcher) for xml_file in batch)
+
+def _split_results(results):
+    rows = []
+    errors = []
+    for row, error in results:
+        if row is not None:
+            rows.append(row)
+        else:
+            errors.append(error)
+    return rows, errors
+
+# --- Batch writers ---
+
+class CsvBatchWriter:
+    """Appends batches of rows to a CSV file."""
+
+    def __init__(self, output_file, columns):
+        self._file = open(output_file, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_batch(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+class ParquetBatchWriter:
+    """Writes each batch of rows as one row group of a Parquet file (needs pyarrow)."""
+
+    def __init__(self, output_file, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet output needs pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(column, pa.string()) for column in columns])
+        self._writer = pq.ParquetWriter(output_file, self._schema)
+
+    def write_batch(self, rows):
+        if not rows:
+            return
+        arrays = [self._pa.array(column, type=self._pa.string()) for column in zip(*rows)]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+def open_batch_writer(output_file, columns, output_format=None):
+    """Opens the writer for `output_format`, by default chosen by the file extension."""
+    if output_format is None:
+        output_format = 'parquet' if output_file.lower().endswith('.parquet') else 'csv'
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'")
+    writer_class = ParquetBatchWriter if output_format == 'parquet' else CsvBatchWriter
+    return writer_class(output_file, columns)
+
+def extract_to_file(xml_files, matcher, output_file, output_format=None, jobs=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Extracts the files into `output_file`; returns (rows written, errors)."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    writer = open_batch_writer(output_file, [FILE_COLUMN] + matcher.columns, output_format)
+    written = 0
+    all_errors = []
+    try:
+        for rows, errors in extract_batches(xml_files, matcher, jobs=jobs, batch_size=batch_size):
+            writer.write_batch(rows)
+            written += len(rows)
+            all_errors.extend(errors)
+    finally:
+        writer.close()
+    return written, all_errors
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract spec paths from ILCD+EPD XML datasets into a CSV or Parquet table.")
+    parser.add_argument('inputs', nargs='+', help="XML files or directories (searched recursively)")
+    parser.add_argument('--path', '-p', dest='paths', action='append', default=[],
+                        help="spec path to extract, e.g. processDataSet/processInformation/dataSetInformation/UUID (repeatable)")
+    parser.add_argument('--subtree', dest='subtrees', action='append', default=[],
+                        help="extract every value-carrying path below this spec path (repeatable)")
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT_FILE, help="output file (.csv or .parquet)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="output format (default: from the file extension)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="files per written batch")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1,
+                        help="number of worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    try:
+        if args.batch_size < 1:
+            raise ValueError("--batch-size must be positive")
+        matcher = compile_matcher(select_paths(load_spec_index(), args.paths, args.subtrees))
+        xml_files = []
+        for item in args.inputs:
+            xml_files.extend(find_xml_files(item) if os.path.isdir(item) else [item])
+
+        written, errors = extract_to_file(xml_files, matcher, args.output, args.format,
+                                          jobs=args.jobs, batch_size=args.batch_size)
+        for error in errors:
+            print(f"Skipped {error}")
+        print(f"Extracted {len(matcher.columns)} columns from {written} files to {args.output}")
+
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
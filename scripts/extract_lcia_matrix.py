@@ -0,0 +1,288 @@
+"""
+LCIA results of EPD datasets as NumPy arrays.
+
+The spec documents the declared values as
+LCIAResults/LCIAResult/other/epd:amount, one per life cycle module (@epd:module)
+and optional scenario (@epd:scenario); the indicator is the LCIA method
+referenced by the LCIAResult. read_lcia_results streams one dataset and
+lcia_matrix turns its values into a dense scenario x module x indicator array.
+
+build_lcia_cube stacks a whole corpus into one memory-mapped .npy file of shape
+(dataset, scenario, module, indicator), NaN where a value is not declared,
+plus a JSON index naming every position of each axis. Aggregations across
+thousands of EPDs then become array operations, e.g.
+
+    cube, index = load_lcia_cube('output/lcia')
+    totals = np.nansum(cube[:, 0], axis=1)  # per dataset and indicator, default scenario
+"""
+
+import argparse
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from lxml import etree
+
+from validate_epd_xml import find_xml_files, spec_name
+from cli_options import parse_jobs
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+DEFAULT_CUBE_DIR = os.path.join(OUTPUT_DIR, 'lcia')
+CUBE_FILE_NAME = 'lcia_cube.npy'
+INDEX_FILE_NAME = 'lcia_cube_index.json'
+CUBE_AXES = ('dataset', 'scenario', 'module', 'indicator')
+DEFAULT_BATCH_SIZE = 1000
+
+# Spec paths read by the extractor
+UUID_PATH = 'processDataSet/processInformation/dataSetInformation/UUID'
+LCIA_RESULT_PATH = 'processDataSet/LCIAResults/LCIAResult'
+METHOD_REFERENCE_PATH = LCIA_RESULT_PATH + '/referenceToLCIAMethodDataSet'
+METHOD_NAME_PATH = METHOD_REFERENCE_PATH + '/shortDescription'
+AMOUNT_PATH = LCIA_RESULT_PATH + '/other/epd:amount'
+
+EPD_NAMESPACE = 'http://www.iai.kit.edu/EPD/2013'
+MODULE_ATTRIBUTE = f'{{{EPD_NAMESPACE}}}module'
+SCENARIO_ATTRIBUTE = f'{{{EPD_NAMESPACE}}}scenario'
+XML_LANG_ATTRIBUTE = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Life cycle modules of EN 15804 in declaration order; other modules sort after them
+MODULE_ORDER = ('A1-A3', 'A1', 'A2', 'A3', 'A4', 'A5', 'B1', 'B2', 'B3', 'B4', 'B5', 'B6', 'B7',
+                'C1', 'C2', 'C3', 'C4', 'D')
+# The value of an amount without @epd:scenario
+DEFAULT_SCENARIO = ''
+
+# One declared value; `indicator` is the UUID of the LCIA method data set
+LCIAValue = namedtuple('LCIAValue', ['indicator', 'module', 'scenario', 'value'])
+# indicator_names: {indicator UUID: short description}
+LCIAResults = namedtuple('LCIAResults', ['file', 'uuid', 'values', 'indicator_names'])
+LCIAMatrix = namedtuple('LCIAMatrix', ['values', 'scenarios', 'modules', 'indicators'])
+
+# --- Reading one dataset ---
+
+def _parse_amount(text):
+    """The float of an epd:amount, or None for blank or non-numeric values."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+def read_lcia_results(xml_file):
+    """Streams one dataset and returns its LCIAResults.
+
+    Raises etree.XMLSyntaxError or OSError for unreadable files.
+    """
+    uuid = ''
+    values = []
+    indicator_names = {}
+    indicator = None
+    names = {}  # {qualified tag: spec name}
+    stack = []
+    for event, element in etree.iterparse(str(xml_file), events=('start', 'end'), remove_comments=True):
+        if event == 'start':
+            name = names.get(element.tag)
+            if name is None:
+                name = names[element.tag] = spec_name(element.tag, element.nsmap, element.prefix)
+            path = f'{stack[-1]}/{name}' if stack else name
+            stack.append(path)
+            if path == LCIA_RESULT_PATH:
+                indicator = None
+            elif path == METHOD_REFERENCE_PATH:
+                indicator = element.get('refObjectId', '').strip()
+            continue
+
+        path = stack.pop()
+        if path == AMOUNT_PATH:
+            value = _parse_amount(element.text)
+            if value is not None and indicator:
+                module = element.get(MODULE_ATTRIBUTE, '').strip()
+                scenario = element.get(SCENARIO_ATTRIBUTE, DEFAULT_SCENARIO).strip()
+                values.append(LCIAValue(indicator, module, scenario, value))
+        elif path == METHOD_NAME_PATH and indicator:
+            # Prefer the English description of the method
+            text = (element.text or '').strip()
+            language = element.get(XML_LANG_ATTRIBUTE)
+            if text and (indicator not in indicator_names or language == 'en'):
+                indicator_names[indicator] = text
+        elif path == UUID_PATH:
+            uuid = (element.text or '').strip()
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    return LCIAResults(str(xml_file), uuid, values, indicator_names)
+
+def module_sort_key(module):
+    """Sorts modules in EN 15804 order, unknown ones alphabetically after them."""
+    if module in MODULE_ORDER:
+        return (0, MODULE_ORDER.index(module), module)
+    return (1, 0, module)
+
+def scenario_sort_key(scenario):
+    """The default scenario first, then the named ones alphabetically."""
+    return (scenario != DEFAULT_SCENARIO, scenario)
+
+def lcia_matrix(values, scenarios=None, modules=None, indicators=None):
+    """Dense scenario x module x indicator array of LCIAValues, NaN where undeclared.
+
+    Axes that are not given are built from the values. Values outside given
+    axes are dropped.
+    """
+    if scenarios is None:
+        scenarios = sorted({v.scenario for v in values}, key=scenario_sort_key)
+    if modules is None:
+        modules = sorted({v.module for v in values}, key=module_sort_key)
+    if indicators is None:
+        indicators = list(dict.fromkeys(v.indicator for v in values))
+    scenario_positions = {scenario: i for i, scenario in enumerate(scenarios)}
+    module_positions = {module: i for i, module in enumerate(modules)}
+    indicator_positions = {indicator: i for i, indicator in enumerate(indicators)}
+    matrix = np.full((len(scenarios), len(modules), len(indicators)), np.nan)
+    for value in values:
+        s = scenario_positions.get(value.scenario)
+        m = module_positions.get(value.module)
+        i = indicator_positions.get(value.indicator)
+        if s is not None and m is not None and i is not None:
+            matrix[s, m, i] = value.value
+    return LCIAMatrix(matrix, list(scenarios), list(modules), list(indicators))
+
+def read_lcia_matrix(xml_file):
+    """Reads one dataset straight into its LCIAMatrix."""
+    return lcia_matrix(read_lcia_results(xml_file).values)
+
+# --- Corpus cube ---
+
+def _read_safely(xml_file):
+    """(LCIAResults, error message); the results are None if the file could not be read."""
+    try:
+        return read_lcia_results(xml_file), None
+    except (etree.XMLSyntaxError, OSError) as e:
+        return None, f"{xml_file}: {e}"
+
+def iter_lcia_results(xml_files, jobs=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Yields (LCIAResults or None, error) for the files in input order, optionally in a process pool."""
+    if jobs > 1 and len(xml_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for start in range(0, len(xml_files), batch_size):
+                batch = xml_files[start:start + batch_size]
+                yield from pool.map(_read_safely, batch, chunksize=max(1, len(batch) // (jobs * 4)))
+    else:
+        for xml_file in xml_files:
+            yield _read_safely(xml_file)
+
+class _Axis:
+    """Assigns positions to labels in order of first appearance."""
+
+    def __init__(self):
+        self.positions = {}
+
+    def encode(self, labels):
+        return np.fromiter((self.positions.setdefault(label, len(self.positions)) for label in labels),
+                           dtype=np.int32, count=len(labels))
+
+    def ordered(self, sort_key=None):
+        """(labels in final order, old position -> new position)."""
+        labels = list(self.positions)
+        if sort_key is not None:
+            labels.sort(key=sort_key)
+        remap = np.empty(len(labels), dtype=np.int32)
+        for new_position, label in enumerate(labels):
+            remap[self.positions[label]] = new_position
+        return labels, remap
+
+def build_lcia_cube(xml_files, output_dir=DEFAULT_CUBE_DIR, jobs=1, batch_size=DEFAULT_BATCH_SIZE):
+    """Writes the cube and its index for a corpus; returns (cube file, index file, errors).
+
+    The values are first collected as coordinate arrays (a few bytes per
+    declared value), then scattered into the memory-mapped cube in one
+    vectorized assignment. Datasets that cannot be read are left out.
+    """
+    scenario_axis, module_axis, indicator_axis = _Axis(), _Axis(), _Axis()
+    datasets = []
+    indicator_names = {}
+    errors = []
+    coordinates = []  # Per dataset: (dataset, scenario, module, indicator, value) arrays
+    for results, error in iter_lcia_results(xml_files, jobs=jobs, batch_size=batch_size):
+        if results is None:
+            errors.append(error)
+            continue
+        for indicator, name in results.indicator_names.items():
+            indicator_names.setdefault(indicator, name)
+        values = results.values
+        coordinates.append((
+            np.full(len(values), len(datasets), dtype=np.int32),
+            scenario_axis.encode([v.scenario for v in values]),
+            module_axis.encode([v.module for v in values]),
+            indicator_axis.encode([v.indicator for v in values]),
+            np.fromiter((v.value for v in values), dtype=np.float64, count=len(values)),
+        ))
+        datasets.append({'file': results.file, 'uuid': results.uuid})
+
+    scenarios, scenario_remap = scenario_axis.ordered(scenario_sort_key)
+    modules, module_remap = module_axis.ordered(module_sort_key)
+    indicators, indicator_remap = indicator_axis.ordered()
+    shape = (len(datasets), len(scenarios), len(modules), len(indicators))
+
+    os.makedirs(output_dir, exist_ok=True)
+    cube_file = os.path.join(output_dir, CUBE_FILE_NAME)
+    cube = np.lib.format.open_memmap(cube_file, mode='w+', dtype=np.float64, shape=shape)
+    cube[...] = np.nan
+    if coordinates:
+        d, s, m, i, v = (np.concatenate(axis) for axis in zip(*coordinates))
+        cube[d, scenario_remap[s], module_remap[m], indicator_remap[i]] = v
+    cube.flush()
+    del cube
+
+    index = {
+        'axes': list(CUBE_AXES),
+        'shape': list(shape),
+        'datasets': datasets,
+        'scenarios': scenarios,
+        'modules': modules,
+        'indicators': [{'uuid': uuid, 'name': indicator_names.get(uuid, '')} for uuid in indicators],
+    }
+    index_file = os.path.join(output_dir, INDEX_FILE_NAME)
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    return cube_file, index_file, errors
+
+def load_lcia_cube(output_dir=DEFAULT_CUBE_DIR, mmap_mode='r'):
+    """Opens a cube written by build_lcia_cube; returns (memory-mapped array, index dict)."""
+    with open(os.path.join(output_dir, INDEX_FILE_NAME), encoding='utf-8') as f:
+        index = json.load(f)
+    cube = np.load(os.path.join(output_dir, CUBE_FILE_NAME), mmap_mode=mmap_mode)
+    if list(cube.shape) != index['shape']:
+        raise ValueError(f"Cube shape {cube.shape} does not match its index {tuple(index['shape'])}")
+    return cube, index
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stack the LCIA results of EPD datasets into a memory-mapped NumPy cube.")
+    parser.add_argument('inputs', nargs='+', help="XML files or directories (searched recursively)")
+    parser.add_argument('--output-dir', '-o', default=DEFAULT_CUBE_DIR,
+                        help=f"directory for {CUBE_FILE_NAME} and {INDEX_FILE_NAME}")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="files per batch in the process pool")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1,
+                        help="number of worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    try:
+        if args.batch_size < 1:
+            raise ValueError("--batch-size must be positive")
+        xml_files = []
+        for item in args.inputs:
+            xml_files.extend(find_xml_files(item) if os.path.isdir(item) else [item])
+
+        cube_file, index_file, errors = build_lcia_cube(xml_files, args.output_dir, jobs=args.jobs,
+                                                        batch_size=args.batch_size)
+        for error in errors:
+            print(f"Skipped {error}")
+        cube, index = load_lcia_cube(args.output_dir)
+        print(f"Wrote {cube_file} {' x '.join(f'{n} {axis}s' for n, axis in zip(cube.shape, CUBE_AXES))} "
+              f"({np.count_nonzero(~np.isnan(cube))} declared values) and {index_file}")
+
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
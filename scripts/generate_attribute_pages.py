@@ -2,8 +2,18 @@ import pandas as pd
 import re
 import html
 import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import quote
 
+from spec_cache import CACHE_DIR, load_spec_table
+from cli_options import parse_jobs
+from enum_registry import EnumRegistry, format_enum_value
+from generate_html_report import (REPORT_LANGUAGES, build_tree_prefixes, language_variant_file,
+                                  normalize_report_languages, relative_url, tree_prefix_html)
+
 # --- Constants ---
 # Define base directories
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,56 +25,143 @@ os.makedirs(DOCS_DIR, exist_ok=True)
 
 ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
 PAGES_OUTPUT_DIR = os.path.join(DOCS_DIR, 'attribute_pages')
+INDEX_FILENAME = 'index.html'
+# Content hash of every generated page, used to skip rewriting unchanged pages and to
+# know which pages earlier builds wrote. It lives next to the spec cache, outside the published docs/.
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'attribute_pages_manifest.json')
+# Where builds before the move kept it; read once so their pages can still be pruned
+LEGACY_MANIFEST_FILE = os.path.join(PAGES_OUTPUT_DIR, '.build_manifest.json')
+MANIFEST_VERSION = 1
+# Single-page viewer (--mode viewer): one shell plus one JSON shard per top-level section
+PAGES_MODES = ('pages', 'viewer')
+VIEWER_FILE = os.path.join(DOCS_DIR, 'attribute.html')
+VIEWER_DATA_DIR = os.path.join(DOCS_DIR, 'attribute_data')
+VIEWER_INDEX_FILENAME = 'index.json'
+VIEWER_DATA_VERSION = 1
+# Columns that are not listed as fields on an attribute page
+ATTRIBUTE_SKIPPED_FIELDS = ('Path', 'Indent', 'Element/Attribute Name')
+LANGUAGE_NAMES = {'en': 'English', 'de': 'German'}
 
-# --- Data Loading and Parsing ---
-def parse_asciidoc_table(filename):
-    """Parses the main data table from an AsciiDoc file."""
-    print(f"Reading data from {filename}...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
+def sanitize_filename(path):
+    """Convert a path to a safe filename."""
+    return re.sub(r'[^a-zA-Z0-9._-]', '_', str(path))
 
-    table_match = re.search(r'\.EPD Data Structure\n.*?\|===(.*?)(\|===)', content, re.DOTALL)
-    if not table_match:
-        raise ValueError("Could not find the '.EPD Data Structure' table in the AsciiDoc file.")
+def content_hash(content):
+    """Returns the SHA-256 hex digest of a rendered page."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
-    table_content = table_match.group(1).strip()
-    
-    header_match = re.search(r'(\| \[role="title"\]##.*?##\n)+', table_content)
-    if not header_match:
-        raise ValueError("Could not parse the table header.")
-        
-    header_str = header_match.group(0)
-    headers = [h.strip() for h in re.findall(r'##(.*?)##', header_str)]
-    
-    body_str = table_content[len(header_str):].strip()
-    cells = [c.strip() for c in re.findall(r'##(.*?)##', body_str, re.DOTALL)]
-    
-    num_columns = len(headers)
-    
-    if len(cells) % num_columns != 0:
-        padding = num_columns - (len(cells) % num_columns)
-        cells.extend([''] * padding)
-        
-    rows = [cells[i:i + num_columns] for i in range(0, len(cells), num_columns)]
-    
-    df = pd.DataFrame(rows, columns=headers)
-    df.replace('{nbsp}', '', regex=True, inplace=True)
-    
-    if 'Indent' in df.columns:
-        df['Indent'] = pd.to_numeric(df['Indent'], errors='coerce').fillna(0).astype(int)
+def load_manifest(manifest_file=MANIFEST_FILE, legacy_file=LEGACY_MANIFEST_FILE):
+    """Loads the page manifest of the previous build as {filename: {'path', 'sha256'}}.
+
+    Falls back to `legacy_file` when `manifest_file` does not exist yet.
+    """
+    for candidate in (manifest_file, legacy_file):
+        try:
+            with open(candidate, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            break
+        except FileNotFoundError:
+            continue
+        except ValueError:
+            return {}
     else:
-        df['Indent'] = 0
-        
-    return df
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('pages', {})
 
-def sanitize_filename(path):
-    """Convert a path to a safe filename."""
-    return re.sub(r'[^a-zA-Z0-9._-]', '_', str(path))
+def save_manifest(pages, manifest_file=MANIFEST_FILE, legacy_file=LEGACY_MANIFEST_FILE):
+    """Writes the page manifest, sorted by filename so it diffs cleanly, and removes `legacy_file`."""
+    manifest = {'version': MANIFEST_VERSION, 'pages': dict(sorted(pages.items()))}
+    content = json.dumps(manifest, indent=1, ensure_ascii=False) + '\n'
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    write_if_changed(manifest_file, content)
+    if legacy_file and os.path.exists(legacy_file):
+        os.remove(legacy_file)
+
+def write_if_changed(filepath, content, known_hash=None):
+    """Writes `content` to `filepath` unless the file already holds exactly that content.
+
+    `known_hash` is the hash recorded for the file by the previous build; when it
+    matches, the file is not even read. Untouched files keep their mtime.
+    Returns (content hash, whether the file was written).
+    """
+    digest = content_hash(content)
+    if os.path.exists(filepath):
+        if known_hash == digest:
+            return digest, False
+        if known_hash is None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                if content_hash(f.read()) == digest:
+                    return digest, False
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return digest, True
+
+def prune_orphan_pages(keep_filenames, previous_filenames, pages_dir=PAGES_OUTPUT_DIR):
+    """Deletes pages an earlier build generated (`previous_filenames`, from its manifest) that the
+    current build did not produce. Files no build recorded, e.g. hand-placed ones, are never touched."""
+    removed = []
+    for filename in sorted(set(previous_filenames) - set(keep_filenames)):
+        try:
+            os.remove(os.path.join(pages_dir, filename))
+        except FileNotFoundError:
+            continue
+        removed.append(filename)
+    return removed
+
+def attribute_field_label(field_name):
+    """The displayed label of a column and its language ('en', 'de' or '')."""
+    if '(en)' in field_name:
+        return field_name.replace(' (en)', '').strip(), 'en'
+    if '(de)' in field_name:
+        return field_name.replace(' (de)', '').strip(), 'de'
+    return field_name, ''
+
+def attribute_field_value(field_name, field_value, enum_group=None):
+    """The displayed value of a field as (text, items).
+
+    `items` is a list for enumerations (with `text` as their header) and
+    multi-line values, otherwise None. An empty `text` without items is shown
+    as a placeholder.
+    """
+    # Normalize value to string and allow empty display
+    if pd.isna(field_value):
+        field_value_str = ''
+    else:
+        field_value_str = str(field_value).strip()
+
+    # Handle boolean-like fields for better display
+    if field_name in ['Technically Required']:
+        if field_value_str.lower() in ['true', 'yes', '1']:
+            field_value_str = 'Yes'
+        elif field_value_str.lower() in ['false', 'no', '0']:
+            field_value_str = 'No'
+
+    if field_name == 'Datatype' and enum_group:
+        # Embedded enums keep their 'Restricted <type>:' line as the header
+        header_text = field_value_str.split('\n')[0].rstrip(' +') if enum_group.start == enum_group.end else field_value_str
+        return header_text, [format_enum_value(code, label) for code, label in enum_group.values]
+    if field_value_str and '\n' in field_value_str:
+        return '', [item.strip() for item in field_value_str.split('\n') if item.strip()]
+    return field_value_str, None
+
+def field_in_language(field_name, language):
+    """Whether a field belongs to the `language` variant; 'both' has every field."""
+    return language == 'both' or attribute_field_label(field_name)[1] in ('', language)
 
-def generate_attribute_page(row_data, index):
-    """Generate a Wiktionary-style page for a single attribute."""
+def attribute_element_name(row_data):
+    """The element/attribute name shown as a page's title."""
+    return str(row_data.get('Element/Attribute Name', '')).replace('|&nbsp;&nbsp;', '').strip()
+
+def generate_attribute_page(row_data, index, enum_group=None):
+    """Generate a Wiktionary-style page for a single attribute.
+
+    `enum_group` is the attribute's EnumGroup from the enum registry, if any;
+    its values are listed under the Datatype field.
+    """
     
-    element_name = str(row_data.get('Element/Attribute Name', '')).replace('|&nbsp;&nbsp;', '').strip()
+    element_name = attribute_element_name(row_data)
     path = str(row_data.get('Path', f'row_{index}'))
     
     page_content = f"""<!DOCTYPE html>
@@ -101,43 +198,23 @@ def generate_attribute_page(row_data, index):
     # Dynamically iterate over all fields in the row data
     for field_name, field_value in row_data.items():
         # Skip only internal fields and the name itself; include even empty values for visibility
-        if field_name in ['Path', 'Indent', 'Element/Attribute Name']:
+        if field_name in ATTRIBUTE_SKIPPED_FIELDS:
             continue
+        label, lang = attribute_field_label(field_name)
+        text, items = attribute_field_value(field_name, field_value, enum_group)
 
-        # Normalize value to string and allow empty display
-        if pd.isna(field_value):
-            field_value_str = ''
-        else:
-            field_value_str = str(field_value).strip()
-
-        # Handle boolean-like fields for better display
-        if field_name in ['Technically Required']:
-            if field_value_str.lower() in ['true', 'yes', '1']:
-                field_value_str = 'Yes'
-            elif field_value_str.lower() in ['false', 'no', '0']:
-                field_value_str = 'No'
-
-        # Prepare the field label, cleaning it and adding language indicators
-        clean_field_name = field_name
         lang_indicator = ''
         field_class = 'field'
-        
-        if '(en)' in field_name:
-            lang_indicator = ' <span class="lang-indicator">(English)</span>'
-            clean_field_name = field_name.replace(' (en)', '').strip()
-            field_class += ' lang-en'
-        elif '(de)' in field_name:
-            lang_indicator = ' <span class="lang-indicator">(German)</span>'
-            clean_field_name = field_name.replace(' (de)', '').strip()
-            field_class += ' lang-de'
-
-        # Build field value HTML (list for multiline, placeholder for empty)
-        if field_value_str and '\n' in field_value_str:
-            items = field_value_str.split('\n')
-            items_html = "<ul>" + "".join(f"<li>{html.escape(item.strip())}</li>" for item in items if item.strip()) + "</ul>"
-            field_html = f'<div class="field-value">{items_html}</div>'
-        elif field_value_str:
-            field_html = f'<div class="field-value">{html.escape(field_value_str)}</div>'
+        if lang:
+            lang_indicator = f' <span class="lang-indicator">({LANGUAGE_NAMES[lang]})</span>'
+            field_class += f' lang-{lang}'
+
+        # Build field value HTML (enum list, list for multiline, placeholder for empty)
+        if items is not None:
+            items_html = "<ul>" + "".join(f"<li>{html.escape(item)}</li>" for item in items) + "</ul>"
+            field_html = f'<div class="field-value">{html.escape(text)}{items_html}</div>'
+        elif text:
+            field_html = f'<div class="field-value">{html.escape(text)}</div>'
         else:
             field_class += ' empty'
             field_html = '<div class="field-value">&mdash;</div>'
@@ -145,7 +222,7 @@ def generate_attribute_page(row_data, index):
         # Add the field to the page content
         page_content += f"""
         <div class="{field_class}">
-            <div class="field-label">{html.escape(clean_field_name)}{lang_indicator}</div>
+            <div class="field-label">{html.escape(label)}{lang_indicator}</div>
             {field_html}
         </div>
 """
@@ -160,37 +237,102 @@ def generate_attribute_page(row_data, index):
     
     return page_content
 
-def generate_all_attribute_pages(df):
-    """Generate individual attribute pages for all rows in the DataFrame."""
+def write_page_chunk(columns, tasks):
+    """Renders and writes one chunk of attribute pages.
+
+    Rows arrive as plain tuples so the chunk can be sent to a worker process
+    cheaply; each task is (index, path, values, enum_group, filepath, known_hash).
+    Returns (filename, path, content hash, whether written) per task.
+    """
+    results = []
+    for index, path, values, enum_group, filepath, known_hash in tasks:
+        page_content = generate_attribute_page(dict(zip(columns, values)), index, enum_group)
+        digest, was_written = write_if_changed(filepath, page_content, known_hash)
+        results.append((os.path.basename(filepath), path, digest, was_written))
+    return results
+
+def split_into_chunks(items, num_chunks):
+    """Splits a list into at most `num_chunks` contiguous, evenly sized chunks."""
+    chunk_size = max(1, -(-len(items) // max(1, num_chunks)))
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+def plan_attribute_pages(df, enums=None):
+    """Works out which page every row belongs to.
+
+    Returns (pages_info, page_rows): pages_info lists every row in document
+    order with its 'path', 'name', 'tree_prefix' and 'filename'; page_rows
+    maps each filename to the (index, path, values, enum_group) of the row
+    rendered into it. Rows whose paths sanitize to the same filename
+    overwrite each other, so only the last of them is rendered. `enums` is
+    the DataFrame's EnumRegistry; without it the rows are scanned.
+    """
+    paths = [str(row_path) for row_path in df['Path']] if 'Path' in df.columns else [f'row_{index}' for index in df.index]
+    filenames = [f"{sanitize_filename(path)}.html" for path in paths]
+    if enums is None:
+        enums = EnumRegistry.from_dataframe(df)
+    names = [str(name).strip() for name in df['Element/Attribute Name']] if 'Element/Attribute Name' in df.columns else paths
+    tree_prefixes = build_tree_prefixes(df['Indent'].tolist() if 'Indent' in df.columns else [0] * len(df))
+    
+    pages_info = []
+    page_rows = {}
+    rows = zip(df.index, df.itertuples(index=False, name=None))
+    for position, (index, values) in enumerate(rows):
+        path = paths[position]
+        filename = filenames[position]
+        pages_info.append({
+            'path': path,
+            'name': names[position] or path,
+            'tree_prefix': tree_prefixes[position],
+            'filename': filename,
+        })
+        page_rows[filename] = (index, path, values, enums.by_start.get(position))
+    return pages_info, page_rows
+
+def generate_all_attribute_pages(df, jobs=1, enums=None):
+    """Generate individual attribute pages for all rows in the DataFrame.
+
+    Only pages whose rendered content changed are rewritten, and pages an
+    earlier build wrote that the spec no longer produces are deleted. With `jobs` > 1 the rows are
+    partitioned across a process pool and the workers write the pages.
+    """
     
     if not os.path.exists(PAGES_OUTPUT_DIR):
         os.makedirs(PAGES_OUTPUT_DIR)
         print(f"Created directory: {PAGES_OUTPUT_DIR}")
     
-    generated_pages = []
+    previous_manifest = load_manifest()
+    generated_pages, page_rows = plan_attribute_pages(df, enums)
+    for page_info in generated_pages:
+        page_info['filepath'] = os.path.join(PAGES_OUTPUT_DIR, page_info['filename'])
+    tasks = []
+    for filename, (index, path, values, enum_group) in page_rows.items():
+        known_hash = previous_manifest.get(filename, {}).get('sha256')
+        tasks.append((index, path, values, enum_group, os.path.join(PAGES_OUTPUT_DIR, filename), known_hash))
     
-    for index, row in df.iterrows():
-        path = str(row.get('Path', f'row_{index}'))
-        sanitized_path = sanitize_filename(path)
-        
-        page_content = generate_attribute_page(row, index)
-        
-        filename = f"{sanitized_path}.html"
-        filepath = os.path.join(PAGES_OUTPUT_DIR, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        
-        generated_pages.append({
-            'path': path,
-            'filename': filename,
-            'filepath': filepath
-        })
+    columns = list(df.columns)
+    if jobs > 1 and len(tasks) > 1:
+        # A few chunks per worker keeps the pool busy when page sizes vary
+        chunks = split_into_chunks(tasks, jobs * 4)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunk_results = list(pool.map(write_page_chunk, [columns] * len(chunks), chunks))
+    else:
+        chunk_results = [write_page_chunk(columns, tasks)]
+    
+    manifest = {}
+    written = 0
+    for results in chunk_results:
+        for filename, path, digest, was_written in results:
+            manifest[filename] = {'path': path, 'sha256': digest}
+            written += was_written
+    
+    removed = prune_orphan_pages(set(manifest) | {INDEX_FILENAME}, previous_manifest)
+    save_manifest(manifest)
+    print(f"Attribute pages: {written} written, {len(manifest) - written} unchanged, {len(removed)} removed")
     
     return generated_pages
 
-def generate_index_page(pages_info):
-    """Generate an index page listing all attribute pages."""
+def render_index_page(pages_info):
+    """Renders the index page listing all attribute pages."""
     
     index_content = f"""<!DOCTYPE html>
 <html lang="en">
@@ -214,11 +356,10 @@ def generate_index_page(pages_info):
         <p>Click on any attribute below to view its detailed information:</p>
 """
 
+    # Pages are listed in document order as a tree; the full path is the link's tooltip
     for page_info in pages_info:
         index_content += f"""
-        <a href="{html.escape(page_info['filename'])}" class="page-link" target="_blank">
-            <div class="path">{html.escape(page_info['path'])}</div>
-        </a>
+        <div class="tree-entry">{tree_prefix_html(page_info.get('tree_prefix', ''))}<a href="{html.escape(page_info['filename'])}" class="page-link" target="_blank" title="{html.escape(page_info['path'])}">{html.escape(page_info.get('name', page_info['path']))}</a></div>
 """
 
     index_content += """    </div>
@@ -226,30 +367,181 @@ def generate_index_page(pages_info):
 </body>
 </html>
 """
+    return index_content
+
+def generate_index_page(pages_info):
+    """Generate an index page listing all attribute pages."""
+    index_filepath = os.path.join(PAGES_OUTPUT_DIR, INDEX_FILENAME)
+    write_if_changed(index_filepath, render_index_page(pages_info))
+    return index_filepath
+
+def write_attribute_pages(df, jobs=1, enums=None):
+    """Writes the attribute pages and their index for an already parsed DataFrame (and its EnumRegistry)."""
+    print("Generating individual attribute pages...")
+    pages_info = generate_all_attribute_pages(df, jobs=jobs, enums=enums)
+
+    print("Generating index page...")
+    index_path = generate_index_page(pages_info)
+
+    print(f"Successfully generated {len(pages_info)} attribute pages in '{PAGES_OUTPUT_DIR}' directory")
+    print(f"Index page created at: {index_path}")
+    return pages_info
+
+def viewer_section(path):
+    """Top-level section of a path, e.g. 'processInformation' for processDataSet/processInformation/...
+
+    Paths without a section (the root element and its attributes) use their first segment.
+    """
+    segments = str(path).split('/')
+    if len(segments) > 1 and not segments[1].startswith('@'):
+        return segments[1]
+    return segments[0]
+
+def build_viewer_store(df, language='both', enums=None):
+    """Builds the data of the single-page viewer.
+
+    Returns (index, shards). The index lists every row in document order as
+    [path, name, tree prefix, shard file] and names the shard of each
+    section. Each shard holds the field labels once and, per path, one entry
+    per row defining it, so paths that occur several times (or sanitize to
+    the same filename) keep every definition. An entry is
+    {'name', 'values'}, where a value is the text or [header text, items].
+    With `language` 'en' or 'de' the other language's fields are left out.
+    `enums` is the DataFrame's EnumRegistry; without it the rows are scanned once.
+    """
+    if enums is None:
+        enums = EnumRegistry.from_dataframe(df)
+    pages_info, _ = plan_attribute_pages(df, enums)
+    columns = list(df.columns)
+    field_columns = [(position, name) for position, name in enumerate(columns)
+                     if name not in ATTRIBUTE_SKIPPED_FIELDS and field_in_language(name, language)]
+    fields = [list(attribute_field_label(name)) for _, name in field_columns]
+
+    shard_files = {}
+    shards = {}
+    entries = []
+    rows = df.itertuples(index=False, name=None)
+    for position, (page_info, values) in enumerate(zip(pages_info, rows)):
+        section = viewer_section(page_info['path'])
+        shard_file = shard_files.get(section)
+        if shard_file is None:
+            shard_file = f"{sanitize_filename(section)}.json"
+            while shard_file in shards:
+                shard_file = f"{shard_file[:-len('.json')]}_.json"
+            shard_files[section] = shard_file
+            shards[shard_file] = {'version': VIEWER_DATA_VERSION, 'fields': fields, 'entries': {}}
+        enum_group = enums.by_start.get(position)
+        field_values = []
+        for column, name in field_columns:
+            text, items = attribute_field_value(name, values[column], enum_group)
+            field_values.append(text if items is None else [text, items])
+        entry = {'name': attribute_element_name(dict(zip(columns, values))), 'values': field_values}
+        shards[shard_file]['entries'].setdefault(page_info['path'], []).append(entry)
+        entries.append([page_info['path'], page_info['name'], page_info['tree_prefix'], shard_file])
+
+    index = {'version': VIEWER_DATA_VERSION, 'entries': entries}
+    return index, shards
+
+def render_attribute_viewer(data_url, downloads_url, language='both'):
+    """Renders the viewer shell; docs/js/attribute_viewer.js fills it from the store at `data_url`.
+
+    The CSV and AsciiDoc download buttons point into `downloads_url`.
+    Single-language shells start in their language and have no language toggles.
+    """
+    page_language = 'de' if language == 'de' else 'en'
+    lang_buttons = """
+        <div class="lang-buttons">
+            <button id="show-en-btn">Show English</button>
+            <button id="show-de-btn">Show German</button>
+            <button id="show-both-btn" class="active">Show Both</button>
+        </div>""" if language == 'both' else ''
+    body_class = 'show-both' if language == 'both' else f'show-{language}'
+    return f"""<!DOCTYPE html>
+<html lang="{page_language}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>EPD Attribute Pages</title>
+    <link rel="stylesheet" href="css/style.css">
+</head>
+<body class="attribute-page {body_class}" data-data-dir="{html.escape(downloads_url)}">
+    <a href="#" class="back-link" id="viewer-back-link">← All attributes</a>
     
-    index_filepath = os.path.join(PAGES_OUTPUT_DIR, 'index.html')
-    with open(index_filepath, 'w', encoding='utf-8') as f:
-        f.write(index_content)
+    <div class="controls">{lang_buttons}
+        <div class="download-buttons">
+            <button id="download-csv-btn">Download as CSV</button>
+            <button id="download-adoc-btn">Download as AsciiDoc</button>
+        </div>
+    </div>
     
-    return index_filepath
+    <div id="attribute-viewer" data-store="{html.escape(data_url)}"></div>
+    
+    <script src="js/attribute_viewer.js"></script>
+    <script src="js/attribute_script.js"></script>
+</body>
+</html>
+"""
+
+def write_attribute_viewer(df, viewer_file=VIEWER_FILE, data_dir=VIEWER_DATA_DIR, language='both', enums=None,
+                           downloads_dir=DATA_DIR):
+    """Writes the viewer shell and its sharded JSON store; stale shards are deleted.
+
+    The shell's download links are made relative to `viewer_file`, so they
+    follow it wherever it is written.
+    """
+    print("Generating the single-page attribute viewer...")
+    index, shards = build_viewer_store(df, language, enums)
+    os.makedirs(data_dir, exist_ok=True)
+    files = dict(shards)
+    files[VIEWER_INDEX_FILENAME] = index
+    written = 0
+    for filename, data in files.items():
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        written += write_if_changed(os.path.join(data_dir, filename), content)[1]
+    for filename in os.listdir(data_dir):
+        if filename.endswith('.json') and filename not in files:
+            os.remove(os.path.join(data_dir, filename))
+    write_if_changed(viewer_file, render_attribute_viewer(relative_url(data_dir, viewer_file),
+                                                          relative_url(downloads_dir, viewer_file), language))
+    print(f"Attribute viewer: {len(index['entries'])} rows in {len(shards)} shards ({written} files written) "
+          f"at '{viewer_file}'")
+    return index
+
+def write_attribute_viewers(df, languages=('both',), viewer_file=VIEWER_FILE, data_dir=VIEWER_DATA_DIR, enums=None):
+    """Writes one viewer per report language, named like the report variants (see language_variant_file).
+
+    The DataFrame is scanned for enumerations once for all of them, unless `enums` is given.
+    """
+    if enums is None:
+        enums = EnumRegistry.from_dataframe(df)
+    return [write_attribute_viewer(df, language_variant_file(viewer_file, language),
+                                   language_variant_file(data_dir, language), language, enums)
+            for language in normalize_report_languages(languages)]
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the individual attribute pages.")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1,
+                        help="number of worker processes for rendering pages (0 = one per CPU)")
+    parser.add_argument('--mode', choices=PAGES_MODES, default='pages',
+                        help="pages: one HTML file per attribute (default); viewer: a single attribute.html "
+                             "that loads the attributes from a JSON store sharded by section")
+    parser.add_argument('--language', action='append', choices=REPORT_LANGUAGES, dest='languages',
+                        help="viewer variant to write in viewer mode (repeatable; default: both); 'en' and 'de' "
+                             "leave out the other language's fields")
+    args = parser.parse_args()
+
     try:
         # Parse the AsciiDoc data
-        df = parse_asciidoc_table(ADOC_SOURCE_FILE)
+        df = load_spec_table(ADOC_SOURCE_FILE)
         
-        # Generate all attribute pages
-        print("Generating individual attribute pages...")
-        pages_info = generate_all_attribute_pages(df)
-        
-        # Generate index page
-        print("Generating index page...")
-        index_path = generate_index_page(pages_info)
-        
-        print(f"Successfully generated {len(pages_info)} attribute pages in '{PAGES_OUTPUT_DIR}' directory")
-        print(f"Index page created at: {index_path}")
-        print(f"Open '{os.path.join(PAGES_OUTPUT_DIR, 'index.html')}' to browse all pages")
+        if args.mode == 'viewer':
+            write_attribute_viewers(df, args.languages)
+            print(f"Serve docs/ over HTTP (e.g. python -m http.server -d docs) and open '{os.path.basename(VIEWER_FILE)}'")
+        else:
+            # Generate all attribute pages and the index page
+            write_attribute_pages(df, jobs=args.jobs)
+            print(f"Open '{os.path.join(PAGES_OUTPUT_DIR, 'index.html')}' to browse all pages")
         
     except (FileNotFoundError, ValueError, KeyError) as e:
         print(f"An error occurred: {e}")
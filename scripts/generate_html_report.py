@@ -1,7 +1,14 @@
 import pandas as pd
-import re
 import html
 import os
+import json
+import argparse
+from collections import namedtuple
+
+from spec_cache import load_spec_table
+from enum_registry import EnumRegistry, format_enum_value
+from search_index import build_search_index, write_search_index
+from cli_options import DEFAULT_REPORT_MODE, REPORT_MODES
 
 # --- Constants ---
 # Define base directories
@@ -14,311 +21,551 @@ os.makedirs(DOCS_DIR, exist_ok=True)
 
 ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
 HTML_OUTPUT_FILE = os.path.join(DOCS_DIR, 'epd_documentation_report.html')
+SEARCH_INDEX_FILE = os.path.join(DOCS_DIR, 'epd_documentation_search_index.json')
+REPORT_DATA_FILE = os.path.join(DOCS_DIR, 'epd_documentation_report_rows.jsonl')
+REPORT_DATA_VERSION = 3
+# 'both' is the bilingual report with the language toggles; 'en' and 'de' leave out the other
+# language's columns. Single-language variants are written next to it with a _en/_de suffix.
+REPORT_LANGUAGES = ('both', 'en', 'de')
+REPORT_LANGUAGE_LABELS = {'both': 'Both languages', 'en': 'English only', 'de': 'German only'}
 
-# --- Data Loading and Parsing ---
-def parse_asciidoc_table(filename):
-    """Parses the main data table from an AsciiDoc file."""
-    print(f"Reading data from {filename}...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Include ALL columns from Excel source (27 columns total)
+PRESENTATION_COLUMNS = [
+    'order',
+    'ID previous',
+    'ID new',
+    'Format version ID (when introduced)',
+    'Field Name (de)',
+    'Field Name (en)',
+    'Element/Attribute Name',
+    'Technically Required',
+    'Occ.',
+    'Datatype',
+    'Original ILCD Format Definition (en)',
+    'Definition (de)',
+    'InData Definition (en)',
+    'Further explanations (EN)',
+    'InData compliance CP-2020',
+    'Deviation to ILCD format definition',
+    'Extension of ILCD format',
+    'InData Compliance Construction Products CPEN2020',
+    'eDoc ID',
+    'Example of expected information in the field',
+    'EN15804+A2 mapping (chapter number)',
+    'EN15804+A2 required information',
+    'ECO Platform conformity',
+    'ISO 22057 mapping (GUID)',
+    'ISO 22057 required information',
+    'ISO 21930 mapping',
+    'ISO 21930 required information',
+]
 
-    table_match = re.search(r'\.EPD Data Structure\n.*?\|===(.*?)(\|===)', content, re.DOTALL)
-    if not table_match:
-        raise ValueError("Could not find the '.EPD Data Structure' table in the AsciiDoc file.")
+# Connectors drawn in front of the element names to show the hierarchy
+TREE_BRANCH = '├─ '       # Row with a later sibling
+TREE_LAST_BRANCH = '└─ '  # Last child of its parent
+TREE_PIPE = '│   '        # Ancestor level that continues below this row
+TREE_GAP = '    '         # Ancestor level that has ended
 
-    table_content = table_match.group(1).strip()
-    
-    header_match = re.search(r'(\| \[role="title"\]##.*?##\n)+', table_content)
-    if not header_match:
-        raise ValueError("Could not parse the table header.")
-        
-    header_str = header_match.group(0)
-    headers = [h.strip() for h in re.findall(r'##(.*?)##', header_str)]
-    
-    body_str = table_content[len(header_str):].strip()
-    cells = [c.strip() for c in re.findall(r'##(.*?)##', body_str, re.DOTALL)]
-    
-    num_columns = len(headers)
+# Column mapping for any renamed columns (if needed for display)
+COLUMN_MAPPING = {
+    # No renaming needed - using exact Excel column names
+}
+
+# --- HTML Generation ---
+def get_col_class(col_name):
+    """Returns the language class of a column ('lang-en', 'lang-de' or '')."""
+    if col_name == 'Original ILCD Format Definition (en)':
+        return ''  # Always visible
+    if '(de)' in col_name: return 'lang-de'
+    if '(en)' in col_name: return 'lang-en'
+    return ''
+
+def should_be_togglable(col_name):
+    """Whether a column gets a show/hide checkbox."""
+    # Essential columns that should never be hidden
+    essential_cols = ['Element/Attribute Name']
+    if col_name in essential_cols:
+        return False
+    # Always visible columns (like the English definition) should not be togglable
+    if col_name == 'Original ILCD Format Definition (en)':
+        return False
+    return True
+
+def column_as_strings(df, col_name, default=''):
+    """Returns a column as a list of strings, with missing values as ''."""
+    if col_name not in df.columns:
+        return [default] * len(df)
+    column = df[col_name]
+    return column.where(column.notna(), '').astype(str).tolist()
+
+def format_cell_html(col_name, value_str, is_definitions_identical=False):
+    """Format cell content for regular (non-enum) cells."""
+    if value_str is None:
+        return ''
     
-    if len(cells) % num_columns != 0:
-        padding = num_columns - (len(cells) % num_columns)
-        cells.extend([''] * padding)
-        
-    rows = [cells[i:i + num_columns] for i in range(0, len(cells), num_columns)]
+    # Escape HTML special characters
+    escaped_value = html.escape(str(value_str))
     
-    df = pd.DataFrame(rows, columns=headers)
-    df.replace('{nbsp}', '', regex=True, inplace=True)
+    # Apply gray styling to Original ILCD Format Definition when identical to Definition
+    if col_name == 'Original ILCD Format Definition (en)' and is_definitions_identical:
+        return f'<span class="gray-definition">{escaped_value}</span>'
     
-    if 'Indent' in df.columns:
-        df['Indent'] = pd.to_numeric(df['Indent'], errors='coerce').fillna(0).astype(int)
+    return escaped_value
+
+def build_presentation_columns(df_source, presentation_columns, column_map):
+    """Returns one list of display strings per presentation column, in order."""
+    return [column_as_strings(df_source, column_map.get(col_name, col_name)) for col_name in presentation_columns]
+
+def language_columns(presentation_columns, language='both'):
+    """The presentation columns of a language variant: the other language's columns are left out."""
+    if language not in REPORT_LANGUAGES:
+        raise ValueError(f"Unknown report language '{language}', expected one of {', '.join(REPORT_LANGUAGES)}.")
+    if language == 'both':
+        return list(presentation_columns)
+    return [col for col in presentation_columns if get_col_class(col) in ('', f'lang-{language}')]
+
+def language_variant_file(path, language):
+    """The file of a language variant: `path` itself for 'both', else with a _en/_de suffix before the extension."""
+    if language == 'both':
+        return path
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_{language}{extension}"
+
+def normalize_report_languages(languages):
+    """Validates the requested variants and returns them in REPORT_LANGUAGES order without duplicates."""
+    languages = set(languages or ('both',))
+    unknown = languages - set(REPORT_LANGUAGES)
+    if unknown:
+        raise ValueError(f"Unknown report language '{sorted(unknown)[0]}', expected one of {', '.join(REPORT_LANGUAGES)}.")
+    return [language for language in REPORT_LANGUAGES if language in languages]
+
+def build_row_metadata(df_source, enums=None):
+    """Precomputes the per-row values the renderer needs, one list per kind.
+
+    Returns (path tooltips, attribute paths, definitions-identical flags,
+    {enum group start row: list of enum values}).
+    """
+    num_rows = len(df_source)
+    if 'Path' in df_source.columns:
+        attribute_paths = df_source['Path'].astype(str).tolist()
+        path_tooltips = [html.escape(path) for path in attribute_paths]
     else:
-        df['Indent'] = 0
-        
-    return df
+        attribute_paths = [f'row_{index}' for index in df_source.index]
+        path_tooltips = [''] * num_rows
 
-# --- HTML Generation ---
+    # The flag must be read from the original df_source (for gray styling)
+    if '_definitions_identical' in df_source.columns:
+        definitions_identical = (df_source['_definitions_identical'].astype(str) == 'True').tolist()
+    else:
+        definitions_identical = [False] * num_rows
 
+    # Only enums spread over separate rows are folded into their field row;
+    # embedded enums are already part of the Datatype cell.
+    if enums is None:
+        enums = EnumRegistry.from_dataframe(df_source)
+    enum_groups = {}
+    for group in enums.groups:
+        if group.end > group.start:
+            enum_groups[group.start] = (group.end, [format_enum_value(code, label) for code, label in group.values])
 
-def generate_html_report(df_source, presentation_columns, column_map):
-    """Generates the final interactive HTML report from the DataFrame."""
-    # Create a new DataFrame for presentation, ensuring it's a copy.
-    # It will be built column-by-column in the correct, final order.
-    df_presentation = pd.DataFrame(index=df_source.index)
-
-    # Build the presentation dataframe column-by-column, strictly following the presentation_columns list.
-    for col_name in presentation_columns:
-        source_col_name = column_map.get(col_name, col_name)
-
-        # For the special 'Element/Attribute Name' column, add the indentation.
-        if col_name == 'Element/Attribute Name':
-            # Use better characters for the tree structure
-            indentation = df_source['Indent'].apply(lambda x: '&nbsp;&nbsp;&nbsp;&nbsp;' * x) if 'Indent' in df_source.columns else ''
-            values = df_source.get(source_col_name, '').astype(str)
-            df_presentation[col_name] = indentation + values
-
-        # For all other columns, just copy the data.
+    return path_tooltips, attribute_paths, definitions_identical, enum_groups
+
+def rendered_row_positions(num_rows, enum_groups):
+    """Returns the row positions that get a table row; enum value rows are folded into their field row."""
+    positions = []
+    skip_until = -1
+    for position in range(num_rows):
+        if position <= skip_until:
+            continue
+        positions.append(position)
+        if position in enum_groups:
+            skip_until = enum_groups[position][0]
+    return positions
+
+def build_tree_ranges(indents):
+    """Returns (parents, subtree ends) for rows in document order, given their indent levels.
+
+    parents[i] is the index of the nearest preceding row with a smaller indent
+    (-1 for top-level rows) and subtree_ends[i] the index of the last row of
+    i's subtree (i itself for leaves), so the descendants of row i are exactly
+    rows i + 1 .. subtree_ends[i]. Both are computed in one pass with a stack.
+    """
+    parents = [-1] * len(indents)
+    subtree_ends = list(range(len(indents)))
+    stack = []  # Indices of the open ancestors, innermost last
+    for index, indent in enumerate(indents):
+        while stack and indents[stack[-1]] >= indent:
+            stack.pop()
+        if stack:
+            parents[index] = stack[-1]
+        stack.append(index)
+    # Walking backwards, every row closes its parent's subtree no earlier than its own
+    for index in range(len(indents) - 1, -1, -1):
+        parent = parents[index]
+        if parent >= 0 and subtree_ends[index] > subtree_ends[parent]:
+            subtree_ends[parent] = subtree_ends[index]
+    return parents, subtree_ends
+
+def build_tree_prefixes(indents):
+    """Returns the tree connector string for each row, given the indent levels in document order.
+
+    One reverse pass: has_later_sibling[d] tells whether a row at depth d
+    follows further down without a shallower row in between, which decides
+    both the row's own connector and the pipes of its ancestors.
+    """
+    prefixes = [''] * len(indents)
+    has_later_sibling = []
+    for index in range(len(indents) - 1, -1, -1):
+        depth = int(indents[index])
+        if len(has_later_sibling) <= depth:
+            has_later_sibling.extend([False] * (depth + 1 - len(has_later_sibling)))
         else:
-            df_presentation[col_name] = df_source.get(source_col_name, '')
-
-    # --- Build HTML Manually for Interactivity ---
-    def get_col_class(col_name):
-        if col_name == 'Original ILCD Format Definition (en)':
-            return ''  # Always visible
-        if '(de)' in col_name: return 'lang-de'
-        if '(en)' in col_name: return 'lang-en'
-        return ''
+            # Deeper rows further down belong to a later sibling's subtree
+            del has_later_sibling[depth + 1:]
+        if depth > 0:
+            parts = [TREE_PIPE if has_later_sibling[level] else TREE_GAP for level in range(1, depth)]
+            parts.append(TREE_BRANCH if has_later_sibling[depth] else TREE_LAST_BRANCH)
+            prefixes[index] = ''.join(parts)
+        has_later_sibling[depth] = True
+    return prefixes
 
-    def detect_enum_groups(df):
-        """Detect groups of rows that represent enum values for the same field.
-        Returns a list of (start_idx, end_idx, enum_header) tuples.
-        """
-        enum_groups = []
-        i = 0
-        while i < len(df):
-            # Look ahead for enum value rows (start with single letters like "A - ", "B - ")
-            if i + 1 < len(df):
-                next_datatype = str(df.iloc[i + 1].get('Datatype', '')).strip()
-                if re.match(r'^[A-Z] - ', next_datatype):
-                    # Found start of an enum group, this row is the header
-                    start_idx = i
-                    enum_header_element = str(df.iloc[i].get('Element/Attribute Name', '')).strip()
-                    enum_header_datatype = str(df.iloc[i].get('Datatype', '')).strip()
-                    
-                    # Use element name as header if available, otherwise use datatype
-                    enum_header = enum_header_element if enum_header_element else enum_header_datatype
-                    
-                    # Look ahead for all enum value rows
-                    j = i + 1
-                    while j < len(df):
-                        curr_datatype = str(df.iloc[j].get('Datatype', '')).strip()
-                        # Check if this looks like an enum value (single letter followed by " - ")
-                        if re.match(r'^[A-Z] - ', curr_datatype):
-                            j += 1
-                        else:
-                            break
-                    
-                    if j > i + 1:  # Found at least one enum value
-                        enum_groups.append((start_idx, j - 1, enum_header))
-                        i = j
-                    else:
-                        i += 1
-                else:
-                    i += 1
-            else:
-                i += 1
-        return enum_groups
-
-    def format_cell_html(col_name, value_str, is_definitions_identical=False):
-        """Format cell content for regular (non-enum) cells."""
-        if value_str is None:
-            return ''
-        
-        # Escape HTML special characters
-        escaped_value = html.escape(str(value_str))
-        
-        # Apply gray styling to Original ILCD Format Definition when identical to Definition
-        if col_name == 'Original ILCD Format Definition (en)' and is_definitions_identical:
-            return f'<span class="gray-definition">{escaped_value}</span>'
-        
-        return escaped_value
+def add_tree_prefixes(df):
+    """Returns a copy of the DataFrame with a TreePrefix column derived from Indent."""
+    indents = df['Indent'].tolist() if 'Indent' in df.columns else [0] * len(df)
+    return df.assign(TreePrefix=build_tree_prefixes(indents))
+
+def tree_prefix_html(prefix):
+    return f'<span class="tree-prefix">{prefix}</span>' if prefix else ''
+
+def rendered_indents(df_source, positions):
+    """Indent levels of the rendered rows."""
+    if 'Indent' not in df_source.columns:
+        return [0] * len(positions)
+    indents = df_source['Indent'].tolist()
+    return [int(indents[position]) for position in positions]
+
+def build_rendered_tree(df_source, positions):
+    """Tree ranges over the rendered rows; indices are ordinals in `positions`."""
+    return build_tree_ranges(rendered_indents(df_source, positions))
+
+def tree_toggle_html(ordinal, subtree_end):
+    """Expand/collapse button for rows with children, an equally wide spacer for leaves."""
+    if subtree_end > ordinal:
+        return (f'<button class="tree-toggle" data-node="{ordinal}" aria-expanded="true" '
+                f'title="Collapse/expand the child elements">&#9662;</button>')
+    return '<span class="tree-toggle-spacer"></span>'
+
+# Everything the report renders, computed once and shared by the language variants.
+# `column_values` maps each presentation column to its display strings; the per-row
+# lists are indexed by row position, the tree lists by ordinal in `positions`.
+ReportModel = namedtuple('ReportModel', ['column_values', 'path_tooltips', 'attribute_paths', 'definitions_identical',
+                                         'enum_groups', 'positions', 'parents', 'subtree_ends', 'tree_prefixes'])
+
+def build_report_model(df_source, presentation_columns, column_map, enums=None):
+    """Builds the ReportModel of the DataFrame in one pass over its rows.
+
+    `enums` is the DataFrame's EnumRegistry; without it the rows are scanned for enumerations.
+    """
+    column_values = dict(zip(presentation_columns,
+                             build_presentation_columns(df_source, presentation_columns, column_map)))
+    path_tooltips, attribute_paths, definitions_identical, enum_groups = build_row_metadata(df_source, enums)
+    positions = rendered_row_positions(len(df_source), enum_groups)
+    parents, subtree_ends = build_rendered_tree(df_source, positions)
+    tree_prefixes = build_tree_prefixes(rendered_indents(df_source, positions))
+    return ReportModel(column_values, path_tooltips, attribute_paths, definitions_identical, enum_groups,
+                       positions, parents, subtree_ends, tree_prefixes)
+
+def build_report_search_index(df_source, model=None, enums=None):
+    """Builds the client-side search index for the rows the report renders."""
+    if model is None:
+        _, attribute_paths, _, enum_groups = build_row_metadata(df_source, enums)
+        positions = rendered_row_positions(len(df_source), enum_groups)
+    else:
+        attribute_paths, positions = model.attribute_paths, model.positions
+    names = column_as_strings(df_source, 'Element/Attribute Name')
+    paths = attribute_paths if 'Path' in df_source.columns else [''] * len(df_source)
+    return build_search_index(positions, [names[p] for p in positions], [paths[p] for p in positions])
+
+def build_report_columns(presentation_columns):
+    """Returns (name, class, escaped name, class for gray definitions) per presentation column."""
+    col_classes = [get_col_class(col) for col in presentation_columns]
+    col_attrs = [html.escape(col) for col in presentation_columns]
+    gray_col_classes = [cls + ' gray-definition' if col == 'Original ILCD Format Definition (en)' else cls
+                        for col, cls in zip(presentation_columns, col_classes)]
+    return list(zip(presentation_columns, col_classes, col_attrs, gray_col_classes))
 
+def report_table_attrs(search_index_url=None, attribute_viewer_url=None, language='both'):
+    """The data attributes of the report table that point docs/js/script.js to its companion files."""
+    table_attrs = ''
+    if search_index_url:
+        table_attrs += f' data-search-index="{html.escape(search_index_url)}"'
+    if attribute_viewer_url:
+        table_attrs += f' data-attribute-viewer="{html.escape(attribute_viewer_url)}"'
+    if language != 'both':
+        table_attrs += f' data-language="{language}"'
+    return table_attrs
+
+def render_language_controls(language='both', variant_urls=None):
+    """The language buttons: toggles in the bilingual report, the variant's own language otherwise,
+    followed by links to the other variants in `variant_urls` ({language: url})."""
+    if language == 'both':
+        buttons = [
+            '<button id="show-en-btn">Show English</button>',
+            '<button id="show-de-btn">Show German</button>',
+            '<button id="show-all-btn">Show Both</button>',
+        ]
+    else:
+        buttons = [f'<button class="active" disabled>{REPORT_LANGUAGE_LABELS[language]}</button>']
+    buttons += [f'<button data-href="{html.escape(url)}">{REPORT_LANGUAGE_LABELS[other]}</button>'
+                for other, url in (variant_urls or {}).items() if other != language]
+    return '<div class="lang-buttons">' + ''.join(f'\n            {button}' for button in buttons) + '\n        </div>'
+
+def render_report_header(write, columns, table_attrs='', language='both', variant_urls=None):
+    """Writes the document head, the controls and the table header."""
     # Create Checkboxes HTML with improved logic
-    def should_be_togglable(col_name):
-        # Essential columns that should never be hidden
-        essential_cols = ['Element/Attribute Name']
-        if col_name in essential_cols:
-            return False
-        # Always visible columns (like the English definition) should not be togglable
-        if col_name == 'Original ILCD Format Definition (en)':
-            return False
-        return True
-    
-    checkboxes_html = ""
-    for col in presentation_columns:
+    checkboxes_html = []
+    for col, col_class, col_attr, _ in columns:
         if should_be_togglable(col):
             col_id = f"toggle-{col.replace(' ', '-').replace('(', '').replace(')', '')}"
-            col_class = get_col_class(col)  # Reuse the language class logic
             checked_attr = "checked"  # Default to checked
-            checkboxes_html += f'<label for="{col_id}" class="{col_class}"><input type="checkbox" id="{col_id}" data-col="{html.escape(col)}" {checked_attr}>{html.escape(col)}</label>'
-
-    # Create Table Header HTML - Add "View Attribute" column first, then presentation_columns
-    header_html = "<thead><tr>"
-    header_html += '<th data-col="View Attribute">View Attribute</th>'  # New column
-    for col in presentation_columns:
-        col_class = get_col_class(col)
-        header_html += f'<th class="{col_class}" data-col="{html.escape(col)}">{html.escape(col)}</th>'
-    header_html += "</tr></thead>"
-
-    # Detect enum groups in the source data
-    enum_groups = detect_enum_groups(df_source)
-    
-    # Create Table Body HTML with enum grouping
-    body_html = "<tbody>"
-    skip_until = -1  # Track rows to skip because they're part of an enum group
-    
-    for index, row in df_presentation.iterrows():
-        if index <= skip_until:
-            continue  # Skip this row as it's part of an enum group
-            
-        path_tooltip = html.escape(str(df_source.loc[index, 'Path'])) if 'Path' in df_source.columns else ''
-        attribute_path = str(df_source.loc[index, 'Path']) if 'Path' in df_source.columns else f'row_{index}'
-        
-        # Check if definitions are identical for this row (for gray styling)
-        # The flag must be read from the original df_source using the current row's index.
-        is_definitions_identical = str(df_source.loc[index].get('_definitions_identical', 'False')) == 'True'
-        
-        # Check if this row starts an enum group
-        enum_group = next((g for g in enum_groups if g[0] == index), None)
-        
-        body_html += f'<tr data-tooltip="{path_tooltip}">'
-        
-        # Add "View Attribute" button column first
-        body_html += f'<td data-col="View Attribute">'
-        body_html += f'<button class="view-attr-btn" onclick="openAttributePage(\'{html.escape(attribute_path)}\')" title="View detailed information for this attribute">View Attribute</button>'
-        body_html += f'</td>'
-        
-        # Then add all the regular columns
-        for col in presentation_columns:
-            col_class = get_col_class(col)
-            cell_value = str(row[col]) if pd.notna(row[col]) else ''
-            
-            # Special handling for enum groups in Datatype column
-            if col == 'Datatype' and enum_group:
-                start_idx, end_idx, enum_header = enum_group
-                # Combine the enum header with all enum values as a list
-                enum_values = []
-                for enum_idx in range(start_idx + 1, end_idx + 1):
-                    enum_val = str(df_source.iloc[enum_idx].get('Datatype', '')).strip()
-                    if enum_val:
-                        enum_values.append(enum_val)
-                
-                if enum_values:
-                    list_html = ''.join(f'<li>{html.escape(val)}</li>' for val in enum_values)
-                    # Show the original datatype value as header, then the enum list
-                    header_text = html.escape(cell_value) if cell_value.strip() else "Enumeration:"
-                    formatted = f"{header_text}<ul>{list_html}</ul>"
-                else:
-                    formatted = html.escape(cell_value)
-                
-                body_html += f'<td class="{col_class}" data-col="{html.escape(col)}">{formatted}</td>'
-                skip_until = end_idx  # Skip the enum value rows
-            # Special handling for 'Element/Attribute Name' column to add tooltip
-            elif col == 'Element/Attribute Name':
-                body_html += f'<td class="{col_class}" data-col="{html.escape(col)}">'
-                body_html += f'<div class="tooltip-wrapper">'
-                body_html += cell_value  # This already includes indentation from above
-                body_html += f'<span class="tooltip-text">{path_tooltip}</span>'
-                body_html += f'</div>'
-                body_html += f'</td>'
-            else:
-                cell_class = get_col_class(col)
-                if col == 'Original ILCD Format Definition (en)' and is_definitions_identical:
-                    cell_class += ' gray-definition'
+            label_class = f'col-toggle-label {col_class}'.strip()
+            checkboxes_html.append(f'<label for="{col_id}" class="{label_class}"><input type="checkbox" class="col-toggle" id="{col_id}" data-col="{col_attr}" {checked_attr}>{col_attr}</label>')
 
-                formatted = format_cell_html(col, cell_value, is_definitions_identical)
-                body_html += f'<td class="{cell_class}" data-col="{html.escape(col)}">{formatted}</td>'
-        body_html += "</tr>"
-    body_html += "</tbody>"
-
-    html_table = f'<table id="report-table">{header_html}{body_html}</table>'
-
-    # --- Final HTML Document with CSS and JS ---
-    html_template = f"""<!DOCTYPE html>
-<html lang="en">
+    # The bilingual report starts in English
+    page_language = 'de' if language == 'de' else 'en'
+    write(f"""<!DOCTYPE html>
+<html lang="{page_language}">
 <head>
     <meta charset="UTF-8">
     <title>EPD Documentation Report</title>
     <link rel="stylesheet" href="css/style.css">
 </head>
-<body class="show-en">
+<body class="show-{page_language}">
     <h1>EPD Documentation Report</h1>
     <div class="controls">
         <input type="text" id="search-bar" placeholder="Search by Name, Path (e.g. 'proc/name'), or Regex (e.g. '^process')">
-        <div class="lang-buttons">
-            <button id="show-en-btn">Show English</button>
-            <button id="show-de-btn">Show German</button>
-            <button id="show-all-btn">Show Both</button>
-        </div>
+        {render_language_controls(language, variant_urls)}
         <div class="download-buttons">
             <button id="download-csv-btn">Download CSV</button>
             <button id="download-adoc-btn">Download AsciiDoc</button>
         </div>
         <div class="view-options">
             <button id="toggle-stripes-btn">Toggle Stripes</button>
+            <button id="expand-all-btn">Expand All</button>
+            <button id="collapse-all-btn">Collapse All</button>
         </div>
-        <div class="col-toggles">{checkboxes_html}</div>
+        <div class="col-toggles">{''.join(checkboxes_html)}</div>
     </div>
-    {html_table}
-    <script src="js/script.js"></script>
+    """)
+
+    # Table Header - "View Attribute" column first, then presentation_columns
+    write(f'<table id="report-table"{table_attrs}><thead><tr>')
+    write('<th data-col="View Attribute">View Attribute</th>')
+    write(''.join(f'<th class="{col_class}" data-col="{col_attr}">{col_attr}</th>'
+                  for _, col_class, col_attr, _ in columns))
+    write("</tr></thead>")
+
+def render_report_footer(write, scripts=('js/script.js',)):
+    """Closes the document, loading `scripts` in order."""
+    script_tags = ''.join(f'\n    <script src="{src}"></script>' for src in scripts)
+    write(f"""{script_tags}
 </body>
 </html>
-"""
-    return html_template
+""")
+
+def render_html_report(write, df_source, presentation_columns, column_map, search_index_url=None,
+                       attribute_viewer_url=None, language='both', variant_urls=None, model=None):
+    """Streams the interactive HTML report for the DataFrame to `write`.
+
+    `write` is called with consecutive HTML fragments, e.g. a file's write
+    method or a list's append, so the document is never concatenated in memory.
+    With `search_index_url`, the search box queries that prebuilt index
+    instead of scanning the table. With `attribute_viewer_url`, clicking a
+    name opens the single-page attribute viewer instead of the attribute pages.
+    `language` 'en' or 'de' renders only that language's columns, with links
+    to the other variants in `variant_urls`. A `model` built by
+    build_report_model for the same columns is reused instead of rebuilt.
+    """
+    if model is None:
+        model = build_report_model(df_source, presentation_columns, column_map)
+    path_tooltips, attribute_paths, definitions_identical = model.path_tooltips, model.attribute_paths, model.definitions_identical
+    enum_groups, positions, parents, subtree_ends, tree_prefixes = (model.enum_groups, model.positions, model.parents,
+                                                                    model.subtree_ends, model.tree_prefixes)
+    columns = build_report_columns(language_columns(presentation_columns, language))
+    column_values = [model.column_values[col] for col, _, _, _ in columns]
+
+    table_attrs = report_table_attrs(search_index_url, attribute_viewer_url, language)
+    render_report_header(write, columns, table_attrs, language, variant_urls)
+
+    # Table Body; enum value rows are folded into their field row
+    write("<tbody>")
+    for ordinal, position in enumerate(positions):
+        path_tooltip = path_tooltips[position]
+        is_definitions_identical = definitions_identical[position]
+        enum_group = enum_groups.get(position)
+
+        row_html = [
+            f'<tr data-row="{position}" data-parent="{parents[ordinal]}" data-end="{subtree_ends[ordinal]}" data-tooltip="{path_tooltip}">',
+            # "View Attribute" button column first
+            '<td data-col="View Attribute">'
+            f'<button class="view-attr-btn" data-path="{html.escape(attribute_paths[position])}" title="View detailed information for this attribute">View Attribute</button>'
+            '</td>',
+        ]
+
+        # Then add all the regular columns
+        for (col, col_class, col_attr, gray_col_class), values in zip(columns, column_values):
+            cell_value = values[position]
+            # Special handling for enum groups in Datatype column
+            if col == 'Datatype' and enum_group:
+                end_idx, enum_values = enum_group
+                if enum_values:
+                    list_html = ''.join(f'<li>{html.escape(val)}</li>' for val in enum_values)
+                    # Show the original datatype value as header, then the enum list
+                    header_text = html.escape(cell_value) if cell_value.strip() else "Enumeration:"
+                    formatted = f"{header_text}<ul>{list_html}</ul>"
+                else:
+                    formatted = html.escape(cell_value)
+                row_html.append(f'<td class="{col_class}" data-col="{col_attr}">{formatted}</td>')
+            # Special handling for 'Element/Attribute Name' column to add tooltip
+            elif col == 'Element/Attribute Name':
+                row_html.append(f'<td class="{col_class}" data-col="{col_attr}">{tree_prefix_html(tree_prefixes[ordinal])}'
+                                f'{tree_toggle_html(ordinal, subtree_ends[ordinal])}'
+                                f'<div class="tooltip-wrapper">{html.escape(cell_value)}<span class="tooltip-text">{path_tooltip}</span></div></td>')
+            else:
+                cell_class = gray_col_class if is_definitions_identical else col_class
+                formatted = format_cell_html(col, cell_value, is_definitions_identical)
+                row_html.append(f'<td class="{cell_class}" data-col="{col_attr}">{formatted}</td>')
+        row_html.append("</tr>")
+        write(''.join(row_html))
+    write("</tbody></table>")
+
+    render_report_footer(write)
+
+def iter_report_rows(df_source, presentation_columns, column_map, model=None):
+    """Yields the data payload of the virtual report: a header, then one list per rendered row.
+
+    The header is {"version", "columns": [{"name", "class", "grayClass", "togglable"}]}.
+    Rows are [row id, path, tree prefix, definitions identical (0/1), [cell, ...], [enum value, ...] or null,
+    parent, subtree end]; cells are raw text, the page escapes and formats them like the static table.
+    parent and subtree end are indices into the payload rows (see build_tree_ranges).
+    `model` is a ReportModel covering at least `presentation_columns`.
+    """
+    yield {
+        'version': REPORT_DATA_VERSION,
+        'columns': [{'name': col, 'class': col_class, 'grayClass': gray_col_class, 'togglable': should_be_togglable(col)}
+                    for col, col_class, _, gray_col_class in build_report_columns(presentation_columns)],
+    }
+    if model is None:
+        model = build_report_model(df_source, presentation_columns, column_map)
+    column_values = [model.column_values[col] for col in presentation_columns]
+    definitions_identical, enum_groups = model.definitions_identical, model.enum_groups
+    paths = model.attribute_paths if 'Path' in df_source.columns else [''] * len(df_source)
+
+    positions, parents, subtree_ends, tree_prefixes = model.positions, model.parents, model.subtree_ends, model.tree_prefixes
+    for ordinal, position in enumerate(positions):
+        enum_group = enum_groups.get(position)
+        yield [
+            position,
+            paths[position],
+            tree_prefixes[ordinal],
+            int(definitions_identical[position]),
+            [values[position] for values in column_values],
+            enum_group[1] if enum_group and enum_group[1] else None,
+            parents[ordinal],
+            subtree_ends[ordinal],
+        ]
+
+def write_report_rows(df_source, presentation_columns, column_map, output_file, model=None):
+    """Streams the virtual report payload to `output_file` as JSON Lines."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for record in iter_report_rows(df_source, presentation_columns, column_map, model):
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+    return output_file
+
+def render_virtual_report(write, presentation_columns, data_url, search_index_url=None, attribute_viewer_url=None,
+                          language='both', variant_urls=None):
+    """Streams the page shell of the virtual report to `write`.
+
+    The table body is empty; docs/js/virtual_report.js loads the rows from
+    `data_url` and only renders the ones in the scrolled viewport. The payload
+    must hold the columns of `language` (see language_columns).
+    """
+    columns = build_report_columns(language_columns(presentation_columns, language))
+    table_attrs = f' class="virtual-table" data-rows="{html.escape(data_url)}"'
+    table_attrs += report_table_attrs(search_index_url, attribute_viewer_url, language)
+    render_report_header(write, columns, table_attrs, language, variant_urls)
+    write('<tbody></tbody></table>')
+    render_report_footer(write, ('js/virtual_report.js', 'js/script.js'))
+
+def generate_html_report(df_source, presentation_columns, column_map):
+    """Generates the final interactive HTML report from the DataFrame."""
+    parts = []
+    render_html_report(parts.append, df_source, presentation_columns, column_map)
+    return ''.join(parts)
+
+def relative_url(target_file, from_file):
+    """URL of `target_file` relative to the page written to `from_file`."""
+    return os.path.relpath(target_file, os.path.dirname(os.path.abspath(from_file))).replace(os.sep, '/')
+
+def write_html_report(df, output_file=HTML_OUTPUT_FILE, search_index_file=SEARCH_INDEX_FILE,
+                      mode='table', data_file=REPORT_DATA_FILE, attribute_viewer_file=None, languages=('both',),
+                      enums=None):
+    """Renders the report for an already parsed DataFrame and streams it to `output_file`.
+
+    The search index (and in 'virtual' mode the row data) are referenced
+    relative to the report, so the files have to stay in the same directory tree.
+    Names link to `attribute_viewer_file` when given, else to the attribute pages.
+    Each of `languages` (see REPORT_LANGUAGES) gets its own report, row data
+    and attribute viewer file (see language_variant_file), all rendered from
+    one ReportModel; the variants link to each other and share the search index.
+    `enums` is the DataFrame's EnumRegistry, if it was already built.
+    Returns the written report files.
+    """
+    if mode not in REPORT_MODES:
+        raise ValueError(f"Unknown report mode '{mode}', expected one of {', '.join(REPORT_MODES)}.")
+    languages = normalize_report_languages(languages)
+    model = build_report_model(df, PRESENTATION_COLUMNS, COLUMN_MAPPING, enums)
+    report_files = {language: language_variant_file(output_file, language) for language in languages}
+    written = []
+    for language, report_file in report_files.items():
+        search_index_url = relative_url(search_index_file, report_file)
+        attribute_viewer_url = None
+        if attribute_viewer_file:
+            attribute_viewer_url = relative_url(language_variant_file(attribute_viewer_file, language), report_file)
+        variant_urls = {other: relative_url(other_file, report_file)
+                        for other, other_file in report_files.items()} if len(report_files) > 1 else None
+        with open(report_file, 'w', encoding='utf-8') as f:
+            if mode == 'virtual':
+                variant_data_file = language_variant_file(data_file, language)
+                render_virtual_report(f.write, PRESENTATION_COLUMNS, relative_url(variant_data_file, report_file),
+                                      search_index_url, attribute_viewer_url, language, variant_urls)
+            else:
+                render_html_report(f.write, df, PRESENTATION_COLUMNS, COLUMN_MAPPING, search_index_url,
+                                   attribute_viewer_url, language, variant_urls, model)
+        if mode == 'virtual':
+            write_report_rows(df, language_columns(PRESENTATION_COLUMNS, language), COLUMN_MAPPING, variant_data_file,
+                              model)
+        print(f"Successfully generated interactive HTML report: {report_file}")
+        written.append(report_file)
+    write_search_index(build_report_search_index(df, model), search_index_file)
+    return written
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    # Include ALL columns from Excel source (27 columns total)
-    PRESENTATION_COLUMNS = [
-        'order',
-        'ID previous',
-        'ID new',
-        'Format version ID (when introduced)',
-        'Field Name (de)',
-        'Field Name (en)',
-        'Element/Attribute Name',
-        'Technically Required',
-        'Occ.',
-        'Datatype',
-        'Original ILCD Format Definition (en)',
-        'Definition (de)',
-        'InData Definition (en)',
-        'Further explanations (EN)',
-        'InData compliance CP-2020',
-        'Deviation to ILCD format definition',
-        'Extension of ILCD format',
-        'InData Compliance Construction Products CPEN2020',
-        'eDoc ID',
-        'Example of expected information in the field',
-        'EN15804+A2 mapping (chapter number)',
-        'EN15804+A2 required information',
-        'ECO Platform conformity',
-        'ISO 22057 mapping (GUID)',
-        'ISO 22057 required information',
-        'ISO 21930 mapping',
-        'ISO 21930 required information',
-    ]
-
-    # Column mapping for any renamed columns (if needed for display)
-    COLUMN_MAPPING = {
-        # No renaming needed - using exact Excel column names
-    }
+    parser = argparse.ArgumentParser(description="Generate the interactive HTML report from the AsciiDoc source.")
+    parser.add_argument('--mode', choices=REPORT_MODES, default=DEFAULT_REPORT_MODE,
+                        help="virtual: load the rows from a JSON Lines file and render only the visible window, "
+                             "collapsed subtrees once they are expanded (default; needs to be served over HTTP); "
+                             "table: inline every row, collapsed subtrees included")
+    parser.add_argument('--language', action='append', choices=REPORT_LANGUAGES, dest='languages',
+                        help="report variant to write (repeatable; default: both). 'en' and 'de' write "
+                             "single-language reports without the other language's columns next to the bilingual one")
+    args = parser.parse_args()
 
     try:
-        df = parse_asciidoc_table(ADOC_SOURCE_FILE)
-        html_content = generate_html_report(df, PRESENTATION_COLUMNS, COLUMN_MAPPING)
-        with open(HTML_OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"Successfully generated interactive HTML report: {HTML_OUTPUT_FILE}")
+        df = load_spec_table(ADOC_SOURCE_FILE)
+        write_html_report(df, mode=args.mode, languages=args.languages)
 
     except (FileNotFoundError, ValueError, KeyError) as e:
         print(f"An error occurred: {e}")
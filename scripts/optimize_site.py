@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Optimized, deployable copy of docs/.
+
+docs/ keeps plain file names so the generators and the committed site stay
+simple. This step copies it to output/site/ and on the way
+
+- minifies the HTML, CSS (with rcssmin), JavaScript (with rjsmin) and JSON
+  files,
+- renames every asset an HTML page references (stylesheets, scripts, the
+  search index, the virtual report's rows) to a name carrying a hash of its
+  content, e.g. css/style.3f2a1b9c0d.css, and rewrites the references, so
+  the assets can be served with a long-lived Cache-Control header,
+- writes gzip and brotli sidecars next to each text file for servers that
+  serve precompressed files (nginx gzip_static/brotli_static, most CDNs),
+- writes asset-manifest.json mapping the logical asset names to the hashed ones.
+
+HTML pages keep their names, since they are linked and bookmarked. Files
+that are only fetched by name from JavaScript (the attribute viewer's
+shards) are minified but not renamed. Unchanged files are not rewritten and
+files that are no longer produced are deleted.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+from urllib.parse import urlsplit
+
+import rcssmin
+import rjsmin
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+SITE_DIR = os.path.join(OUTPUT_DIR, 'site')
+ASSET_MANIFEST_FILENAME = 'asset-manifest.json'
+ASSET_MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+ENCODINGS = {'gzip': '.gz', 'br': '.br'}
+DEFAULT_ENCODINGS = ('gzip', 'br')
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.js', '.json', '.jsonl', '.svg', '.txt', '.csv')
+
+# --- Minifiers ---
+
+def minify_css(text):
+    """Minified CSS (rcssmin): comments and insignificant whitespace removed, strings kept."""
+    return rcssmin.cssmin(text)
+
+def minify_js(text):
+    """Minified JavaScript (rjsmin): comments and insignificant whitespace removed.
+
+    rjsmin tokenizes string, template and regex literals, so they are copied
+    untouched, and keeps the line breaks automatic semicolon insertion needs.
+    """
+    return rjsmin.jsmin(text)
+
+_HTML_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+def _minify_html_markup(markup):
+    markup = _HTML_COMMENT.sub('', markup)
+    # Line breaks stay, so whitespace between inline elements still renders as a space
+    return re.sub(r'[ \t]*\n\s*', '\n', markup)
+
+def minify_html(text):
+    """Removes comments, indentation and blank lines; inline scripts and styles are minified,
+    <pre> and <textarea> content is kept as it is."""
+    parts = []
+    position = 0
+    for match in _HTML_RAW_BLOCK.finditer(text):
+        parts.append(_minify_html_markup(text[position:match.start()]))
+        opening, tag, content, closing = match.groups()
+        tag = tag.lower()
+        if tag == 'script' and content.strip() and 'src=' not in opening:
+            content = minify_js(content)
+        elif tag == 'style':
+            content = minify_css(content)
+        parts.append(opening + content + closing)
+        position = match.end()
+    parts.append(_minify_html_markup(text[position:]))
+    return ''.join(parts).strip() + '\n'
+
+def minify_json(text):
+    """Compact JSON; JSON Lines files are minified line by line."""
+    try:
+        return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+    except ValueError:
+        lines = [json.dumps(json.loads(line), ensure_ascii=False, separators=(',', ':'))
+                 for line in text.splitlines() if line.strip()]
+        return '\n'.join(lines) + '\n'
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+    '.json': minify_json,
+    '.jsonl': minify_json,
+}
+
+# --- Hashed names and references ---
+
+# URL-valued attributes: src, href and the data-* attributes the report and the viewer read
+_HTML_URL_ATTRIBUTE = re.compile(r'(\s(?:src|href|data-[\w-]+)=")([^"]*)(")')
+
+def hashed_name(relpath, content):
+    """`relpath` with the first HASH_LENGTH hex digits of the content's SHA-256 before the suffix."""
+    stem, suffix = posixpath.splitext(relpath)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{suffix}"
+
+def resolve_reference(page_relpath, url):
+    """Site-relative path a relative URL on the page `page_relpath` points to, or None for
+    absolute URLs, other schemes and same-page anchors."""
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path or parts.path.startswith('/'):
+        return None
+    target = posixpath.normpath(posixpath.join(posixpath.dirname(page_relpath), parts.path))
+    return None if target.startswith('..') else target
+
+def html_references(page_relpath, text):
+    """Site-relative paths of everything the page references."""
+    references = set()
+    for match in _HTML_URL_ATTRIBUTE.finditer(text):
+        target = resolve_reference(page_relpath, match.group(2))
+        if target is not None:
+            references.add(target)
+    return references
+
+def rewrite_references(page_relpath, text, renamed):
+    """Points the page's references to renamed files (`renamed`: {old path: new path}) at the new names."""
+    def replace(match):
+        url = match.group(2)
+        target = resolve_reference(page_relpath, url)
+        if target not in renamed:
+            return match.group(0)
+        parts = urlsplit(url)
+        new_path = posixpath.join(posixpath.dirname(parts.path), posixpath.basename(renamed[target]))
+        new_url = new_path + (f'?{parts.query}' if parts.query else '') + (f'#{parts.fragment}' if parts.fragment else '')
+        return match.group(1) + new_url + match.group(3)
+    return _HTML_URL_ATTRIBUTE.sub(replace, text)
+
+# --- Compression ---
+
+def compress(content, encoding):
+    """The content compressed with 'gzip' or 'br'; gzip output is reproducible (no timestamp)."""
+    if encoding == 'gzip':
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        try:
+            import brotli
+        except ImportError:
+            raise ValueError("Brotli sidecars need the 'brotli' package (pip install brotli).")
+        return brotli.compress(content, quality=11)
+    raise ValueError(f"Unknown encoding '{encoding}', expected one of {', '.join(ENCODINGS)}.")
+
+# --- Site ---
+
+def read_site(docs_dir):
+    """{site-relative path: bytes} of every file below `docs_dir`, without dotfiles (build manifests)."""
+    files = {}
+    for root, dirs, filenames in os.walk(docs_dir):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(root, filename)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, docs_dir).replace(os.sep, '/')] = f.read()
+    return files
+
+def build_site(files, encodings=('gzip',)):
+    """The optimized site for the source `files` ({path: bytes}).
+
+    Returns (output {path: bytes}, assets {logical path: hashed path}).
+    """
+    minified = {}
+    for relpath, content in files.items():
+        minifier = MINIFIERS.get(posixpath.splitext(relpath)[1].lower())
+        minified[relpath] = minifier(content.decode('utf-8')).encode('utf-8') if minifier else content
+
+    pages = [relpath for relpath in minified if relpath.endswith('.html')]
+    referenced = set()
+    for relpath in pages:
+        referenced |= html_references(relpath, minified[relpath].decode('utf-8'))
+    assets = {relpath: hashed_name(relpath, minified[relpath])
+              for relpath in sorted(referenced) if relpath in minified and not relpath.endswith('.html')}
+
+    output = {}
+    for relpath, content in minified.items():
+        if relpath in pages:
+            content = rewrite_references(relpath, content.decode('utf-8'), assets).encode('utf-8')
+        output[assets.get(relpath, relpath)] = content
+    manifest = {'version': ASSET_MANIFEST_VERSION, 'assets': assets}
+    output[ASSET_MANIFEST_FILENAME] = (json.dumps(manifest, indent=1) + '\n').encode('utf-8')
+
+    for relpath, content in list(output.items()):
+        if not relpath.endswith(COMPRESSIBLE_SUFFIXES):
+            continue
+        for encoding in encodings:
+            compressed = compress(content, encoding)
+            if len(compressed) < len(content):
+                output[relpath + ENCODINGS[encoding]] = compressed
+    return output, assets
+
+def write_bytes_if_changed(path, content):
+    """Writes `content` unless the file already holds it; returns whether it was written."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
+
+def prune_site(site_dir, keep):
+    """Deletes files below `site_dir` that are not in `keep` (site-relative paths), then empty directories."""
+    removed = 0
+    for root, dirs, filenames in os.walk(site_dir, topdown=False):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if os.path.relpath(path, site_dir).replace(os.sep, '/') not in keep:
+                os.remove(path)
+                removed += 1
+        if root != site_dir and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+def optimize_site(docs_dir=DOCS_DIR, site_dir=SITE_DIR, encodings=DEFAULT_ENCODINGS):
+    """Writes the optimized copy of `docs_dir` to `site_dir`; returns the asset manifest's mapping."""
+    docs_dir, site_dir = os.path.abspath(docs_dir), os.path.abspath(site_dir)
+    if site_dir == docs_dir or site_dir.startswith(docs_dir + os.sep) or docs_dir.startswith(site_dir + os.sep):
+        raise ValueError(f"The optimized site '{site_dir}' must not overlap the source '{docs_dir}'.")
+    if not os.path.isdir(docs_dir):
+        raise FileNotFoundError(f"Site source '{docs_dir}' does not exist.")
+
+    files = read_site(docs_dir)
+    output, assets = build_site(files, encodings)
+    os.makedirs(site_dir, exist_ok=True)
+    written = sum(write_bytes_if_changed(os.path.join(site_dir, *relpath.split('/')), content)
+                  for relpath, content in output.items())
+    removed = prune_site(site_dir, set(output))
+
+    source_bytes = sum(len(content) for content in files.values())
+    served = {relpath: content for relpath, content in output.items() if not relpath.endswith(tuple(ENCODINGS.values()))}
+    minified_bytes = sum(len(content) for content in served.values())
+    print(f"Optimized site: {len(served)} files, {len(assets)} hashed assets ({written} files written, "
+          f"{removed} removed) in '{site_dir}'")
+    print(f"  source {source_bytes / 1024:.1f} KiB, minified {minified_bytes / 1024:.1f} KiB")
+    for encoding in encodings:
+        encoded = sum(len(output.get(relpath + ENCODINGS[encoding], content)) for relpath, content in served.items())
+        print(f"  {encoding} {encoded / 1024:.1f} KiB")
+    return assets
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a minified, content-hashed and precompressed copy of docs/.")
+    parser.add_argument('--source', default=DOCS_DIR, help="site to optimize (default: docs/)")
+    parser.add_argument('--output', '-o', default=SITE_DIR, help="output directory (default: output/site/)")
+    parser.add_argument('--encoding', action='append', choices=sorted(ENCODINGS), dest='encodings',
+                        help="precompressed sidecars to write (repeatable; default: gzip and br)")
+    args = parser.parse_args()
+
+    try:
+        optimize_site(args.source, args.output, args.encodings or DEFAULT_ENCODINGS)
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
+        sys.exit(1)
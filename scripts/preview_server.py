@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Local preview server for the report and the attribute pages.
+
+The spec is loaded once and kept in memory. The report, its search index, the
+attribute page index and every attribute page are rendered when they are
+requested, with the same functions the generators use, and kept in an LRU
+cache of rendered responses. Nothing is written to docs/; everything else
+(css, js, the landing page) is served from docs/ as it is.
+
+Every response carries an ETag and `Cache-Control: no-cache`, so the
+browser revalidates and gets a 304 while the content is unchanged. A
+background thread polls the AsciiDoc source; when it changes the spec is
+reloaded, the cache emptied and a `reload` event sent to the pages over the
+Server-Sent Events stream at /__events, which a small script injected into
+every HTML page listens to.
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from enum_registry import EnumRegistry
+from spec_cache import load_spec_table
+from generate_html_report import (COLUMN_MAPPING, HTML_OUTPUT_FILE, PRESENTATION_COLUMNS, SEARCH_INDEX_FILE,
+                                  build_report_model, build_report_search_index, render_html_report)
+from generate_attribute_pages import (INDEX_FILENAME, PAGES_OUTPUT_DIR, generate_attribute_page, plan_attribute_pages,
+                                      render_index_page)
+from watch import FileState
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+DOCS_DIR = os.path.join(BASE_DIR, 'docs')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_POLL_INTERVAL = 0.5
+EVENTS_PATH = '/__events'
+KEEPALIVE_SECONDS = 15
+
+# URL paths of the rendered documents, laid out like docs/ so relative links keep working
+REPORT_PATH = '/' + os.path.relpath(HTML_OUTPUT_FILE, DOCS_DIR).replace(os.sep, '/')
+SEARCH_INDEX_PATH = '/' + os.path.relpath(SEARCH_INDEX_FILE, DOCS_DIR).replace(os.sep, '/')
+PAGES_PATH = '/' + os.path.relpath(PAGES_OUTPUT_DIR, DOCS_DIR).replace(os.sep, '/') + '/'
+
+LIVE_RELOAD_SCRIPT = f"""<script>
+new EventSource('{EVENTS_PATH}').addEventListener('reload', function() {{ window.location.reload(); }});
+</script>
+"""
+
+class Response:
+    """A rendered body with its content type and ETag."""
+    __slots__ = ('body', 'content_type', 'etag')
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def inject_live_reload(page):
+    """Adds the live reload listener before </body>."""
+    position = page.rfind('</body>')
+    if position == -1:
+        return page + LIVE_RELOAD_SCRIPT
+    return page[:position] + LIVE_RELOAD_SCRIPT + page[position:]
+
+class PreviewSite:
+    """The in-memory site: the loaded spec and an LRU cache of rendered responses."""
+
+    def __init__(self, source_file=ADOC_SOURCE_FILE, docs_dir=DOCS_DIR, cache_size=DEFAULT_CACHE_SIZE):
+        self.source_file = source_file
+        self.docs_dir = docs_dir
+        self.cache_size = cache_size
+        self.generation = 0
+        self.changed = threading.Condition()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.reload()
+
+    def reload(self):
+        """Loads the spec again, drops every rendered response and notifies the listeners."""
+        df = load_spec_table(self.source_file)
+        enums = EnumRegistry.from_dataframe(df)
+        pages_info, page_rows = plan_attribute_pages(df, enums)
+        with self._lock:
+            self.df = df
+            self.enums = enums
+            self.columns = list(df.columns)
+            self.pages_info = pages_info
+            self.page_rows = page_rows
+            self._cache.clear()
+            self.generation += 1
+        with self.changed:
+            self.changed.notify_all()
+
+    def get(self, url_path):
+        """The Response for `url_path`, or None if there is no such document.
+
+        Rendered documents are cached; files from docs/ are read on every
+        request, so edits to the scripts and styles show up without a reload.
+        """
+        with self._lock:
+            response = self._cache.get(url_path)
+            if response is not None:
+                self._cache.move_to_end(url_path)
+                return response
+            generation = self.generation
+        response = self.render(url_path)
+        if response is None:
+            # Pages on disk may belong to rows that no longer exist
+            return None if url_path.startswith(PAGES_PATH) else self._static(url_path)
+        with self._lock:
+            # Do not cache a page rendered from a spec that was replaced meanwhile
+            if generation == self.generation:
+                self._cache[url_path] = response
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return response
+
+    def render(self, url_path):
+        """Renders the report, its search index or an attribute page; None for other paths."""
+        with self._lock:
+            df, enums, columns, pages_info, page_rows = (self.df, self.enums, self.columns, self.pages_info,
+                                                         self.page_rows)
+        if url_path == REPORT_PATH:
+            parts = []
+            model = build_report_model(df, PRESENTATION_COLUMNS, COLUMN_MAPPING, enums)
+            render_html_report(parts.append, df, PRESENTATION_COLUMNS, COLUMN_MAPPING, SEARCH_INDEX_PATH.lstrip('/'),
+                               model=model)
+            return self._html(''.join(parts))
+        if url_path == SEARCH_INDEX_PATH:
+            index = build_report_search_index(df, enums=enums)
+            body = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            return Response(body, 'application/json')
+        if url_path.startswith(PAGES_PATH):
+            filename = url_path[len(PAGES_PATH):]
+            if filename in ('', INDEX_FILENAME):
+                return self._html(render_index_page(pages_info))
+            row = page_rows.get(filename)
+            if row is not None:
+                index, _, values, enum_group = row
+                return self._html(generate_attribute_page(dict(zip(columns, values)), index, enum_group))
+        return None
+
+    def _html(self, page):
+        return Response(inject_live_reload(page).encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _static(self, url_path):
+        """A file below docs/; directories resolve to their index.html."""
+        docs_dir = os.path.realpath(self.docs_dir)
+        file_path = os.path.realpath(os.path.join(docs_dir, url_path.lstrip('/')))
+        if file_path != docs_dir and not file_path.startswith(docs_dir + os.sep):
+            return None
+        if os.path.isdir(file_path):
+            file_path = os.path.join(file_path, 'index.html')
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if content_type == 'text/html':
+            return self._html(body.decode('utf-8'))
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        return Response(body, content_type)
+
+    def wait_for_change(self, generation, timeout):
+        """Blocks until the generation moves past `generation` or `timeout` passes; returns the current one."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+def watch_source(site, interval=DEFAULT_POLL_INTERVAL, stop_event=None):
+    """Reloads `site` whenever its AsciiDoc source changes; runs until `stop_event` is set."""
+    if stop_event is None:
+        stop_event = threading.Event()
+    state = FileState([site.source_file])
+    while not stop_event.wait(interval):
+        if state.poll():
+            try:
+                site.reload()
+                print(f"Reloaded {site.source_file} (generation {site.generation})")
+            except (FileNotFoundError, ValueError, KeyError) as e:
+                print(f"An error occurred while reloading: {e}")
+
+class PreviewRequestHandler(BaseHTTPRequestHandler):
+    """Serves a PreviewSite (set as the `site` attribute of the server)."""
+
+    def do_GET(self):
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path == EVENTS_PATH:
+            self._stream_events()
+            return
+        if url_path == '/':
+            url_path = '/index.html'
+        response = self.server.site.get(url_path)
+        if response is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        if response.etag in self._requested_etags():
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', response.etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', response.content_type)
+        self.send_header('Content-Length', str(len(response.body)))
+        self.send_header('ETag', response.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def _requested_etags(self):
+        header = self.headers.get('If-None-Match', '')
+        return {tag.strip().removeprefix('W/') for tag in header.split(',') if tag.strip()}
+
+    def _stream_events(self):
+        """Server-Sent Events: a `reload` event each time the site is reloaded."""
+        site = self.server.site
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        generation = site.generation
+        try:
+            while True:
+                current = site.wait_for_change(generation, KEEPALIVE_SECONDS)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(f'event: reload\ndata: {generation}\n\n'.encode('utf-8'))
+                else:
+                    self.wfile.write(b': keepalive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        if not self.path.startswith(EVENTS_PATH):
+            super().log_message(format, *args)
+
+def make_server(site, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """A threading HTTP server for `site`; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), PreviewRequestHandler)
+    server.daemon_threads = True
+    server.site = site
+    return server
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the report and attribute pages from memory with live reload.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="rendered pages kept in memory")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between checks of the AsciiDoc source")
+    args = parser.parse_args()
+
+    try:
+        site = PreviewSite(cache_size=args.cache_size)
+        server = make_server(site, args.host, args.port)
+        threading.Thread(target=watch_source, args=(site, args.interval), daemon=True).start()
+        print(f"Serving the preview at http://{args.host}:{server.server_address[1]}{REPORT_PATH} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped the preview server.")
+        finally:
+            server.server_close()
+    except (FileNotFoundError, ValueError, KeyError, OSError) as e:
+        print(f"An error occurred: {e}")
@@ -9,52 +9,15 @@ import pandas as pd
 import re
 import os
 
+from adoc_table import escape_trailing_backslashes
+from spec_cache import load_spec_table
+
 # Define base directories
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
 ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
 
-def parse_asciidoc_table(filename):
-    """Parses the main data table from an AsciiDoc file."""
-    print(f"Reading data from {filename}...")
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    table_match = re.search(r'\.EPD Data Structure\n.*?\|===(.*?)(\|===)', content, re.DOTALL)
-    if not table_match:
-        raise ValueError("Could not find the '.EPD Data Structure' table in the AsciiDoc file.")
-
-    table_content = table_match.group(1).strip()
-    
-    header_match = re.search(r'(\| \[role="title"\]##.*?##\n)+', table_content)
-    if not header_match:
-        raise ValueError("Could not parse the table header.")
-        
-    header_str = header_match.group(0)
-    headers = [h.strip() for h in re.findall(r'##(.*?)##', header_str)]
-    
-    body_str = table_content[len(header_str):].strip()
-    cells = [c.strip() for c in re.findall(r'##(.*?)##', body_str, re.DOTALL)]
-    
-    num_columns = len(headers)
-    
-    if len(cells) % num_columns != 0:
-        padding = num_columns - (len(cells) % num_columns)
-        cells.extend([''] * padding)
-        
-    rows = [cells[i:i + num_columns] for i in range(0, len(cells), num_columns)]
-    
-    df = pd.DataFrame(rows, columns=headers)
-    df.replace('{nbsp}', '', regex=True, inplace=True)
-    
-    if 'Indent' in df.columns:
-        df['Indent'] = pd.to_numeric(df['Indent'], errors='coerce').fillna(0).astype(int)
-    else:
-        df['Indent'] = 0
-        
-    return df
-
 def process_definitions(df, column_map):
     """Process definitions according to the specified rules."""
     
@@ -126,7 +89,7 @@ def write_asciidoc_table(df, filename):
         for col in df.columns:
             cell_value = str(row[col]) if not pd.isna(row[col]) else ''
             # Escape any existing ## in the content
-            cell_value = cell_value.replace('##', '\\##')
+            cell_value = escape_trailing_backslashes(cell_value.replace('##', '\\##'))
             table_content += f"| ##{cell_value}##\n"
     
     # Combine everything
@@ -145,7 +108,7 @@ def main():
 
     try:
         # Parse the current AsciiDoc data
-        df = parse_asciidoc_table(ADOC_SOURCE_FILE)
+        df = load_spec_table(ADOC_SOURCE_FILE)
         
         print(f"Loaded {len(df)} rows with columns: {list(df.columns)}")
         
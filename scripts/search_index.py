@@ -0,0 +1,60 @@
+"""
+Prebuilt client-side search index for the HTML report.
+
+The report used to test every table row against the search term on each
+keystroke. Instead, the generator writes a compact JSON index next to the
+report and docs/js/script.js only looks at the rows the index points to:
+
+  * `rows`      - row ids, i.e. the `data-row` value of each rendered <tr>
+  * `names`     - normalized (lowercased) element/attribute names
+  * `paths`     - normalized paths, split into their segments
+  * `name_trigrams` / `path_trigrams` - {trigram: [entry, ...]} postings
+
+Entries are positions in the `rows`/`names`/`paths` arrays. A literal search
+term intersects the postings of its trigrams and only verifies the survivors.
+"""
+
+import json
+
+SEARCH_INDEX_VERSION = 1
+TRIGRAM_LENGTH = 3
+
+def normalize_search_text(text):
+    """Lowercases and trims a name or path the way the search box input is treated."""
+    return str(text).strip().lower()
+
+def iter_trigrams(text):
+    """Yields the distinct trigrams of `text`."""
+    seen = set()
+    for i in range(len(text) - TRIGRAM_LENGTH + 1):
+        trigram = text[i:i + TRIGRAM_LENGTH]
+        if trigram not in seen:
+            seen.add(trigram)
+            yield trigram
+
+def build_postings(texts):
+    """Returns {trigram: [entry, ...]} with ascending entry numbers."""
+    postings = {}
+    for entry, text in enumerate(texts):
+        for trigram in iter_trigrams(text):
+            postings.setdefault(trigram, []).append(entry)
+    return postings
+
+def build_search_index(row_ids, names, paths):
+    """Builds the index from parallel lists of row ids, names and paths."""
+    normalized_names = [normalize_search_text(name) for name in names]
+    normalized_paths = [normalize_search_text(path) for path in paths]
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'rows': list(row_ids),
+        'names': normalized_names,
+        'paths': [path.split('/') for path in normalized_paths],
+        'name_trigrams': build_postings(normalized_names),
+        'path_trigrams': build_postings(normalized_paths),
+    }
+
+def write_search_index(index, output_file):
+    """Writes the index as compact JSON."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return output_file
@@ -0,0 +1,154 @@
+"""
+Persistent on-disk cache for the parsed spec.
+
+Every script used to tokenize the AsciiDoc source (or read the workbook) and
+rebuild its DataFrame on start. cached_load stores the parsed result as a
+pickle under output/.cache, keyed by the SHA-256 of the source file's
+content, the kind of parse, the parser version and the pandas version. Any
+change to the source or the parser therefore misses the cache; nothing is
+ever invalidated by timestamps.
+
+A hit refreshes the entry's modification time, and after each write the
+least recently used entries are deleted until the cache fits into
+DEFAULT_MAX_CACHE_BYTES. Setting EPD_SPEC_CACHE=0 bypasses the cache.
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+
+import pandas as pd
+
+from adoc_table import PARSER_VERSION, parse_asciidoc_table
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+CACHE_DIR = os.path.join(OUTPUT_DIR, '.cache')
+CACHE_SUFFIX = '.pickle'
+DEFAULT_MAX_CACHE_BYTES = 64 * 1024 * 1024
+CACHE_ENV_VARIABLE = 'EPD_SPEC_CACHE'
+
+def cache_enabled():
+    """False when the cache is switched off with EPD_SPEC_CACHE=0."""
+    return os.environ.get(CACHE_ENV_VARIABLE, '1').strip().lower() not in ('0', 'off', 'false', 'no')
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_file_name(source_digest, kind, version):
+    """Name of the cache entry for one source content, kind of parse and parser version."""
+    key = hashlib.sha256(f'{kind}\0{version}\0{pd.__version__}\0{source_digest}'.encode('utf-8')).hexdigest()
+    return f"{re.sub(r'[^A-Za-z0-9]+', '_', kind)}-{key[:40]}{CACHE_SUFFIX}"
+
+def _cache_entries(cache_dir):
+    """(path, size, mtime) of every cache entry."""
+    entries = []
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return entries
+    for name in names:
+        if not name.endswith(CACHE_SUFFIX):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((path, stat.st_size, stat.st_mtime_ns))
+    return entries
+
+def evict_cache(cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_CACHE_BYTES, keep=None):
+    """Deletes least recently used entries until the cache fits into `max_bytes`.
+
+    `keep` (a path) is never deleted, so the entry just written survives even
+    if it alone exceeds the limit. Returns the number of deleted entries.
+    """
+    entries = sorted(_cache_entries(cache_dir), key=lambda entry: entry[2])
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Deletes every cache entry; returns how many were removed."""
+    entries = _cache_entries(cache_dir)
+    for path, _, _ in entries:
+        os.remove(path)
+    return len(entries)
+
+def cached_load(source_file, loader, kind, version, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_CACHE_BYTES):
+    """Returns loader(source_file), from the cache when the source is unchanged.
+
+    `kind` names the parse (e.g. 'adoc') and `version` must change whenever
+    the loader's result for the same input changes. Unreadable entries are
+    treated as misses.
+    """
+    if not cache_enabled():
+        return loader(source_file)
+    cache_file = os.path.join(cache_dir, cache_file_name(file_digest(source_file), kind, version))
+    try:
+        with open(cache_file, 'rb') as f:
+            result = pickle.load(f)
+        os.utime(cache_file)
+        return result
+    except FileNotFoundError:
+        pass
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        # Truncated or written by an incompatible library version
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+
+    result = loader(source_file)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_file = f'{cache_file}.{os.getpid()}.tmp'
+    with open(temp_file, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, cache_file)
+    evict_cache(cache_dir, max_bytes, keep=cache_file)
+    return result
+
+def load_spec_table(source_file=ADOC_SOURCE_FILE, cache_dir=CACHE_DIR):
+    """parse_asciidoc_table(source_file), served from the cache when the file is unchanged."""
+    return cached_load(source_file, parse_asciidoc_table, 'adoc', PARSER_VERSION, cache_dir)
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the parsed-spec cache.")
+    parser.add_argument('--clear', action='store_true', help="delete every cache entry")
+    args = parser.parse_args()
+
+    try:
+        if args.clear:
+            print(f"Removed {clear_cache()} cache entries from {CACHE_DIR}")
+        else:
+            entries = _cache_entries(CACHE_DIR)
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2], reverse=True):
+                print(f"{size / 1024:10.1f} KiB  {os.path.basename(path)}")
+            total = sum(size for _, size, _ in entries)
+            print(f"{len(entries)} entries, {total / 1024:.1f} KiB of {DEFAULT_MAX_CACHE_BYTES // (1024 * 1024)} MiB in {CACHE_DIR}")
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,237 @@
+"""
+Path-keyed index over the EPD spec rows.
+
+Looking up a row by its Path used to mean filtering the DataFrame. SpecIndex is
+built once from the parsed AsciiDoc table and answers
+
+  * exact lookups by path (a dict, O(1)),
+  * subtree and prefix queries (a trie over the path segments),
+  * parent/children/ancestor navigation, and
+  * namespace filtering by the prefix of an element's own name (epd, epd2, epd24).
+
+Some paths occur more than once in the spec. Queries return one entry per
+path, the last definition, as the attribute pages do; get_all() returns every
+row for a path.
+"""
+
+import argparse
+import os
+import re
+from collections import namedtuple
+
+from spec_cache import load_spec_table
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+
+# 'epd2:component' and '@epd24:years' are in a namespace, 'dataSetInformation' is not
+NAMESPACE_PATTERN = re.compile(r'^@?([A-Za-z_][\w.-]*):')
+
+# `position` is the row's position in the DataFrame, `row` maps column names to values
+SpecEntry = namedtuple('SpecEntry', ['path', 'position', 'row'])
+
+def normalize_path(path):
+    """Strips whitespace and surrounding slashes; missing paths become ''."""
+    if path is None:
+        return ''
+    path = str(path).strip().strip('/')
+    return '' if path == 'nan' else path
+
+def path_namespace(path):
+    """Namespace prefix of the last segment of `path`, or None."""
+    match = NAMESPACE_PATTERN.match(path.rsplit('/', 1)[-1])
+    return match.group(1) if match else None
+
+class _TrieNode:
+    __slots__ = ('children', 'path')
+
+    def __init__(self):
+        self.children = {}
+        self.path = None  # Set when a spec row has exactly this path
+
+class SpecIndex:
+    """Exact, subtree, prefix and namespace queries over spec rows keyed by Path."""
+
+    def __init__(self, entries):
+        self._entries_by_path = {}
+        self._root = _TrieNode()
+        self._namespaces = {}
+        for entry in entries:
+            if entry.path not in self._entries_by_path:
+                self._entries_by_path[entry.path] = []
+                self._insert(entry.path)
+                self._namespaces.setdefault(path_namespace(entry.path), []).append(entry.path)
+            self._entries_by_path[entry.path].append(entry)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Builds the index from a parsed spec DataFrame; rows without a Path are skipped."""
+        columns = list(df.columns)
+        entries = []
+        for position, values in enumerate(df.itertuples(index=False, name=None)):
+            row = dict(zip(columns, values))
+            path = normalize_path(row.get('Path'))
+            if path:
+                entries.append(SpecEntry(path, position, row))
+        return cls(entries)
+
+    def _insert(self, path):
+        node = self._root
+        for segment in path.split('/'):
+            node = node.children.setdefault(segment, _TrieNode())
+        node.path = path
+
+    def _find_node(self, path):
+        node = self._root
+        if not path:
+            return node
+        for segment in path.split('/'):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def _collect(self, nodes):
+        """Canonical entries of every path at or below `nodes`, in document order."""
+        paths = []
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node.path is not None:
+                paths.append(node.path)
+            stack.extend(node.children.values())
+        return self._canonical(paths)
+
+    def _canonical(self, paths):
+        return sorted((self._entries_by_path[path][-1] for path in paths), key=lambda entry: entry.position)
+
+    def __len__(self):
+        return len(self._entries_by_path)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self._entries_by_path
+
+    def __iter__(self):
+        return iter(self._canonical(self._entries_by_path))
+
+    def get(self, path, default=None):
+        """The entry for `path` (its last definition), or `default`."""
+        entries = self._entries_by_path.get(normalize_path(path))
+        return entries[-1] if entries else default
+
+    def get_all(self, path):
+        """Every row defined for `path`, in document order."""
+        return list(self._entries_by_path.get(normalize_path(path), ()))
+
+    def subtree(self, path):
+        """`path` and all paths below it."""
+        node = self._find_node(normalize_path(path))
+        return self._collect([node]) if node is not None else []
+
+    def find_prefix(self, prefix):
+        """Paths starting with `prefix`, whose last segment may be incomplete.
+
+        'processDataSet/processInf' matches processDataSet/processInformation
+        and everything below it.
+        """
+        prefix = str(prefix).strip().lstrip('/')
+        parent_path, _, partial = prefix.rpartition('/')
+        node = self._find_node(parent_path)
+        if node is None:
+            return []
+        return self._collect(child for segment, child in node.children.items() if segment.startswith(partial))
+
+    def parent(self, path):
+        """The entry of the nearest enclosing element with a row, or None at the top level.
+
+        Intermediate segments without a spec row of their own are skipped, so
+        this is the parent `children()` lists `path` under.
+        """
+        ancestors = self.ancestors(path)
+        return ancestors[-1] if ancestors else None
+
+    def children(self, path):
+        """Entries directly below `path`."""
+        node = self._find_node(normalize_path(path))
+        if node is None:
+            return []
+        paths = []
+        stack = list(node.children.values())
+        # Intermediate segments without a spec row of their own are passed through
+        while stack:
+            child = stack.pop()
+            if child.path is not None:
+                paths.append(child.path)
+            else:
+                stack.extend(child.children.values())
+        return self._canonical(paths)
+
+    def ancestors(self, path):
+        """Entries of the enclosing elements, outermost first."""
+        result = []
+        prefix = []
+        for segment in normalize_path(path).split('/')[:-1]:
+            prefix.append(segment)
+            entry = self.get('/'.join(prefix))
+            if entry is not None:
+                result.append(entry)
+        return result
+
+    def namespaces(self):
+        """Namespace prefixes used by element and attribute names."""
+        return sorted(namespace for namespace in self._namespaces if namespace is not None)
+
+    def in_namespace(self, namespace, within=None):
+        """Entries whose own name is in `namespace` (None for unprefixed names).
+
+        With `within`, only paths in that subtree are returned.
+        """
+        paths = self._namespaces.get(namespace, [])
+        if within is not None:
+            within = normalize_path(within)
+            paths = [path for path in paths if path == within or path.startswith(within + '/')]
+        return self._canonical(paths)
+
+def build_spec_index(df):
+    """Builds a SpecIndex for an already parsed DataFrame."""
+    return SpecIndex.from_dataframe(df)
+
+def load_spec_index(source_file=ADOC_SOURCE_FILE):
+    """Parses the AsciiDoc table and builds its SpecIndex."""
+    return build_spec_index(load_spec_table(source_file))
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the EPD spec by path.")
+    parser.add_argument('path', nargs='?', default='', help="path to look up, e.g. processDataSet/processInformation")
+    parser.add_argument('--subtree', action='store_true', help="list every path below PATH")
+    parser.add_argument('--prefix', action='store_true', help="treat PATH as a prefix whose last segment may be incomplete")
+    parser.add_argument('--namespace', help="only list names in this namespace (e.g. epd2)")
+    args = parser.parse_args()
+
+    try:
+        index = load_spec_index()
+        if args.namespace:
+            results = index.in_namespace(args.namespace, within=args.path or None)
+        elif args.prefix:
+            results = index.find_prefix(args.path)
+        elif args.subtree:
+            results = index.subtree(args.path)
+        else:
+            entry = index.get(args.path)
+            if entry is None:
+                raise KeyError(f"No spec row for path '{args.path}'")
+            print(f"{entry.path} (row {entry.position})")
+            for ancestor in index.ancestors(entry.path):
+                print(f"  ancestor: {ancestor.path}")
+            for child in index.children(entry.path):
+                print(f"  child:    {child.path}")
+            results = []
+        for entry in results:
+            print(entry.path)
+
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,244 @@
+"""
+Streaming validator for ILCD+EPD process dataset XML files.
+
+The Path, Occ., Technically Required and Datatype columns of the spec are
+compiled into a rule set once. Each XML file is then streamed with lxml
+iterparse and elements are cleared as soon as they are closed, so memory stays
+constant per file. Reported issues:
+
+  * missing   - a mandatory element or attribute is absent from its parent
+  * cardinality - an element occurs more often than its Occ. allows
+  * datatype  - a value does not match the documented Datatype
+  * xml       - the file is not well-formed
+
+Element names are matched as they appear in the spec paths: names in the EPD
+namespaces carry their prefix (epd:, epd2:, epd24:), all others (ILCD process
+and common namespaces) are matched by their local name.
+"""
+
+import argparse
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+
+from spec_cache import load_spec_table
+from spec_index import build_spec_index
+from datatype_checkers import compile_datatype
+from cli_options import parse_jobs
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+
+# Namespace URIs from the legend of the AsciiDoc source, mapped to the prefixes used in its paths
+NAMESPACE_PREFIXES = {
+    'http://www.iai.kit.edu/EPD/2013': 'epd',
+    'http://www.indata.network/EPD/2019': 'epd2',
+    'http://www.indata.network/EPD/2023': 'epd3',
+    'http://www.indata.network/EPD/2024': 'epd24',
+}
+
+OCCURRENCE_PATTERN = re.compile(r'^\[\s*(\d+)\s*(?:,\s*(\d+|n)\s*)?\]$')
+
+# `checker` is the compiled DatatypeChecker, or None when any value is accepted
+Rule = namedtuple('Rule', ['path', 'name', 'is_attribute', 'min_occurs', 'max_occurs', 'datatype', 'checker'])
+# rules: {path: Rule}; child_rules/attribute_rules: {parent path: [Rule, ...]}
+RuleSet = namedtuple('RuleSet', ['rules', 'child_rules', 'attribute_rules'])
+ValidationIssue = namedtuple('ValidationIssue', ['file', 'line', 'path', 'kind', 'message'])
+
+# --- Rule compilation ---
+
+def parse_occurrence(occurrence, required=''):
+    """Turns an Occ. value such as '[0,1]', '[1,n]' or '[1]' into (min, max); max None is unbounded.
+
+    A blank Occ. is taken from Technically Required: 'm' means at least one.
+    Mandatory fields never have a minimum of 0.
+    """
+    match = OCCURRENCE_PATTERN.match(str(occurrence).strip())
+    if match:
+        min_occurs = int(match.group(1))
+        upper = match.group(2)
+        max_occurs = min_occurs if upper is None else (None if upper == 'n' else int(upper))
+    else:
+        min_occurs, max_occurs = 0, None
+    if str(required).strip() == 'm':
+        min_occurs = max(min_occurs, 1)
+    return min_occurs, max_occurs
+
+def compile_rules(df):
+    """Compiles the spec DataFrame into a RuleSet keyed by path."""
+    rules = {}
+    child_rules = {}
+    attribute_rules = {}
+    for entry in build_spec_index(df):
+        row = entry.row
+        parent_path, _, name = entry.path.rpartition('/')
+        is_attribute = name.startswith('@')
+        min_occurs, max_occurs = parse_occurrence(row.get('Occ.', ''), row.get('Technically Required', ''))
+        datatype = str(row.get('Datatype', '') or '').strip()
+        rule = Rule(entry.path, name.lstrip('@'), is_attribute, min_occurs, max_occurs, datatype,
+                    compile_datatype(datatype))
+        rules[entry.path] = rule
+        if parent_path:
+            target = attribute_rules if is_attribute else child_rules
+            target.setdefault(parent_path, []).append(rule)
+    return RuleSet(rules, child_rules, attribute_rules)
+
+def load_rules(source_file=ADOC_SOURCE_FILE):
+    """Parses the AsciiDoc table and compiles its rules."""
+    return compile_rules(load_spec_table(source_file))
+
+# --- Streaming validation ---
+
+def spec_name(qualified_tag, nsmap, element_prefix=None):
+    """Name of an element or attribute as written in the spec paths."""
+    if not qualified_tag.startswith('{'):
+        return qualified_tag
+    uri, local_name = qualified_tag[1:].split('}', 1)
+    prefix = NAMESPACE_PREFIXES.get(uri)
+    if prefix is None:
+        # Unknown URI: trust the document's prefix if it is one the spec uses
+        document_prefix = element_prefix
+        if document_prefix is None:
+            document_prefix = next((p for p, u in nsmap.items() if u == uri and p), None)
+        if document_prefix in NAMESPACE_PREFIXES.values():
+            prefix = document_prefix
+    return f'{prefix}:{local_name}' if prefix else local_name
+
+def _check_children(rule_set, path, counts, issues, file_name, line):
+    for rule in rule_set.child_rules.get(path, ()):
+        count = counts.get(rule.name, 0)
+        if count < rule.min_occurs:
+            if count == 0:
+                issues.append(ValidationIssue(file_name, line, rule.path, 'missing',
+                                              f"Mandatory element '{rule.name}' is missing"))
+            else:
+                issues.append(ValidationIssue(file_name, line, rule.path, 'cardinality',
+                                              f"'{rule.name}' occurs {count} times, at least {rule.min_occurs} expected"))
+        elif rule.max_occurs is not None and count > rule.max_occurs:
+            issues.append(ValidationIssue(file_name, line, rule.path, 'cardinality',
+                                          f"'{rule.name}' occurs {count} times, at most {rule.max_occurs} allowed"))
+
+def _check_attributes(rule_set, path, element, issues, file_name):
+    attribute_rules = rule_set.attribute_rules.get(path)
+    if not attribute_rules:
+        return
+    present = {}
+    for qualified_name, value in element.attrib.items():
+        present[spec_name(qualified_name, element.nsmap)] = value
+    for rule in attribute_rules:
+        value = present.get(rule.name)
+        if value is None:
+            if rule.min_occurs > 0:
+                issues.append(ValidationIssue(file_name, element.sourceline, rule.path, 'missing',
+                                              f"Mandatory attribute '@{rule.name}' is missing"))
+        elif rule.checker is not None:
+            error = rule.checker(value.strip())
+            if error:
+                issues.append(ValidationIssue(file_name, element.sourceline, rule.path, 'datatype', error))
+
+def validate_file(xml_file, rule_set):
+    """Streams one XML file and returns its list of ValidationIssues."""
+    issues = []
+    file_name = str(xml_file)
+    stack = []  # [path, child counts, has child elements] per open element
+    try:
+        for event, element in etree.iterparse(str(xml_file), events=('start', 'end'), remove_comments=True):
+            if event == 'start':
+                name = spec_name(element.tag, element.nsmap, element.prefix)
+                if stack:
+                    parent = stack[-1]
+                    parent[1][name] = parent[1].get(name, 0) + 1
+                    parent[2] = True
+                    path = f'{parent[0]}/{name}'
+                else:
+                    path = name
+                    if path not in rule_set.rules:
+                        issues.append(ValidationIssue(file_name, element.sourceline, path, 'missing',
+                                                      f"Root element '{name}' is not described by the spec"))
+                stack.append([path, {}, False])
+                _check_attributes(rule_set, path, element, issues, file_name)
+                continue
+
+            path, counts, has_children = stack.pop()
+            rule = rule_set.rules.get(path)
+            if rule is not None and rule.checker is not None and not has_children:
+                error = rule.checker((element.text or '').strip())
+                if error:
+                    issues.append(ValidationIssue(file_name, element.sourceline, path, 'datatype', error))
+            _check_children(rule_set, path, counts, issues, file_name, element.sourceline)
+
+            # Free the finished subtree so memory does not grow with the file
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    except (etree.XMLSyntaxError, OSError) as e:
+        issues.append(ValidationIssue(file_name, getattr(e, 'lineno', None), '', 'xml', str(e)))
+    return issues
+
+# --- Batch mode ---
+
+_worker_rules = None
+
+def _init_worker(rule_set):
+    global _worker_rules
+    _worker_rules = rule_set
+
+def _validate_in_worker(xml_file):
+    return validate_file(xml_file, _worker_rules)
+
+def find_xml_files(directory):
+    """All .xml files below `directory`, sorted."""
+    xml_files = []
+    for root, _, files in os.walk(directory):
+        xml_files.extend(os.path.join(root, name) for name in files if name.lower().endswith('.xml'))
+    return sorted(xml_files)
+
+def validate_files(xml_files, rule_set, jobs=1):
+    """Validates many files, yielding (file, issues) in input order.
+
+    With `jobs` > 1 the files are spread over a process pool; the rules are
+    sent to each worker once instead of with every file.
+    """
+    if jobs > 1 and len(xml_files) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rule_set,)) as pool:
+            chunksize = max(1, len(xml_files) // (jobs * 4))
+            yield from zip(xml_files, pool.map(_validate_in_worker, xml_files, chunksize=chunksize))
+    else:
+        for xml_file in xml_files:
+            yield xml_file, validate_file(xml_file, rule_set)
+
+def format_issue(issue):
+    location = f"{issue.file}:{issue.line}" if issue.line else issue.file
+    return f"{location}: [{issue.kind}] {issue.path}: {issue.message}"
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate ILCD+EPD XML datasets against the documented spec.")
+    parser.add_argument('inputs', nargs='+', help="XML files or directories (searched recursively)")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1,
+                        help="number of worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    try:
+        rule_set = load_rules()
+        xml_files = []
+        for item in args.inputs:
+            xml_files.extend(find_xml_files(item) if os.path.isdir(item) else [item])
+
+        files_with_issues = 0
+        total_issues = 0
+        for xml_file, issues in validate_files(xml_files, rule_set, jobs=args.jobs):
+            for issue in issues:
+                print(format_issue(issue))
+            files_with_issues += bool(issues)
+            total_issues += len(issues)
+        print(f"Validated {len(xml_files)} files: {total_issues} issues in {files_with_issues} files")
+
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Watch mode: rebuild only what an edit affects.
+
+The sources in data/ and the scripts in scripts/ are polled. Each stage knows
+the files it reads and, for the build stages, the scripts it runs including
+every local module they import (found by reading their import statements):
+
+    XLSX --(convert)--> AsciiDoc --(build.py)--> HTML report, attribute pages, CSV
+
+A change is confirmed by the file's content hash, so saving a file without
+editing it rebuilds nothing. The converter only triggers the build stages
+when the AsciiDoc it writes actually differs. All affected build stages run
+in a single build.py call, which loads the spec once (from output/.cache when
+possible), and the attribute pages are only rewritten when their content changed
+(see generate_attribute_pages). Stages run in a fresh interpreter, so edits
+to the scripts take effect immediately.
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from spec_cache import file_digest
+from cli_options import DEFAULT_REPORT_MODE, REPORT_MODES, parse_jobs
+
+# Define base directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+SCRIPTS_DIR = os.path.join(BASE_DIR, 'scripts')
+
+ADOC_SOURCE_FILE = os.path.join(DATA_DIR, 'epd_documentation_from_xlsx_combined.adoc')
+# The workbook convert_xlsx_to_adoc_FIXED.py reads
+XLSX_SOURCE_FILE = os.path.join(DATA_DIR, 'ILCD_Format_Documentation_v1.3_reformatted_final_2025-09-12.xlsx')
+DEFAULT_POLL_INTERVAL = 0.5
+
+# `script` is run by the stage; `build_key` names the build.py --only output, None for
+# stages that run their script on their own.
+# Stages are listed in build order; a stage's output is watched like any input.
+Stage = namedtuple('Stage', ['name', 'script', 'inputs', 'build_key'])
+
+STAGES = (
+    Stage('AsciiDoc', 'convert_xlsx_to_adoc_FIXED.py', (XLSX_SOURCE_FILE,), None),
+    Stage('HTML report', 'generate_html_report.py', (ADOC_SOURCE_FILE,), 'report'),
+    Stage('Attribute pages', 'generate_attribute_pages.py', (ADOC_SOURCE_FILE,), 'pages'),
+    Stage('CSV export', 'generate_csv_from_adoc.py', (ADOC_SOURCE_FILE,), 'csv'),
+)
+BUILD_SCRIPT = 'build.py'
+
+# --- Dependencies ---
+
+def local_imports(script, scripts_dir=SCRIPTS_DIR):
+    """Paths of the script and every module in `scripts_dir` it imports, directly or not."""
+    seen = set()
+    pending = [os.path.join(scripts_dir, script)]
+    while pending:
+        path = pending.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.add(path)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                modules = [node.module]
+            else:
+                continue
+            pending.extend(os.path.join(scripts_dir, module.split('.')[0] + '.py') for module in modules)
+    return seen
+
+def stage_dependencies(stages=STAGES, scripts_dir=SCRIPTS_DIR):
+    """{stage name: set of files whose change makes the stage stale}."""
+    dependencies = {}
+    for stage in stages:
+        files = set(stage.inputs)
+        # The AsciiDoc file is edited by hand as well, so the converter only reruns
+        # for a changed workbook, never because its own code changed
+        if stage.build_key is not None:
+            files |= local_imports(stage.script, scripts_dir)
+            files.add(os.path.join(scripts_dir, BUILD_SCRIPT))
+        dependencies[stage.name] = files
+    return dependencies
+
+def affected_stages(changed, dependencies, stages=STAGES):
+    """Stages, in build order, that read one of the `changed` files."""
+    return [stage for stage in stages if dependencies[stage.name] & changed]
+
+# --- Change detection ---
+
+class FileState:
+    """Remembers the stat and content hash of the watched files."""
+
+    def __init__(self, paths):
+        self.paths = []
+        self._stats = {}
+        self._digests = {}
+        self.set_paths(paths)
+
+    def set_paths(self, paths):
+        """Starts watching new paths (from their current content) and forgets removed ones."""
+        for path in paths:
+            if path not in self._stats:
+                self._stats[path] = self._stat(path)
+                self._digests[path] = self._digest(path)
+        for path in set(self._stats) - set(paths):
+            del self._stats[path], self._digests[path]
+        self.paths = sorted(paths)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _digest(path):
+        try:
+            return file_digest(path)
+        except FileNotFoundError:
+            return None
+
+    def poll(self):
+        """Files whose content changed since the last poll.
+
+        Only files whose size or modification time moved are hashed.
+        """
+        changed = set()
+        for path in self.paths:
+            stat = self._stat(path)
+            if stat == self._stats[path]:
+                continue
+            self._stats[path] = stat
+            digest = self._digest(path)
+            if digest != self._digests[path]:
+                self._digests[path] = digest
+                changed.add(path)
+        return changed
+
+# --- Running stages ---
+
+def run_script(script, *args):
+    """Runs a script in a fresh interpreter; returns True if it exited cleanly."""
+    result = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *args], cwd=BASE_DIR)
+    if result.returncode != 0:
+        print(f"{script} failed with exit code {result.returncode}")
+    return result.returncode == 0
+
+def run_stages(stages, state, report_mode=DEFAULT_REPORT_MODE, jobs=1):
+    """Runs the given stages; outputs that changed on the way make later stages stale too.
+
+    Returns the names of the stages that ran.
+    """
+    dependencies = stage_dependencies()
+    pending = list(stages)
+    ran = []
+    for stage in [stage for stage in pending if stage.build_key is None]:
+        if not run_script(stage.script):
+            return ran
+        ran.append(stage.name)
+        changed = state.poll()
+        pending.extend(s for s in affected_stages(changed, dependencies) if s not in pending)
+    build_stages = [stage for stage in STAGES if stage in pending and stage.build_key is not None]
+    if build_stages:
+        args = ['--report-mode', report_mode, '--jobs', str(jobs)]
+        for stage in build_stages:
+            args += ['--only', stage.build_key]
+        if run_script(BUILD_SCRIPT, *args):
+            ran.extend(stage.name for stage in build_stages)
+    return ran
+
+def watch(interval=DEFAULT_POLL_INTERVAL, report_mode=DEFAULT_REPORT_MODE, jobs=1, build_first=False):
+    """Polls the stage dependencies and reruns the affected stages until interrupted."""
+    dependencies = stage_dependencies()
+    state = FileState(set().union(*dependencies.values()))
+    print(f"Watching {len(state.paths)} files (every {interval:g} s, Ctrl+C to stop)...")
+    if build_first:
+        run_stages([stage for stage in STAGES if stage.build_key is not None], state, report_mode, jobs)
+    while True:
+        time.sleep(interval)
+        changed = state.poll()
+        if not changed:
+            continue
+        # Scripts may have gained or lost imports
+        dependencies = stage_dependencies()
+        stages = affected_stages(changed, dependencies)
+        names = ', '.join(os.path.relpath(path, BASE_DIR) for path in sorted(changed))
+        print(f"\nChanged: {names}")
+        if not stages:
+            continue
+        start = time.perf_counter()
+        ran = run_stages(stages, state, report_mode, jobs)
+        print(f"Rebuilt {', '.join(ran) or 'nothing'} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        state.set_paths(set().union(*dependencies.values()))
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch data/ and scripts/ and rebuild only the affected outputs.")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="seconds between polls")
+    parser.add_argument('--report-mode', choices=REPORT_MODES, default=DEFAULT_REPORT_MODE, help="passed on to build.py")
+    parser.add_argument('--jobs', '-j', type=parse_jobs, default=1, help="passed on to build.py (0 = one per CPU)")
+    parser.add_argument('--build-first', action='store_true', help="build all outputs once before watching")
+    args = parser.parse_args()
+
+    try:
+        watch(args.interval, args.report_mode, args.jobs, args.build_first)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        print(f"An error occurred: {e}")
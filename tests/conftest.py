@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The scripts are run directly (`python scripts/<name>.py`), so make them importable the same way.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+# Keep test runs out of the persistent spec cache in output/.cache; test_spec_cache.py enables it explicitly.
+os.environ.setdefault('EPD_SPEC_CACHE', '0')
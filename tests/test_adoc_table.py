@@ -0,0 +1,94 @@
+import pytest
+from adoc_table import (escape_trailing_backslashes, iter_table_rows, parse_asciidoc_table,
+                        unescape_trailing_backslashes)
+
+SAMPLE_ADOC = """= Title
+
+.Namespace legend
+|===
+| ##not part of the data table##
+|===
+
+.EPD Data Structure
+[cols="1,1,1", options="header"]
+|===
+| [role="title"]##Element/Attribute Name##
+| [role="title"]##Datatype##
+| [role="title"]##Indent##
+
+| ##processDataSet##
+| ##{nbsp}##
+| ##0##
+
+| ##{nbsp}{nbsp}{nbsp}{nbsp}@version##
+| ##Restricted xs:string: +
+A - first +
+B - second##
+| ##1##
+
+| ##tag \\##1##
+| ##a \\| b##
+| ##1##
+
+| ##C:\\Temp{backslash}##
+| ##{backslash}{backslash}##
+| ##0##
+|===
+"""
+
+
+@pytest.fixture
+def adoc_file(tmp_path):
+    path = tmp_path / 'sample.adoc'
+    path.write_text(SAMPLE_ADOC, encoding='utf-8')
+    return path
+
+
+def test_rows_are_streamed_with_header_first():
+    """The header comes first and multi-line cells stay in one cell."""
+    rows = list(iter_table_rows(SAMPLE_ADOC.splitlines(keepends=True)))
+    assert rows[0] == ['Element/Attribute Name', 'Datatype', 'Indent']
+    assert len(rows) == 5
+    assert rows[2][1] == 'Restricted xs:string: +\nA - first +\nB - second'
+
+
+def test_escaped_cell_markers_are_honored():
+    """An escaped '\\##' inside a cell is a literal '##', not a cell boundary."""
+    rows = list(iter_table_rows(SAMPLE_ADOC.splitlines(keepends=True)))
+    assert rows[3] == ['tag ##1', 'a \\| b', '1']
+
+
+def test_partial_last_row_is_padded():
+    lines = ['.EPD Data Structure\n', '|===\n', '| [role="title"]##A##\n', '| [role="title"]##B##\n',
+             '| ##1##\n', '| ##2##\n', '| ##3##\n', '|===\n']
+    assert list(iter_table_rows(lines)) == [['A', 'B'], ['1', '2'], ['3', '']]
+
+
+def test_missing_table_raises():
+    with pytest.raises(ValueError):
+        list(iter_table_rows(['= Title\n', '|===\n', '|===\n']))
+
+
+def test_unterminated_cell_raises():
+    with pytest.raises(ValueError):
+        list(iter_table_rows(['.EPD Data Structure\n', '|===\n', '| [role="title"]##A##\n', '| ##open\n', '|===\n']))
+
+
+def test_parse_asciidoc_table(adoc_file):
+    """The DataFrame has '{nbsp}' removed and a numeric Indent column."""
+    df = parse_asciidoc_table(adoc_file)
+    assert df['Element/Attribute Name'].tolist() == ['processDataSet', '@version', 'tag ##1', 'C:\\Temp\\']
+    assert df['Indent'].tolist() == [0, 1, 1, 0]
+    assert df.loc[3, 'Datatype'] == '\\\\'
+    assert df.loc[0, 'Datatype'] == ''
+
+
+def test_trailing_backslashes_do_not_escape_the_closing_marker():
+    """A cell ending in a backslash is written with {backslash}, so the next '##' still closes it."""
+    cell = escape_trailing_backslashes('a\\b\\')
+    lines = ['.EPD Data Structure\n', '|===\n', '| [role="title"]##A##\n', '| [role="title"]##B##\n',
+             '| ##' + cell + '##\n', '| ##next##\n', '|===\n']
+    rows = list(iter_table_rows(lines))
+    assert rows == [['A', 'B'], ['a\\b{backslash}', 'next']]
+    assert unescape_trailing_backslashes(rows[1][0]) == 'a\\b\\'
+    assert escape_trailing_backslashes('no escape') == 'no escape'
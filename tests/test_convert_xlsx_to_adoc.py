@@ -0,0 +1,153 @@
+from datetime import datetime
+
+import openpyxl
+import pytest
+import pandas as pd
+from openpyxl.styles import PatternFill
+from convert_xlsx_to_adoc_FIXED import (adoc_columns, build_paths, compare_dataframes, convert_xlsx_to_adoc,
+                                        get_indentation_from_colors, read_adoc_table, read_sheet_with_colors,
+                                        validate_roundtrip)
+
+
+def test_repeated_names_keep_their_own_indent():
+    """Indent levels are stored per row, so a repeated name does not take the last row's level."""
+    element_colors = [
+        (0, 'processDataSet', 'FFFFC000'),
+        (1, 'other', 'FFFFD783'),
+        (2, 'other', 'FFFFF3D9'),
+        (3, '@lang', '00000000'),
+    ]
+    indents = get_indentation_from_colors(element_colors, 5)
+    assert indents.typecode == 'b'
+    assert list(indents) == [0, 1, 2, 3, 0]
+
+
+def test_build_paths_uses_the_ancestor_stack():
+    names = ['root', 'a', 'name', '@lang', 'b', 'name', '@lang', 'root2', 'deep']
+    indents = [0, 1, 2, 3, 1, 2, 3, 0, 2]
+    assert build_paths(names, indents) == [
+        'root',
+        'root/a',
+        'root/a/name',
+        'root/a/name/@lang',
+        'root/b',
+        'root/b/name',
+        'root/b/name/@lang',
+        'root2',
+        'root2/deep',
+    ]
+
+
+def test_compare_dataframes_reports_changed_cells(tmp_path):
+    """'1' and '1.0' count as equal; real changes are logged with their sheet row."""
+    original = pd.DataFrame({'order': ['1', '2', '3'], 'Name': ['a', 'b', 'c'], 'Path': ['x', 'y', 'z']})
+    roundtrip = pd.DataFrame({'Path': ['x', 'y', 'changed'], 'order': ['1.0', '2', '3'], 'Name': ['a ', 'B', 'c']})
+    log_file = tmp_path / 'log.txt'
+
+    assert compare_dataframes(original, roundtrip, str(log_file)) == 2
+
+    log = log_file.read_text(encoding='utf-8')
+    assert "Difference at Row 3, Column 'Name':\n  Original: 'b'\n  New     : 'B'" in log
+    assert "Difference at Row 4, Column 'Path':" in log
+    assert "Differences per column (2 rows changed):" in log
+
+
+def test_compare_dataframes_without_differences(tmp_path):
+    df = pd.DataFrame({'order': ['1', '2'], 'Name': ['a', 'b']})
+    log_file = tmp_path / 'log.txt'
+    assert compare_dataframes(df, df.copy(), str(log_file)) == 0
+    assert log_file.read_text() == "Comparison complete: No differences found."
+
+
+def test_read_adoc_table_restores_cell_values(tmp_path):
+    """Multi-line cells, escaped pipes and {nbsp} placeholders come back as they were in the sheet."""
+    adoc = tmp_path / 'table.adoc'
+    adoc.write_text(
+        '.EPD Data Structure\n'
+        '|===\n'
+        '| [role="title"]##Element/Attribute Name##\n'
+        '| [role="title"]##Datatype##\n'
+        '| ##{nbsp}{nbsp}{nbsp}{nbsp}name##\n'
+        '| ##Restricted xs:string: +\nA - a\\|b##\n'
+        '| ##{nbsp}##\n'
+        '| ##x \\## y##\n'
+        '|===\n',
+        encoding='utf-8',
+    )
+    df = read_adoc_table(str(adoc), ['Element/Attribute Name', 'Datatype'])
+    assert df.fillna('').values.tolist() == [
+        ['name', 'Restricted xs:string:\nA - a|b'],
+        ['', 'x ## y'],
+    ]
+    assert read_adoc_table(str(adoc), ['Element/Attribute Name', 'Other']) is None
+
+
+def write_sample_workbook(xlsx_file):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Doc'
+    sheet.append(['order', 'Element/Attribute Name', 'Occ.', 'Introduced', 'Definition (en)'])
+    sheet.append([1, 'processDataSet', '1', datetime(2020, 1, 31), 'Root'])
+    sheet.append([2.5, 'processInformation', 0.25, None, 'Line one\nLine two'])
+    sheet.append([])
+    sheet.append([3, '@lang', '0..1', datetime(2021, 6, 1, 12, 30), None])
+    sheet.append([4, '@path', None, None, 'C:\\Temp\\'])
+    sheet.append([None, None, None, None, 'Trailing note'])
+    fills = {2: 'FFFFC000', 3: 'FFFFD783'}
+    for row, color in fills.items():
+        sheet.cell(row=row, column=2).fill = PatternFill(fill_type='solid', start_color=color, end_color=color)
+    workbook.save(xlsx_file)
+
+
+def test_streaming_reader_matches_read_excel(tmp_path):
+    """The single-pass reader returns what pd.read_excel returns, with the fill colors on the same rows."""
+    xlsx_file = tmp_path / 'doc.xlsx'
+    write_sample_workbook(xlsx_file)
+
+    df, element_colors = read_sheet_with_colors(str(xlsx_file), 'Doc')
+
+    pd.testing.assert_frame_equal(df, pd.read_excel(xlsx_file, sheet_name='Doc'))
+    assert element_colors == [
+        (0, 'processDataSet', 'FFFFC000'),
+        (1, 'processInformation', 'FFFFD783'),
+        (3, '@lang', '00000000'),
+        (4, '@path', '00000000'),
+    ]
+    # The positions index the DataFrame rows the names are on
+    assert [df['Element/Attribute Name'][position] for position, _, _ in element_colors] == [
+        'processDataSet', 'processInformation', '@lang', '@path']
+    assert list(get_indentation_from_colors(element_colors, len(df))) == [0, 1, 0, 3, 3, 0]
+
+
+def test_roundtrip_compares_the_sheet_as_read(tmp_path, monkeypatch):
+    """validate_roundtrip checks the AsciiDoc against the workbook's own columns, without re-reading the workbook."""
+    xlsx_file = tmp_path / 'doc.xlsx'
+    write_sample_workbook(xlsx_file)
+    adoc_file = tmp_path / 'doc.adoc'
+
+    success, df = convert_xlsx_to_adoc(str(xlsx_file), str(adoc_file), sheet_name='Doc')
+    assert success
+    pd.testing.assert_frame_equal(df, pd.read_excel(xlsx_file, sheet_name='Doc'))
+
+    def read_excel(*args, **kwargs):
+        raise AssertionError('the workbook was read again')
+    with monkeypatch.context() as patch:
+        patch.setattr(pd, 'read_excel', read_excel)
+        assert validate_roundtrip(df, str(adoc_file), str(tmp_path / 'log.txt')) == 0
+    # The cell ending in a backslash did not swallow the cells after it
+    assert read_adoc_table(str(adoc_file), adoc_columns(df.columns))['Definition (en)'][4] == 'C:\\Temp\\'
+
+
+@pytest.mark.parametrize('mode', ['memory', 'bytes', 'file'])
+def test_every_roundtrip_mode_catches_conversion_losses(tmp_path, mode):
+    """All modes compare against the same sheet data, so a cell lost in the AsciiDoc is reported by each of them."""
+    xlsx_file = tmp_path / 'doc.xlsx'
+    write_sample_workbook(xlsx_file)
+    adoc_file = tmp_path / 'doc.adoc'
+    success, df = convert_xlsx_to_adoc(str(xlsx_file), str(adoc_file), sheet_name='Doc')
+    assert success
+    roundtrip_file = str(tmp_path / 'roundtrip.xlsx')
+    assert validate_roundtrip(df, str(adoc_file), str(tmp_path / 'log.txt'), mode, roundtrip_file) == 0
+
+    adoc_file.write_text(adoc_file.read_text(encoding='utf-8').replace('##Root##', '##{nbsp}##'), encoding='utf-8')
+    assert validate_roundtrip(df, str(adoc_file), str(tmp_path / 'log.txt'), mode, roundtrip_file) == 1
@@ -0,0 +1,62 @@
+from datatype_checkers import check_value, compile_datatype
+
+
+def test_checkers_are_memoized_by_the_raw_string():
+    assert compile_datatype('Real') is compile_datatype('Real')
+    restricted = 'Restricted xs:int: +\n0 +\n1 +\n2'
+    assert compile_datatype(restricted) is compile_datatype(restricted)
+    assert compile_datatype(restricted).allowed == frozenset({'0', '1', '2'})
+
+
+def test_free_text_types_have_no_checker():
+    assert compile_datatype('FTMultiLang') is None
+    assert compile_datatype('GlobalReferenceType') is None
+    assert compile_datatype('') is None
+
+
+def test_base_types():
+    assert check_value('Real', '1.5E-3') is None
+    assert check_value('Real', 'INF') is None
+    assert check_value('Real', 'abc') is not None
+    assert check_value('Percentage', '100') is None
+    assert 'outside the range' in check_value('Percentage', '101')
+    assert check_value('Int6', '1234567') is not None
+    assert check_value('boolean', 'true') is None
+    assert check_value('UUID', 'c0ffee00-0000-0000-0000-000000000000') is None
+    assert check_value('anyURI', 'a b') is not None
+
+
+def test_enumerations():
+    assert check_value('Restricted xs:string: +\nA - one +\nB - two', 'B') is None
+    assert check_value('Restricted xs:string: +\nA - one +\nB - two', 'one') is not None
+    review_types = 'TypeOfReviewValues +\nIndependent external reviewThe review... +\nNot reviewed'
+    assert check_value(review_types, 'Independent external review') is None
+    assert check_value(review_types, 'Peer review') is not None
+
+
+def test_inline_restricted_codes():
+    inline = 'Restricted xs:int: 0 1 2 3 4 5'
+    assert compile_datatype(inline).allowed == frozenset('012345')
+    assert check_value(inline, '3') is None
+    assert check_value(inline, '9') is not None
+
+
+def test_value_lists_without_a_type_name_keep_their_first_line():
+    scope = 'Single product +\nRange of products where variability is described'
+    assert check_value(scope, 'Single product') is None
+    assert check_value(scope, 'Range of products where variability is described') is None
+    sites = 'Single production site +\nSingle manufacturer with multiple production sites +\nMultiple manufacturers'
+    assert check_value(sites, 'Single production site') is None
+    assert check_value(sites, 'Single') is not None
+
+
+def test_documented_values_are_not_matched_by_any_prefix():
+    review_types = 'TypeOfReviewValues +\nIndependent external reviewThe review... +\nNot reviewed'
+    assert check_value(review_types, 'R') is not None
+    assert check_value(review_types, 'Independent') is not None
+    assert check_value(review_types, 'Independent external revie') is not None
+    assert check_value(review_types, '') is not None
+    dataset_types = 'generic dataset/ Generischer Datensatz +\nrepresentative dataset / Repräsentativer Datensatz'
+    assert check_value(dataset_types, 'generic dataset') is None
+    assert check_value(dataset_types, 'representative dataset') is None
+    assert check_value(dataset_types, 'generic') is not None
@@ -0,0 +1,88 @@
+import enum_registry
+import pandas as pd
+import build
+from enum_registry import EnumRegistry, build_enum_registry, extract_enum_groups, split_enum_value
+from generate_attribute_pages import build_viewer_store
+
+
+def test_separate_enum_rows_and_embedded_enums():
+    """Both enum forms end up in the registry, keyed by the owning field's path."""
+    df = pd.DataFrame({
+        'Datatype': [
+            'string',
+            '',
+            'A - inherent quality',
+            'B - design level',
+            'Restricted xs:int: +\n0 +\n1 +\n2',
+            'Restricted xs:string: +\nA - less than 2,5% +\nB - more than 50%',
+            None,
+        ],
+        'Path': ['a', 'a/category', 'a/category/A', 'a/category/B', 'a/grade', 'a/range', 'a/other'],
+    })
+
+    groups = extract_enum_groups(df)
+
+    assert [(group.path, group.start, group.end) for group in groups] == [
+        ('a/category', 1, 3), ('a/grade', 4, 4), ('a/range', 5, 5)]
+    assert groups[1].base_type == 'xs:int'
+    assert build_enum_registry(groups) == {
+        'a/category': [('A', 'inherent quality'), ('B', 'design level')],
+        'a/grade': [('0', ''), ('1', ''), ('2', '')],
+        'a/range': [('A', 'less than 2,5%'), ('B', 'more than 50%')],
+    }
+
+
+def test_no_enums():
+    assert extract_enum_groups(pd.DataFrame({'Datatype': ['string', 'UUID']})) == []
+    assert extract_enum_groups(pd.DataFrame({'Name': ['x']})) == []
+
+
+def test_split_enum_value():
+    assert split_enum_value('A - inherent quality') == ('A', 'inherent quality')
+    assert split_enum_value('Reference flow(s) - x') == ('Reference flow(s) - x', '')
+    assert split_enum_value('5') == ('5', '')
+
+
+def make_spec():
+    return pd.DataFrame({
+        'Element/Attribute Name': ['a', 'category', '', '', 'grade'],
+        'Datatype': ['string', '', 'A - inherent quality', 'B - design level', 'Restricted xs:int: +\n0 +\n1'],
+        'Path': ['a', 'a/category', 'a/category/A', 'a/category/B', 'a/grade'],
+        'Indent': [0, 1, 2, 2, 1],
+    })
+
+
+def count_scans(monkeypatch):
+    scans = []
+    scan = enum_registry.extract_enum_groups
+    monkeypatch.setattr(enum_registry, 'extract_enum_groups', lambda df: scans.append(df) or scan(df))
+    return scans
+
+
+def test_registry_lookups():
+    enums = EnumRegistry.from_dataframe(make_spec())
+    assert [group.start for group in enums.groups] == [1, 4]
+    assert enums.by_start[1].path == 'a/category'
+    assert enums.values['a/grade'] == [('0', ''), ('1', '')]
+
+
+def test_viewer_store_scans_the_rows_once(monkeypatch):
+    scans = count_scans(monkeypatch)
+    df = make_spec()
+    build_viewer_store(df)
+    assert len(scans) == 1
+    build_viewer_store(df, enums=EnumRegistry.from_dataframe(df))
+    assert len(scans) == 2
+
+
+def test_build_hands_one_registry_to_every_emitter(monkeypatch):
+    scans = count_scans(monkeypatch)
+    monkeypatch.setattr(build, 'load_spec_table', lambda source_file: make_spec())
+    received = []
+    emitters = [(name, lambda df, enums: received.append(enums)) for name in ('first', 'second')]
+
+    build.build('spec.adoc', emitters)
+
+    assert len(scans) == 1
+    assert len(received) == 2 and received[0] is received[1]
+    assert received[0].values['a/category'] == [('A', 'inherent quality'), ('B', 'design level')]
@@ -0,0 +1,80 @@
+import csv
+
+import pandas as pd
+import pytest
+from extract_epd_xml import compile_matcher, extract_file, extract_to_file, select_paths, spec_path
+from spec_index import build_spec_index
+
+
+def write_xml(tmp_path, body, name='data.xml'):
+    xml_file = tmp_path / name
+    xml_file.write_text(
+        '<processDataSet xmlns="http://lca.jrc.it/ILCD/Process" xmlns:common="http://lca.jrc.it/ILCD/Common" '
+        'xmlns:epd24="http://www.indata.network/EPD/2024" version="1.1">' + body + '</processDataSet>',
+        encoding='utf-8',
+    )
+    return xml_file
+
+
+BODY = ('<info><common:UUID>abc</common:UUID><name xml:lang="en">Brick</name><name xml:lang="de">Ziegel</name>'
+        '<epd24:life epd24:years="50"><epd24:comment>ok</epd24:comment></epd24:life></info>')
+PATHS = ['processDataSet/@version', 'processDataSet/info/common:UUID', 'processDataSet/info/name',
+         'processDataSet/info/epd24:life/@epd24:years', 'processDataSet/info/epd24:life/epd24:comment',
+         'processDataSet/info/missing']
+
+
+def test_spec_path_drops_non_epd_prefixes():
+    assert spec_path('/processDataSet/common:UUID/') == 'processDataSet/UUID'
+    assert spec_path('a/epd24:life/@epd24:years') == 'a/epd24:life/@epd24:years'
+
+
+def test_extract_file_matches_all_paths_in_one_pass(tmp_path):
+    matcher = compile_matcher(PATHS)
+    values = extract_file(write_xml(tmp_path, BODY), matcher)
+    assert dict(zip(matcher.columns, values)) == {
+        'processDataSet/@version': '1.1',
+        'processDataSet/info/UUID': 'abc',
+        'processDataSet/info/name': 'Brick | Ziegel',
+        'processDataSet/info/epd24:life/@epd24:years': '50',
+        'processDataSet/info/epd24:life/epd24:comment': 'ok',
+        'processDataSet/info/missing': '',
+    }
+
+
+def test_select_paths_uses_the_spec():
+    index = build_spec_index(pd.DataFrame({
+        'Path': ['processDataSet', 'processDataSet/@version', 'processDataSet/info', 'processDataSet/info/UUID'],
+        'Datatype': ['', 'SchemaVersion', '', 'UUID'],
+    }))
+    assert select_paths(index) == ['processDataSet/@version', 'processDataSet/info/UUID']
+    assert select_paths(index, ['processDataSet/info'], ['processDataSet/info']) == [
+        'processDataSet/info', 'processDataSet/info/UUID']
+    with pytest.raises(KeyError):
+        select_paths(index, ['processDataSet/unknown'])
+
+
+def test_batched_parallel_extraction_matches_serial(tmp_path):
+    matcher = compile_matcher(PATHS)
+    files = [str(write_xml(tmp_path, BODY, name=f'{i}.xml')) for i in range(5)]
+    (tmp_path / 'broken.xml').write_text('<processDataSet>', encoding='utf-8')
+    files.insert(2, str(tmp_path / 'broken.xml'))
+
+    serial_file = tmp_path / 'serial.csv'
+    parallel_file = tmp_path / 'parallel.csv'
+    written, errors = extract_to_file(files, matcher, str(serial_file), batch_size=2)
+    assert written == 5 and len(errors) == 1
+    extract_to_file(files, matcher, str(parallel_file), jobs=2, batch_size=2)
+
+    with open(serial_file, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['file'] + matcher.columns
+    assert [row[0] for row in rows[1:]] == [f for f in files if not f.endswith('broken.xml')]
+    assert parallel_file.read_text(encoding='utf-8') == serial_file.read_text(encoding='utf-8')
+
+
+def test_parquet_output(tmp_path):
+    pytest.importorskip('pyarrow')
+    matcher = compile_matcher(PATHS)
+    output_file = tmp_path / 'out.parquet'
+    extract_to_file([str(write_xml(tmp_path, BODY))], matcher, str(output_file))
+    assert pd.read_parquet(output_file)['processDataSet/info/name'].tolist() == ['Brick | Ziegel']
@@ -0,0 +1,74 @@
+import numpy as np
+from extract_lcia_matrix import build_lcia_cube, lcia_matrix, load_lcia_cube, read_lcia_results
+
+
+def lcia_result(method, name, amounts):
+    return (f'<LCIAResult><referenceToLCIAMethodDataSet refObjectId="{method}">'
+            f'<common:shortDescription xml:lang="de">{name} (de)</common:shortDescription>'
+            f'<common:shortDescription xml:lang="en">{name}</common:shortDescription>'
+            f'</referenceToLCIAMethodDataSet><common:other>{amounts}</common:other></LCIAResult>')
+
+
+def amount(module, value, scenario=None):
+    scenario_attribute = f' epd:scenario="{scenario}"' if scenario else ''
+    return f'<epd:amount epd:module="{module}"{scenario_attribute}>{value}</epd:amount>'
+
+
+def write_dataset(tmp_path, name, uuid, results):
+    xml_file = tmp_path / name
+    xml_file.write_text(
+        '<processDataSet xmlns="http://lca.jrc.it/ILCD/Process" xmlns:common="http://lca.jrc.it/ILCD/Common" '
+        'xmlns:epd="http://www.iai.kit.edu/EPD/2013"><processInformation><dataSetInformation>'
+        f'<common:UUID>{uuid}</common:UUID></dataSetInformation></processInformation>'
+        f'<LCIAResults>{"".join(results)}</LCIAResults></processDataSet>',
+        encoding='utf-8',
+    )
+    return str(xml_file)
+
+
+def test_read_lcia_results_and_matrix(tmp_path):
+    xml_file = write_dataset(tmp_path, 'a.xml', 'uuid-a', [
+        lcia_result('gwp', 'GWP', amount('D', '-1.5') + amount('A1-A3', '10') + amount('C3', 'ND')
+                    + amount('C3', '2', scenario='S2')),
+        lcia_result('odp', 'ODP', amount('A1-A3', '1E-7')),
+    ])
+    results = read_lcia_results(xml_file)
+    assert results.uuid == 'uuid-a'
+    assert results.indicator_names == {'gwp': 'GWP', 'odp': 'ODP'}
+    assert len(results.values) == 4
+
+    matrix = lcia_matrix(results.values)
+    assert matrix.scenarios == ['', 'S2']
+    assert matrix.modules == ['A1-A3', 'C3', 'D']
+    assert matrix.indicators == ['gwp', 'odp']
+    assert matrix.values.shape == (2, 3, 2)
+    assert matrix.values[0, 0].tolist() == [10.0, 1e-7]
+    assert matrix.values[0, 2, 0] == -1.5
+    assert matrix.values[1, 1, 0] == 2.0
+    assert np.isnan(matrix.values[0, 1, 0])
+
+
+def test_build_lcia_cube(tmp_path):
+    files = [
+        write_dataset(tmp_path, 'a.xml', 'uuid-a', [lcia_result('gwp', 'GWP', amount('C4', '3') + amount('A1-A3', '1'))]),
+        write_dataset(tmp_path, 'b.xml', 'uuid-b', [lcia_result('odp', 'ODP', amount('A1-A3', '2')),
+                                                   lcia_result('gwp', 'GWP', amount('A1-A3', '4'))]),
+    ]
+    (tmp_path / 'broken.xml').write_text('<processDataSet>', encoding='utf-8')
+    files.append(str(tmp_path / 'broken.xml'))
+    output_dir = tmp_path / 'cube'
+
+    _, _, errors = build_lcia_cube(files, str(output_dir))
+    assert len(errors) == 1
+    cube, index = load_lcia_cube(str(output_dir))
+    assert [dataset['uuid'] for dataset in index['datasets']] == ['uuid-a', 'uuid-b']
+    assert index['modules'] == ['A1-A3', 'C4']
+    assert [indicator['uuid'] for indicator in index['indicators']] == ['gwp', 'odp']
+    assert cube.shape == (2, 1, 2, 2)
+    assert np.nansum(cube[:, 0, :, 0], axis=1).tolist() == [4.0, 4.0]
+    assert np.isnan(cube[0, 0, 0, 1]) and cube[1, 0, 0, 1] == 2.0
+
+    build_lcia_cube(files, str(tmp_path / 'parallel'), jobs=2, batch_size=1)
+    parallel_cube, parallel_index = load_lcia_cube(str(tmp_path / 'parallel'))
+    assert parallel_index == index
+    np.testing.assert_array_equal(parallel_cube, cube)
@@ -0,0 +1,123 @@
+import json
+import os
+import pandas as pd
+from generate_attribute_pages import (content_hash, build_viewer_store, generate_attribute_page, load_manifest,
+                                      prune_orphan_pages, save_manifest, split_into_chunks, viewer_section,
+                                      write_attribute_viewer, write_if_changed, write_page_chunk)
+
+
+def test_unchanged_page_is_not_rewritten(tmp_path):
+    """A page whose content did not change keeps its mtime."""
+    page = tmp_path / 'page.html'
+    digest, written = write_if_changed(str(page), '<p>a</p>')
+    assert written and digest == content_hash('<p>a</p>')
+
+    os.utime(page, (1, 1))
+    assert write_if_changed(str(page), '<p>a</p>', digest) == (digest, False)
+    assert write_if_changed(str(page), '<p>a</p>') == (digest, False)
+    assert page.stat().st_mtime == 1
+
+    assert write_if_changed(str(page), '<p>b</p>', digest)[1]
+    assert page.read_text(encoding='utf-8') == '<p>b</p>'
+
+
+def test_only_pages_of_earlier_builds_are_pruned(tmp_path):
+    for name in ['index.html', 'kept.html', 'old.html', 'hand_placed.html', 'notes.txt']:
+        (tmp_path / name).write_text('x', encoding='utf-8')
+    previous = {'kept.html': {}, 'old.html': {}, 'already_gone.html': {}}
+
+    removed = prune_orphan_pages({'index.html', 'kept.html'}, previous, str(tmp_path))
+
+    assert removed == ['old.html']
+    assert sorted(os.listdir(tmp_path)) == ['hand_placed.html', 'index.html', 'kept.html', 'notes.txt']
+
+
+def test_manifest_moves_out_of_the_pages_directory(tmp_path):
+    legacy = tmp_path / 'pages' / '.build_manifest.json'
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps({'version': 1, 'pages': {'a.html': {'path': 'a', 'sha256': 'x'}}}), encoding='utf-8')
+    manifest = tmp_path / 'cache' / 'manifest.json'
+
+    assert load_manifest(str(manifest), str(legacy)) == {'a.html': {'path': 'a', 'sha256': 'x'}}
+    save_manifest({'b.html': {'path': 'b', 'sha256': 'y'}}, str(manifest), str(legacy))
+
+    assert not legacy.exists()
+    assert load_manifest(str(manifest), str(legacy)) == {'b.html': {'path': 'b', 'sha256': 'y'}}
+
+
+def test_chunk_rendering_from_tuples_matches_row_rendering(tmp_path):
+    """Workers render from plain tuples; the result must equal rendering the pandas row."""
+    df = pd.DataFrame({
+        'Element/Attribute Name': ['name', '@lang'],
+        'Definition (en)': ['First line\nSecond line', ''],
+        'Technically Required': ['yes', 'no'],
+        'Path': ['a/name', 'a/name/@lang'],
+    })
+    tasks = [(index, path, values, None, str(tmp_path / f'{index}.html'), None)
+             for (index, values), path in zip(enumerate(df.itertuples(index=False, name=None)), df['Path'])]
+
+    results = write_page_chunk(list(df.columns), tasks)
+
+    assert [(filename, path, written) for filename, path, _, written in results] == [
+        ('0.html', 'a/name', True), ('1.html', 'a/name/@lang', True)]
+    for index, row in df.iterrows():
+        assert (tmp_path / f'{index}.html').read_text(encoding='utf-8') == generate_attribute_page(row, index)
+
+
+def test_split_into_chunks():
+    assert split_into_chunks(list(range(5)), 2) == [[0, 1, 2], [3, 4]]
+    assert split_into_chunks(list(range(2)), 8) == [[0], [1]]
+    assert split_into_chunks([], 4) == []
+
+
+def test_viewer_section():
+    assert viewer_section('processDataSet/processInformation/dataSetInformation/UUID') == 'processInformation'
+    assert viewer_section('processDataSet/@version') == 'processDataSet'
+    assert viewer_section('processDataSet') == 'processDataSet'
+
+
+def test_viewer_store_keeps_every_definition_of_a_path():
+    """Paths that would overwrite each other as pages (duplicates, 'a/b' vs 'a_b') all stay reachable."""
+    df = pd.DataFrame({
+        'Element/Attribute Name': ['root', 'other', 'other', 'other_x', '@lang'],
+        'Definition (en)': ['Root', 'First', 'Second', 'Other', 'Values\nen\nde'],
+        'Indent': [0, 1, 1, 1, 2],
+        'Path': ['root', 'root/info/other', 'root/info/other', 'root/info_other', 'root/info/other/@lang'],
+    })
+
+    index, shards = build_viewer_store(df)
+
+    assert [entry[0] for entry in index['entries']] == list(df['Path'])
+    assert [entry[3] for entry in index['entries']] == ['root.json', 'info.json', 'info.json', 'info_other.json',
+                                                         'info.json']
+    info = shards['info.json']
+    assert info['fields'] == [['Definition', 'en']]
+    assert [definition['values'] for definition in info['entries']['root/info/other']] == [['First'], ['Second']]
+    assert info['entries']['root/info/other/@lang'][0] == {'name': '@lang', 'values': [['', ['Values', 'en', 'de']]]}
+    assert shards['info_other.json']['entries']['root/info_other'][0]['name'] == 'other_x'
+
+
+def test_write_attribute_viewer_prunes_stale_shards(tmp_path):
+    df = pd.DataFrame({'Element/Attribute Name': ['root', 'a'], 'Indent': [0, 1], 'Path': ['root', 'root/a']})
+    data_dir = tmp_path / 'attribute_data'
+    data_dir.mkdir()
+    (data_dir / 'removed.json').write_text('{}', encoding='utf-8')
+
+    write_attribute_viewer(df, str(tmp_path / 'attribute.html'), str(data_dir))
+
+    assert sorted(os.listdir(data_dir)) == ['a.json', 'index.json', 'root.json']
+    assert json.loads((data_dir / 'index.json').read_text(encoding='utf-8'))['entries'][1][:2] == ['root/a', 'a']
+    assert 'data-store="attribute_data"' in (tmp_path / 'attribute.html').read_text(encoding='utf-8')
+
+
+def test_viewer_download_links_are_relative_to_the_viewer(tmp_path):
+    df = pd.DataFrame({'Element/Attribute Name': ['root'], 'Indent': [0], 'Path': ['root']})
+    viewer_file = tmp_path / 'site' / 'en' / 'attribute.html'
+    viewer_file.parent.mkdir(parents=True)
+
+    write_attribute_viewer(df, str(viewer_file), str(tmp_path / 'site' / 'attribute_data'),
+                           downloads_dir=str(tmp_path / 'data'))
+
+    page = viewer_file.read_text(encoding='utf-8')
+    assert 'data-data-dir="../../data"' in page
+    assert 'data-store="../attribute_data"' in page
@@ -1,6 +1,6 @@
 import pandas as pd
 import pytest
-from generate_html_report import add_tree_prefixes
+from generate_html_report import COLUMN_MAPPING, PRESENTATION_COLUMNS, add_tree_prefixes, generate_html_report
 
 @pytest.fixture
 def sample_data():
@@ -57,3 +57,14 @@ def test_tree_prefix_generation(sample_data):
 
     # Check if the generated prefixes match the expected ones
     assert result_df['TreePrefix'].tolist() == expected_prefixes
+
+def test_view_buttons_carry_the_path_as_data():
+    """Paths go into data-path for the delegated click handler, so a quote in them cannot break out of a script."""
+    df = pd.DataFrame({
+        'Element/Attribute Name': ['root', "o'name"],
+        'Path': ['root', "root/o'name"],
+        'Indent': [0, 1],
+    })
+    page = generate_html_report(df, PRESENTATION_COLUMNS, COLUMN_MAPPING)
+    assert '<button class="view-attr-btn" data-path="root/o&#x27;name"' in page
+    assert 'onclick' not in page
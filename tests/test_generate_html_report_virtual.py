@@ -0,0 +1,58 @@
+import json
+
+import pandas as pd
+from generate_html_report import build_tree_ranges, iter_report_rows, render_virtual_report, write_report_rows
+
+
+def make_df():
+    return pd.DataFrame({
+        'Element/Attribute Name': ['field', '', '', 'other'],
+        'Datatype': ['xs:string', 'A - one', 'B - two', 'xs:int'],
+        'Definition (de)': ['Feld', '', '', 'Anderes'],
+        'Path': ['root/field', 'root/field', 'root/field', 'root/other'],
+        'Indent': [0, 0, 0, 1],
+        '_definitions_identical': ['False', 'False', 'False', 'True'],
+    })
+
+
+def test_payload_folds_enum_rows_into_their_field():
+    columns = ['Element/Attribute Name', 'Datatype', 'Definition (de)']
+    header, *rows = iter_report_rows(make_df(), columns, {})
+
+    assert [column['name'] for column in header['columns']] == columns
+    assert header['columns'][2]['class'] == 'lang-de'
+    assert header['columns'][0]['togglable'] is False
+    assert rows == [
+        [0, 'root/field', '', 0, ['field', 'xs:string', 'Feld'], ['A - one', 'B - two'], -1, 1],
+        [3, 'root/other', '└─ ', 1, ['other', 'xs:int', 'Anderes'], None, 0, 1],
+    ]
+
+
+def test_payload_is_written_as_json_lines(tmp_path):
+    output_file = tmp_path / 'rows.jsonl'
+    write_report_rows(make_df(), ['Element/Attribute Name'], {}, str(output_file))
+    lines = output_file.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[2]) == [3, 'root/other', '└─ ', 1, ['other'], None, 0, 1]
+
+
+def test_virtual_page_has_an_empty_body_and_points_at_the_payload():
+    parts = []
+    render_virtual_report(parts.append, ['Element/Attribute Name', 'Datatype'], 'rows.jsonl', 'index.json')
+    page = ''.join(parts)
+    assert 'data-rows="rows.jsonl" data-search-index="index.json"' in page
+    assert '<tbody></tbody>' in page
+    assert page.index('js/virtual_report.js') < page.index('js/script.js')
+
+
+def test_report_links_to_the_attribute_viewer_when_given():
+    parts = []
+    render_virtual_report(parts.append, ['Element/Attribute Name'], 'rows.jsonl', None, 'attribute.html')
+    assert 'data-rows="rows.jsonl" data-attribute-viewer="attribute.html"' in ''.join(parts)
+
+
+def test_tree_ranges_cover_each_subtree():
+    indents = [0, 1, 2, 1, 0, 1, 3, 1]
+    parents, subtree_ends = build_tree_ranges(indents)
+    assert parents == [-1, 0, 1, 0, -1, 4, 5, 4]
+    assert subtree_ends == [3, 2, 2, 3, 7, 6, 6, 7]
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from optimize_site import (ASSET_MANIFEST_FILENAME, compress, hashed_name, minify_css,
+                           minify_html, minify_js, optimize_site, rewrite_references)
+
+DOCS_JS_DIR = Path(__file__).resolve().parents[1] / 'docs' / 'js'
+
+
+def test_minify_js_keeps_literals():
+    source = (
+        "// Header comment\n"
+        "const a = 'x // not a comment';  \n"
+        "\n"
+        "    /* block */ const re = /[/*]+/g;\n"
+        "const t = `line one\n"
+        "    indented ${items.map(v => `<li>${v}</li>`).join('')} // kept`;\n"
+        "const third = count++ / 3 / 2; const slash = '/'; // after a postfix ++ the '/' divides\n"
+    )
+    minified = minify_js(source)
+    assert 'Header' not in minified and 'block' not in minified and 'divides' not in minified
+    assert "'x // not a comment'" in minified
+    assert '/[/*]+/g' in minified
+    assert "`line one\n    indented ${items.map(v => `<li>${v}</li>`).join('')} // kept`" in minified
+    assert "'/'" in minified
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+@pytest.mark.parametrize('script', sorted(DOCS_JS_DIR.glob('*.js')), ids=lambda path: path.name)
+def test_minified_docs_scripts_still_parse(script, tmp_path):
+    """The shipped scripts, minified, are still valid JavaScript."""
+    minified = tmp_path / script.name
+    minified.write_text(minify_js(script.read_text(encoding='utf-8')), encoding='utf-8')
+    result = subprocess.run(['node', '--check', str(minified)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_minify_css_keeps_strings_and_descendant_pseudo_classes():
+    source = ('/* c */\nbody {\n    font-family: "Segoe UI", Arial;\n}\n.a :hover > .b { color :  red; }\n'
+              '@media print {\n    .c :focus { content : "{;" ; margin : 0 }\n}\n')
+    assert minify_css(source) == ('body{font-family:"Segoe UI",Arial}.a :hover>.b{color:red}'
+                                  '@media print{.c :focus{content:"{;";margin:0}}')
+
+
+def test_minify_html_keeps_pre_and_minifies_inline_script():
+    source = '<body>\n    <!-- note -->\n    <pre>  a\n    b</pre>\n    <script>\n        // c\n        go();\n    </script>\n</body>\n'
+    assert minify_html(source) == '<body>\n<pre>  a\n    b</pre>\n<script>go();</script>\n</body>\n'
+
+
+def test_references_are_rewritten_relative_to_the_page():
+    renamed = {'css/style.css': 'css/style.0123456789.css', 'index.json': 'index.abcdef0123.json'}
+    page = ('<link href="../css/style.css"><a href="../index.html#top">x</a>'
+            '<table data-search-index="../index.json?v=1"><a href="https://example.org/css/style.css">')
+    assert rewrite_references('pages/page.html', page, renamed) == (
+        '<link href="../css/style.0123456789.css"><a href="../index.html#top">x</a>'
+        '<table data-search-index="../index.abcdef0123.json?v=1"><a href="https://example.org/css/style.css">')
+
+
+def make_docs(docs_dir):
+    (docs_dir / 'css').mkdir(parents=True)
+    (docs_dir / 'pages').mkdir()
+    (docs_dir / 'css' / 'style.css').write_text('body {\n    margin: 0;\n}\n', encoding='utf-8')
+    (docs_dir / 'report.html').write_text(
+        '<html>\n    <link rel="stylesheet" href="css/style.css">\n    <p>' + 'text ' * 100 + '</p>\n</html>\n',
+        encoding='utf-8')
+    (docs_dir / 'pages' / 'a.html').write_text('<link href="../css/style.css">\n', encoding='utf-8')
+    (docs_dir / 'pages' / '.build_manifest.json').write_text('{}', encoding='utf-8')
+
+
+def test_optimize_site_hashes_rewrites_and_compresses(tmp_path):
+    docs_dir, site_dir = tmp_path / 'docs', tmp_path / 'site'
+    make_docs(docs_dir)
+
+    assets = optimize_site(str(docs_dir), str(site_dir), ('gzip',))
+
+    style = hashed_name('css/style.css', b'body{margin:0}')
+    assert assets == {'css/style.css': style}
+    manifest = json.loads((site_dir / ASSET_MANIFEST_FILENAME).read_text(encoding='utf-8'))
+    assert manifest['assets'] == assets
+    assert (site_dir / style).read_text(encoding='utf-8') == 'body{margin:0}'
+    report = (site_dir / 'report.html').read_text(encoding='utf-8')
+    assert f'href="{style}"' in report
+    assert f'href="../{style}"' in (site_dir / 'pages' / 'a.html').read_text(encoding='utf-8')
+    assert gzip.decompress((site_dir / 'report.html.gz').read_bytes()).decode('utf-8') == report
+    # Sidecars are only written when they are smaller than the file
+    assert not (site_dir / 'pages' / 'a.html.gz').exists()
+    assert not (site_dir / 'pages' / '.build_manifest.json').exists()
+
+
+def test_optimize_site_is_incremental_and_prunes_old_assets(tmp_path):
+    docs_dir, site_dir = tmp_path / 'docs', tmp_path / 'site'
+    make_docs(docs_dir)
+    optimize_site(str(docs_dir), str(site_dir), ('gzip',))
+    report = site_dir / 'report.html'
+    os.utime(report, (1, 1))
+    optimize_site(str(docs_dir), str(site_dir), ('gzip',))
+    assert report.stat().st_mtime == 1
+
+    (docs_dir / 'css' / 'style.css').write_text('body { margin: 1px; }', encoding='utf-8')
+    assets = optimize_site(str(docs_dir), str(site_dir), ('gzip',))
+
+    assert report.stat().st_mtime != 1
+    assert sorted(os.listdir(site_dir / 'css')) == [os.path.basename(assets['css/style.css'])]
+
+
+def test_optimize_site_refuses_to_write_into_its_source(tmp_path):
+    make_docs(tmp_path / 'docs')
+    with pytest.raises(ValueError):
+        optimize_site(str(tmp_path / 'docs'), str(tmp_path / 'docs' / 'site'))
+
+
+def test_brotli_without_the_package_fails_before_writing(tmp_path, monkeypatch):
+    """Brotli sidecars are written by default, so a missing package is an error instead of a silent skip."""
+    monkeypatch.setitem(sys.modules, 'brotli', None)
+    with pytest.raises(ValueError, match='brotli'):
+        compress(b'data', 'br')
+    make_docs(tmp_path / 'docs')
+    with pytest.raises(ValueError, match='brotli'):
+        optimize_site(str(tmp_path / 'docs'), str(tmp_path / 'site'))
+    assert not (tmp_path / 'site').exists()
+
+
+def test_brotli_sidecars_are_written_by_default(tmp_path):
+    brotli = pytest.importorskip('brotli')
+    make_docs(tmp_path / 'docs')
+    optimize_site(str(tmp_path / 'docs'), str(tmp_path / 'site'))
+    report = (tmp_path / 'site' / 'report.html').read_bytes()
+    assert brotli.decompress((tmp_path / 'site' / 'report.html.br').read_bytes()) == report
@@ -0,0 +1,74 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+from preview_server import LIVE_RELOAD_SCRIPT, PreviewSite, make_server
+
+
+def write_adoc(path, name):
+    path.write_text(
+        '.EPD Data Structure\n|===\n'
+        '| [role="title"]##Path##\n| [role="title"]##Indent##\n| [role="title"]##Element/Attribute Name##\n'
+        f'| ##processDataSet##\n| ##0##\n| ##{name}##\n'
+        '| ##processDataSet/@version##\n| ##1##\n| ##@version##\n|===\n',
+        encoding='utf-8',
+    )
+
+
+@pytest.fixture
+def site(tmp_path):
+    source = tmp_path / 'spec.adoc'
+    write_adoc(source, 'processDataSet')
+    docs = tmp_path / 'docs'
+    (docs / 'css').mkdir(parents=True)
+    (docs / 'css' / 'style.css').write_text('body {}', encoding='utf-8')
+    return PreviewSite(str(source), str(docs), cache_size=2)
+
+
+def test_renders_pages_from_memory(site):
+    report = site.get('/epd_documentation_report.html')
+    assert b'processDataSet' in report.body and LIVE_RELOAD_SCRIPT.encode() in report.body
+    page = site.get('/attribute_pages/processDataSet__version.html')
+    assert b'@version' in page.body
+    assert site.get('/attribute_pages/index.html').content_type.startswith('text/html')
+    assert site.get('/epd_documentation_search_index.json').content_type == 'application/json'
+    assert site.get('/css/style.css').body == b'body {}'
+    assert site.get('/attribute_pages/missing.html') is None
+    assert site.get('/../spec.adoc') is None
+
+
+def test_rendered_pages_are_kept_in_an_lru_cache(site):
+    report = site.get('/epd_documentation_report.html')
+    assert site.get('/epd_documentation_report.html') is report
+    site.get('/attribute_pages/processDataSet.html')
+    site.get('/attribute_pages/index.html')
+    # cache_size=2: the report was the least recently used page
+    assert site.get('/epd_documentation_report.html') is not report
+
+
+def test_reload_drops_rendered_pages(site, tmp_path):
+    before = site.get('/attribute_pages/processDataSet.html')
+    write_adoc(tmp_path / 'spec.adoc', 'renamedDataSet')
+    site.reload()
+    after = site.get('/attribute_pages/processDataSet.html')
+    assert site.generation == 2
+    assert b'renamedDataSet' in after.body and after.etag != before.etag
+    assert site.wait_for_change(1, timeout=0) == 2
+
+
+def test_http_etag_and_not_modified(site):
+    server = make_server(site, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/attribute_pages/processDataSet.html'
+    try:
+        with urllib.request.urlopen(url) as response:
+            etag = response.headers['ETag']
+            assert response.status == 200 and response.read() == site.get(url[url.index('/attribute_pages'):]).body
+        request = urllib.request.Request(url, headers={'If-None-Match': etag})
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 304
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+from generate_attribute_pages import build_viewer_store
+from generate_html_report import (COLUMN_MAPPING, PRESENTATION_COLUMNS, generate_html_report, language_columns,
+                                  language_variant_file, normalize_report_languages, write_html_report)
+
+COLUMNS = ['Field Name (de)', 'Field Name (en)', 'Element/Attribute Name', 'Original ILCD Format Definition (en)',
+           'Definition (de)', 'Datatype']
+
+
+def make_df():
+    return pd.DataFrame({
+        'Field Name (de)': ['Wurzel', 'Name'],
+        'Field Name (en)': ['Root', 'Name'],
+        'Element/Attribute Name': ['root', 'name'],
+        'Original ILCD Format Definition (en)': ['The root', 'The name'],
+        'Definition (de)': ['Die Wurzel', 'Der Name'],
+        'Datatype': ['', 'xs:string'],
+        'Path': ['root', 'root/name'],
+        'Indent': [0, 1],
+    })
+
+
+def test_language_columns_leave_out_the_other_language():
+    assert language_columns(COLUMNS, 'both') == COLUMNS
+    # The original ILCD definition is shown in every language, as in the bilingual report
+    assert language_columns(COLUMNS, 'en') == ['Field Name (en)', 'Element/Attribute Name',
+                                               'Original ILCD Format Definition (en)', 'Datatype']
+    assert language_columns(COLUMNS, 'de') == ['Field Name (de)', 'Element/Attribute Name',
+                                               'Original ILCD Format Definition (en)', 'Definition (de)', 'Datatype']
+    with pytest.raises(ValueError):
+        language_columns(COLUMNS, 'fr')
+
+
+def test_variant_files_and_language_order():
+    assert language_variant_file('docs/report.html', 'both') == 'docs/report.html'
+    assert language_variant_file('docs/report.html', 'de') == 'docs/report_de.html'
+    assert language_variant_file('docs/attribute_data', 'en') == 'docs/attribute_data_en'
+    assert normalize_report_languages(['de', 'both', 'de']) == ['both', 'de']
+    assert normalize_report_languages(None) == ['both']
+
+
+def test_variants_are_written_from_one_model_and_link_to_each_other(tmp_path):
+    report_file = tmp_path / 'report.html'
+    written = write_html_report(make_df(), str(report_file), str(tmp_path / 'index.json'),
+                                languages=['de', 'both'])
+
+    assert written == [str(report_file), str(tmp_path / 'report_de.html')]
+    german = (tmp_path / 'report_de.html').read_text(encoding='utf-8')
+    assert '<body class="show-de">' in german and 'data-language="de"' in german
+    assert 'Die Wurzel' in german and 'Root' not in german
+    assert '<button data-href="report.html">Both languages</button>' in german
+    bilingual = report_file.read_text(encoding='utf-8')
+    assert '<button data-href="report_de.html">German only</button>' in bilingual
+    assert 'data-language' not in bilingual
+
+
+def test_bilingual_only_report_is_unchanged(tmp_path):
+    report_file = tmp_path / 'report.html'
+    write_html_report(make_df(), str(report_file), str(tmp_path / 'index.json'))
+    page = report_file.read_text(encoding='utf-8')
+    assert page == generate_html_report(make_df(), PRESENTATION_COLUMNS, COLUMN_MAPPING).replace(
+        '<table id="report-table">', '<table id="report-table" data-search-index="index.json">')
+    assert 'data-href' not in page
+
+
+def test_viewer_store_variant_leaves_out_the_other_language():
+    _, shards = build_viewer_store(make_df(), 'en')
+    fields = [label for label, _ in shards['name.json']['fields']]
+    assert fields == ['Field Name', 'Original ILCD Format Definition', 'Datatype']
+    assert shards['name.json']['entries']['root/name'][0]['values'] == ['Name', 'The name', 'xs:string']
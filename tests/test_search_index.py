@@ -0,0 +1,35 @@
+import json
+
+import pandas as pd
+from generate_html_report import build_report_search_index
+from search_index import build_postings, build_search_index, write_search_index
+
+
+def test_postings_list_each_entry_once_in_order():
+    postings = build_postings(['aaaa', 'xaaa', 'abc'])
+    assert postings['aaa'] == [0, 1]
+    assert postings['abc'] == [2]
+    assert 'ab' not in postings
+
+
+def test_index_normalizes_names_and_splits_paths(tmp_path):
+    index = build_search_index([4, 7], [' Name ', 'baseName'], ['root/Name', 'root/baseName'])
+    assert index['rows'] == [4, 7]
+    assert index['names'] == ['name', 'basename']
+    assert index['paths'] == [['root', 'name'], ['root', 'basename']]
+    assert index['name_trigrams']['nam'] == [0, 1]
+
+    output_file = tmp_path / 'index.json'
+    write_search_index(index, str(output_file))
+    assert json.loads(output_file.read_text(encoding='utf-8')) == index
+
+
+def test_report_index_skips_folded_enum_rows():
+    df = pd.DataFrame({
+        'Element/Attribute Name': ['field', '', '', 'other'],
+        'Datatype': ['xs:string', 'A - one', 'B - two', 'xs:int'],
+        'Path': ['root/field', 'root/field', 'root/field', 'root/other'],
+    })
+    index = build_report_search_index(df)
+    assert index['rows'] == [0, 3]
+    assert index['names'] == ['field', 'other']
@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+import pytest
+from spec_cache import cached_load, evict_cache, load_spec_table
+
+
+@pytest.fixture(autouse=True)
+def enable_cache(monkeypatch):
+    monkeypatch.setenv('EPD_SPEC_CACHE', '1')
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, source_file):
+        self.calls += 1
+        with open(source_file, encoding='utf-8') as f:
+            return pd.DataFrame({'text': [f.read()]})
+
+
+def test_cache_hit_miss_and_version(tmp_path):
+    source = tmp_path / 'spec.adoc'
+    source.write_text('one', encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+    loader = CountingLoader()
+
+    first = cached_load(str(source), loader, 'test', 1, cache_dir)
+    second = cached_load(str(source), loader, 'test', 1, cache_dir)
+    assert loader.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert second is not first
+
+    cached_load(str(source), loader, 'test', 2, cache_dir)
+    assert loader.calls == 2
+    source.write_text('two', encoding='utf-8')
+    assert cached_load(str(source), loader, 'test', 1, cache_dir)['text'][0] == 'two'
+    assert loader.calls == 3
+
+
+def test_unreadable_entry_is_rebuilt(tmp_path):
+    source = tmp_path / 'spec.adoc'
+    source.write_text('one', encoding='utf-8')
+    cache_dir = tmp_path / 'cache'
+    loader = CountingLoader()
+    cached_load(str(source), loader, 'test', 1, str(cache_dir))
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b'not a pickle')
+    assert cached_load(str(source), loader, 'test', 1, str(cache_dir))['text'][0] == 'one'
+    assert loader.calls == 2
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for age, name in enumerate(['newest', 'middle', 'oldest']):
+        entry = cache_dir / f'{name}.pickle'
+        entry.write_bytes(b'x' * 100)
+        os.utime(entry, ns=(10**18 - age * 10**9, 10**18 - age * 10**9))
+    assert evict_cache(str(cache_dir), max_bytes=250) == 1
+    assert sorted(entry.name for entry in cache_dir.iterdir()) == ['middle.pickle', 'newest.pickle']
+    evict_cache(str(cache_dir), max_bytes=50, keep=str(cache_dir / 'middle.pickle'))
+    assert [entry.name for entry in cache_dir.iterdir()] == ['middle.pickle']
+
+
+def test_disabled_cache_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv('EPD_SPEC_CACHE', '0')
+    source = tmp_path / 'spec.adoc'
+    source.write_text('one', encoding='utf-8')
+    loader = CountingLoader()
+    cached_load(str(source), loader, 'test', 1, str(tmp_path / 'cache'))
+    cached_load(str(source), loader, 'test', 1, str(tmp_path / 'cache'))
+    assert loader.calls == 2
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_load_spec_table_matches_parser(tmp_path):
+    source = tmp_path / 'spec.adoc'
+    source.write_text('.EPD Data Structure\n|===\n| [role="title"]##Path##\n| [role="title"]##Indent##\n'
+                      '| ##a##\n| ##1##\n|===\n', encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+    first = load_spec_table(str(source), cache_dir)
+    pd.testing.assert_frame_equal(load_spec_table(str(source), cache_dir), first)
+    assert first['Path'].tolist() == ['a'] and first['Indent'].tolist() == [1]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from spec_index import SpecIndex, path_namespace
+
+
+@pytest.fixture
+def index():
+    df = pd.DataFrame({'Path': [
+        'processDataSet',
+        'processDataSet/processInformation',
+        'processDataSet/processInformation/@epd2:version',
+        'processDataSet/processInformation/other/epd24:referenceServiceLife',
+        'processDataSet/processInformation/other/epd24:referenceServiceLife/@epd24:years',
+        'processDataSet/modellingAndValidation',
+        'processDataSet/processInformation/@epd2:version',
+        'nan',
+    ]})
+    return SpecIndex.from_dataframe(df)
+
+
+def test_exact_lookup_uses_the_last_definition(index):
+    assert len(index) == 6
+    assert 'nan' not in index
+    assert index.get('/processDataSet/processInformation/@epd2:version/').position == 6
+    assert [entry.position for entry in index.get_all('processDataSet/processInformation/@epd2:version')] == [2, 6]
+    assert index.get('processDataSet/missing') is None
+
+
+def test_subtree_and_prefix_queries(index):
+    assert [entry.path for entry in index.subtree('processDataSet/processInformation/other')] == [
+        'processDataSet/processInformation/other/epd24:referenceServiceLife',
+        'processDataSet/processInformation/other/epd24:referenceServiceLife/@epd24:years',
+    ]
+    assert [entry.path for entry in index.find_prefix('processDataSet/mod')] == ['processDataSet/modellingAndValidation']
+    assert len(index.find_prefix('processDataSet/')) == 5
+
+
+def test_navigation(index):
+    path = 'processDataSet/processInformation/other/epd24:referenceServiceLife'
+    # 'other' has no row of its own, so the parent is the element above it
+    assert index.parent(path).path == 'processDataSet/processInformation'
+    assert index.parent(path + '/@epd24:years').path == path
+    assert index.parent('processDataSet') is None
+    assert [entry.path for entry in index.ancestors(path)] == ['processDataSet', 'processDataSet/processInformation']
+    assert [entry.path for entry in index.children('processDataSet/processInformation')] == [
+        'processDataSet/processInformation/other/epd24:referenceServiceLife',
+        'processDataSet/processInformation/@epd2:version',
+    ]
+
+
+def test_namespace_filtering(index):
+    assert index.namespaces() == ['epd2', 'epd24']
+    assert [entry.position for entry in index.in_namespace('epd24')] == [3, 4]
+    assert index.in_namespace('epd2', within='processDataSet/modellingAndValidation') == []
+    assert path_namespace('a/@epd24:years') == 'epd24'
+    assert path_namespace('a/other') is None
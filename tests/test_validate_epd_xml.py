@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+from validate_epd_xml import compile_rules, parse_occurrence, validate_file, validate_files
+
+
+@pytest.fixture
+def rule_set():
+    df = pd.DataFrame({
+        'Path': ['processDataSet', 'processDataSet/@version', 'processDataSet/UUID',
+                 'processDataSet/epd2:value', 'processDataSet/epd2:value/@epd2:grade', 'processDataSet/comment'],
+        'Occ.': ['[1,1]', '', '[1,1]', '[0,n]', '[0,1]', '[0,1]'],
+        'Technically Required': ['m', 'm', 'm', 'o', 'o', 'o'],
+        'Datatype': ['', 'SchemaVersion', 'UUID', 'Real', 'Restricted xs:int: +\n0 +\n1 +\n2', 'String'],
+    })
+    return compile_rules(df)
+
+
+def write_xml(tmp_path, body, name='data.xml'):
+    xml_file = tmp_path / name
+    xml_file.write_text(
+        '<processDataSet xmlns="http://lca.jrc.it/ILCD/Process" xmlns:common="http://lca.jrc.it/ILCD/Common" '
+        'xmlns:epd2="http://www.indata.network/EPD/2019" ' + body + '</processDataSet>',
+        encoding='utf-8',
+    )
+    return xml_file
+
+
+def test_parse_occurrence():
+    assert parse_occurrence('[0,1]') == (0, 1)
+    assert parse_occurrence('[1,n]') == (1, None)
+    assert parse_occurrence('[1]') == (1, 1)
+    assert parse_occurrence('', 'm') == (1, None)
+    assert parse_occurrence('[0,1]', 'm') == (1, 1)
+
+
+def test_valid_file_has_no_issues(tmp_path, rule_set):
+    xml_file = write_xml(tmp_path, 'version="1.1"><common:UUID>c0ffee00-0000-0000-0000-000000000000</common:UUID>'
+                                   '<epd2:value epd2:grade="2">1.5</epd2:value><epd2:value>2</epd2:value>')
+    assert validate_file(xml_file, rule_set) == []
+
+
+def test_reports_missing_cardinality_and_datatype_issues(tmp_path, rule_set):
+    xml_file = write_xml(tmp_path, '><epd2:value epd2:grade="7">x</epd2:value>'
+                                   '<comment>a</comment><comment>b</comment>')
+    issues = {(issue.kind, issue.path) for issue in validate_file(xml_file, rule_set)}
+    assert issues == {
+        ('missing', 'processDataSet/@version'),
+        ('missing', 'processDataSet/UUID'),
+        ('datatype', 'processDataSet/epd2:value'),
+        ('datatype', 'processDataSet/epd2:value/@epd2:grade'),
+        ('cardinality', 'processDataSet/comment'),
+    }
+
+
+def test_batch_mode_matches_serial_results(tmp_path, rule_set):
+    files = [str(write_xml(tmp_path, '>', name=f'{i}.xml')) for i in range(3)]
+    (tmp_path / 'broken.xml').write_text('<processDataSet>', encoding='utf-8')
+    files.append(str(tmp_path / 'broken.xml'))
+    serial = list(validate_files(files, rule_set))
+    parallel = list(validate_files(files, rule_set, jobs=2))
+    assert serial == parallel
+    assert [issue.kind for issue in serial[-1][1]][-1] == 'xml'
+
+
+@pytest.mark.parametrize('module', ['validate_epd_xml', 'extract_epd_xml', 'extract_lcia_matrix'])
+def test_cli_does_not_import_the_generators(module):
+    """The XML tools get --jobs from cli_options, so importing them leaves docs/ and the report code alone."""
+    scripts_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+    code = (f"import sys, {module}; "
+            "print(sorted(m for m in ('generate_html_report', 'generate_attribute_pages') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=scripts_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
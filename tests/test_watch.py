@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+from watch import (ADOC_SOURCE_FILE, SCRIPTS_DIR, XLSX_SOURCE_FILE, FileState, affected_stages, local_imports,
+                   stage_dependencies)
+
+
+def affected(*paths):
+    return [stage.name for stage in affected_stages(set(paths), stage_dependencies())]
+
+
+def test_local_imports_follow_local_modules_only(tmp_path):
+    (tmp_path / 'main.py').write_text('import os\nfrom helper import run\n', encoding='utf-8')
+    (tmp_path / 'helper.py').write_text('import pandas as pd\nimport base\n', encoding='utf-8')
+    (tmp_path / 'base.py').write_text('', encoding='utf-8')
+    (tmp_path / 'unused.py').write_text('', encoding='utf-8')
+    assert {os.path.basename(path) for path in local_imports('main.py', str(tmp_path))} == {
+        'main.py', 'helper.py', 'base.py'}
+
+
+def test_affected_stages():
+    assert affected(XLSX_SOURCE_FILE) == ['AsciiDoc']
+    assert affected(ADOC_SOURCE_FILE) == ['HTML report', 'Attribute pages', 'CSV export']
+    assert affected(os.path.join(SCRIPTS_DIR, 'search_index.py')) == ['HTML report', 'Attribute pages']
+    assert affected(os.path.join(SCRIPTS_DIR, 'generate_csv_from_adoc.py')) == ['CSV export']
+    # The hand-edited AsciiDoc file is never regenerated because a script changed
+    assert affected(os.path.join(SCRIPTS_DIR, 'adoc_table.py')) == ['HTML report', 'Attribute pages', 'CSV export']
+    assert affected(os.path.join(SCRIPTS_DIR, 'validate_epd_xml.py')) == []
+
+
+def test_file_state_reports_content_changes_only(tmp_path):
+    source = tmp_path / 'spec.adoc'
+    source.write_text('one', encoding='utf-8')
+    missing = tmp_path / 'later.adoc'
+    state = FileState([str(source), str(missing)])
+
+    os.utime(source, ns=(1, 1))
+    assert state.poll() == set()
+    source.write_text('two', encoding='utf-8')
+    missing.write_text('new', encoding='utf-8')
+    assert state.poll() == {str(source), str(missing)}
+    assert state.poll() == set()
+
+
+def test_watcher_does_not_import_the_generators():
+    """The watcher runs the generators in subprocesses; importing it must not create docs/ or load the report code."""
+    code = ("import sys, watch; "
+            "print(sorted(m for m in ('generate_html_report', 'generate_attribute_pages') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'